@@ -0,0 +1,19 @@
+# analytics/admin.py
+from django.contrib import admin
+
+from .models import RevenueRollup
+
+
+@admin.register(RevenueRollup)
+class RevenueRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'period_start', 'source', 'package_name', 'vehicle_type', 'route',
+                    'bookings', 'revenue', 'advance')
+    list_filter = ('bucket', 'source', 'vehicle_type')
+    search_fields = ('package_name', 'route')
+    date_hierarchy = 'period_start'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
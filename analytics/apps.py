@@ -0,0 +1,20 @@
+# analytics/apps.py
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_init, post_save
+        from bookings.models import Booking
+        from core.softdelete import trash_changed
+        from packages.models import PackageBooking
+        from .rollups import booking_deleted, booking_loaded, booking_saved, bookings_trashed
+
+        for model in (Booking, PackageBooking):
+            post_init.connect(booking_loaded, sender=model, dispatch_uid=f'analytics.loaded.{model.__name__}')
+            post_save.connect(booking_saved, sender=model, dispatch_uid=f'analytics.saved.{model.__name__}')
+            post_delete.connect(booking_deleted, sender=model, dispatch_uid=f'analytics.deleted.{model.__name__}')
+            trash_changed.connect(bookings_trashed, sender=model, dispatch_uid=f'analytics.trashed.{model.__name__}')
@@ -0,0 +1,249 @@
+# analytics/exports.py
+"""
+Columnar (Parquet / Arrow) export of booking history for analysts.
+
+Each dataset is read in chunks with .values() (no model instances) and
+written as Arrow record batches, one file per month of the row's creation
+date, Hive style, so tools like DuckDB, pandas or Spark can prune by
+month:
+
+    HISTORY_EXPORT_ROOT/bookings/month=2025-01/part-20250201T020000123456.parquet
+
+Exports are incremental: a watermark per dataset (the newest change
+column value exported so far) lives in HISTORY_EXPORT_ROOT/_state.json,
+and the next run only reads rows changed after it. A changed row
+therefore appears again in a newer part file; readers keep the row with
+the latest change column per id.
+
+pyarrow is an optional dependency, imported only when exporting.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+CHUNK_SIZE = 5000
+
+# Columns never exported
+EXCLUDED_FIELDS = {'password', 'otp', 'otp_created_at'}
+
+
+def _datasets():
+    """{name: (model, change column, partition column)}"""
+    from bookings.models import ArchivedBooking, Booking
+    from packages.models import ArchivedPackageBooking, Package, PackageBooking
+    from users.models import User
+
+    return {
+        'bookings': (Booking, 'updated_at', 'created_at'),
+        'archived_bookings': (ArchivedBooking, 'archived_at', 'created_at'),
+        'package_bookings': (PackageBooking, 'updated_at', 'created_at'),
+        'archived_package_bookings': (ArchivedPackageBooking, 'archived_at', 'created_at'),
+        'packages': (Package, 'updated_at', 'created_at'),
+        'users': (User, 'updated_at', 'date_joined'),
+    }
+
+
+DATASETS = ('bookings', 'archived_bookings', 'package_bookings', 'archived_package_bookings', 'packages', 'users')
+
+
+def dataset_model(name):
+    """Model exported as dataset `name`"""
+    return _datasets()[name][0]
+
+
+def require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("History export needs pyarrow: pip install pyarrow")
+
+
+def _arrow_type(field):
+    import pyarrow as pa
+
+    if isinstance(field, (models.AutoField, models.BigAutoField, models.IntegerField,
+                          models.BigIntegerField, models.ForeignKey)):
+        return pa.int64()
+    if isinstance(field, (models.FloatField, models.DecimalField)):
+        return pa.float64()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.TimeField):
+        return pa.time64('us')
+    return pa.string()
+
+
+def columns(model):
+    """[(column, field)] exported for a model: concrete fields minus secrets"""
+    return [
+        (field.attname, field)
+        for field in model._meta.concrete_fields
+        if field.name not in EXCLUDED_FIELDS
+    ]
+
+
+def schema(model):
+    import pyarrow as pa
+
+    return pa.schema([pa.field(name, _arrow_type(field)) for name, field in columns(model)])
+
+
+def _convert(field, value):
+    if value is None:
+        return None
+    if isinstance(field, models.JSONField):
+        return json.dumps(value)
+    if isinstance(field, models.DecimalField):
+        return float(value)
+    if isinstance(field, models.FileField):
+        return str(value)
+    return value
+
+
+def changed_rows(name, since=None, until=None):
+    """Queryset of .values() dicts for rows changed in (since, until]"""
+    model, change_column, _ = _datasets()[name]
+    queryset = model._base_manager.all()
+    if since:
+        queryset = queryset.filter(**{f'{change_column}__gt': since})
+    if until:
+        queryset = queryset.filter(**{f'{change_column}__lte': until})
+    return queryset.order_by(change_column, 'pk').values(*(name for name, _ in columns(model)))
+
+
+def record_batches(name, since=None, until=None, chunk_size=CHUNK_SIZE):
+    """Yield pyarrow RecordBatches of at most chunk_size rows"""
+    import pyarrow as pa
+
+    model = dataset_model(name)
+    cols = columns(model)
+    arrow_schema = schema(model)
+    chunk = []
+    for row in changed_rows(name, since, until).iterator(chunk_size=chunk_size):
+        chunk.append({column: _convert(field, row[column]) for column, field in cols})
+        if len(chunk) >= chunk_size:
+            yield pa.RecordBatch.from_pylist(chunk, schema=arrow_schema)
+            chunk = []
+    if chunk:
+        yield pa.RecordBatch.from_pylist(chunk, schema=arrow_schema)
+
+
+# ============ FILE EXPORT ============
+def _state_path(root):
+    return os.path.join(root, '_state.json')
+
+
+def load_state(root):
+    try:
+        with open(_state_path(root)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(root, state):
+    os.makedirs(root, exist_ok=True)
+    tmp_path = _state_path(root) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, _state_path(root))
+
+
+class _PartitionWriters:
+    """One open writer per month partition; files appear atomically on close"""
+
+    def __init__(self, root, name, arrow_schema, file_format, run_tag):
+        self.root = root
+        self.name = name
+        self.schema = arrow_schema
+        self.format = file_format
+        self.run_tag = run_tag
+        self.writers = {}  # month -> (writer, tmp path, final path)
+
+    def write(self, month, table):
+        if month not in self.writers:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            directory = os.path.join(self.root, self.name, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self.run_tag}.{self.format}")
+            tmp_path = path + '.tmp'
+            if self.format == 'parquet':
+                writer = pq.ParquetWriter(tmp_path, self.schema, compression='zstd')
+            else:
+                writer = pa.ipc.new_file(tmp_path, self.schema)
+            self.writers[month] = (writer, tmp_path, path)
+        writer = self.writers[month][0]
+        writer.write_table(table)
+
+    def close(self):
+        paths = []
+        for writer, tmp_path, path in self.writers.values():
+            writer.close()
+            os.replace(tmp_path, path)
+            paths.append(path)
+        self.writers = {}
+        return paths
+
+
+def export_dataset(name, root, file_format='parquet', since=None, until=None, chunk_size=CHUNK_SIZE):
+    """
+    Write rows changed in (since, until] under root/name/month=YYYY-MM/.
+
+    Returns (rows written, files written, newest change value or None).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    model, change_column, partition_column = _datasets()[name]
+    writers = _PartitionWriters(root, name, schema(model), file_format,
+                                timezone.now().strftime('%Y%m%dT%H%M%S%f'))
+    rows = 0
+    newest = None
+    try:
+        for batch in record_batches(name, since, until, chunk_size):
+            table = pa.Table.from_batches([batch])
+            # Partition key in the site's timezone, like every report
+            local = table[partition_column].cast(pa.timestamp('us', tz=settings.TIME_ZONE))
+            months = pc.strftime(local, format='%Y-%m')
+            for month in pc.unique(months).to_pylist():
+                part = table.filter(pc.equal(months, month))
+                writers.write(month or 'unknown', part)
+            rows += batch.num_rows
+            newest = table[change_column][-1].as_py()
+    finally:
+        files = writers.close()
+    return rows, files, newest
+
+
+def export_all(root=None, datasets=DATASETS, file_format='parquet', full=False, chunk_size=CHUNK_SIZE):
+    """
+    Incremental export of every dataset; updates the watermarks.
+
+    Rows changed in the last few seconds are left for the next run, so a
+    transaction committing while we read can't slip under the watermark.
+    """
+    require_pyarrow()
+    root = root or settings.HISTORY_EXPORT_ROOT
+    state = {} if full else load_state(root)
+    until = timezone.now() - timedelta(seconds=5)
+    results = {}
+    for name in datasets:
+        watermark = state.get(name)
+        since = datetime.fromisoformat(watermark) if watermark else None
+        rows, files, newest = export_dataset(name, root, file_format, since, until, chunk_size)
+        if newest is not None:
+            state[name] = newest.isoformat()
+        results[name] = {'rows': rows, 'files': files, 'since': watermark}
+        save_state(root, state)
+    return results
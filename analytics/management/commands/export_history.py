@@ -0,0 +1,51 @@
+# analytics/management/commands/export_history.py
+"""
+Export booking history as Parquet (or Arrow) files partitioned by month.
+
+    python manage.py export_history                      # incremental, all datasets
+    python manage.py export_history --dataset bookings --format arrow
+    python manage.py export_history --full --output /data/pathan
+
+Run nightly from cron: only rows changed since the previous run are read
+(see analytics.exports). Needs pyarrow.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.exports import DATASETS, export_all
+
+
+class Command(BaseCommand):
+    help = "Incremental Parquet/Arrow export of bookings, packages and users"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', action='append', choices=DATASETS,
+                            help="Only this dataset (repeatable, default: all)")
+        parser.add_argument('--format', choices=('parquet', 'arrow'), default='parquet')
+        parser.add_argument('--output', help="Export root (default: settings.HISTORY_EXPORT_ROOT)")
+        parser.add_argument('--full', action='store_true', help="Ignore the watermarks and export everything")
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per record batch")
+
+    def handle(self, *args, **options):
+        root = options['output'] or settings.HISTORY_EXPORT_ROOT
+        started = time.perf_counter()
+        try:
+            results = export_all(
+                root,
+                datasets=options['dataset'] or DATASETS,
+                file_format=options['format'],
+                full=options['full'],
+                chunk_size=options['chunk_size'],
+            )
+        except ImportError as e:
+            raise CommandError(str(e))
+
+        for name, result in results.items():
+            since = f" since {result['since']}" if result['since'] else ""
+            self.stdout.write(f"  {name:<26} {result['rows']:>8} row(s) in {len(result['files'])} file(s){since}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported to {root} in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-19 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('source', models.CharField(choices=[('booking', 'One-way trip'), ('package', 'Package')], max_length=10)),
+                ('package_id', models.BigIntegerField(default=0)),
+                ('package_name', models.CharField(blank=True, max_length=200)),
+                ('vehicle_type', models.CharField(blank=True, max_length=20)),
+                ('route', models.CharField(blank=True, max_length=410)),
+                ('bookings', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('advance', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Revenue Rollup',
+                'verbose_name_plural': 'Revenue Rollups',
+                'ordering': ['bucket', 'period_start'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='revenuerollup',
+            index=models.Index(fields=['bucket', 'period_start', 'source'], name='rollup_bucket_period_idx'),
+        ),
+    ]
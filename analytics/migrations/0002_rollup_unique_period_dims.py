@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 19:10
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+KEY = ('bucket', 'period_start', 'source', 'package_id', 'package_name', 'vehicle_type', 'route')
+
+
+def drop_duplicates(apps, schema_editor):
+    """Concurrent refreshes could insert a combination twice; keep the newest row of each"""
+    RevenueRollup = apps.get_model('analytics', 'RevenueRollup')
+    duplicates = (
+        RevenueRollup.objects.values(*KEY)
+        .annotate(rows=Count('id'), newest=Max('id'))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates:
+        RevenueRollup.objects.filter(**{name: group[name] for name in KEY}).exclude(id=group['newest']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='revenuerollup',
+            constraint=models.UniqueConstraint(fields=KEY, name='rollup_unique_period_dims'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# analytics/models.py
+from django.db import models
+
+
+class RevenueRollup(models.Model):
+    """
+    Revenue of paid bookings for one period and one dimension combination.
+
+    Maintained by analytics.rollups from Booking/PackageBooking (and their
+    archive tables); never edited by hand. One-way trips have package_id 0
+    and an empty vehicle_type.
+    """
+    BUCKET_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+    
+    SOURCE_CHOICES = [
+        ('booking', 'One-way trip'),
+        ('package', 'Package'),
+    ]
+    
+    bucket = models.CharField(max_length=10, choices=BUCKET_CHOICES)
+    period_start = models.DateField()
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    
+    # Dimensions
+    package_id = models.BigIntegerField(default=0)
+    package_name = models.CharField(max_length=200, blank=True)
+    vehicle_type = models.CharField(max_length=20, blank=True)
+    route = models.CharField(max_length=410, blank=True)
+    
+    # Measures
+    bookings = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    advance = models.BigIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.bucket} {self.period_start} {self.source}: {self.revenue}"
+    
+    class Meta:
+        ordering = ['bucket', 'period_start']
+        verbose_name = 'Revenue Rollup'
+        verbose_name_plural = 'Revenue Rollups'
+        indexes = [
+            models.Index(fields=['bucket', 'period_start', 'source'], name='rollup_bucket_period_idx'),
+        ]
+        constraints = [
+            # One row per period and dimension combination: concurrent refreshes upsert it
+            models.UniqueConstraint(
+                fields=['bucket', 'period_start', 'source', 'package_id', 'package_name', 'vehicle_type', 'route'],
+                name='rollup_unique_period_dims',
+            ),
+        ]
@@ -0,0 +1,332 @@
+# analytics/rollups.py
+"""
+Incremental revenue rollups for one-way trips and packages.
+
+RevenueRollup keeps one row per bucket (day/week/month), period, source
+and dimension combination (package, vehicle type, route). When a booking
+is saved or deleted in a way that can move revenue (a paid booking is
+created or deleted, or a save changes the status, an amount, the route or
+package of a booking that is or was paid) its day is marked dirty. Once
+the transaction commits a core.tasks job recomputes each dirty day from
+the bookings of that day (hot and archive tables, one grouped query each)
+and re-sums the week and month containing it from the day rows; nothing
+is recomputed on the save path. Moving paid bookings to or from the
+trash (core.softdelete.trash_changed) marks their days the same way, and
+admin bulk actions that move revenue call mark_dirty(days_of(queryset)).
+Recomputing instead of adding deltas keeps the rollups exact whatever
+changed; other bulk changes made with queryset.update() bypass the
+signals and are picked up by the nightly
+`manage.py rebuild_revenue_rollups --days 7`.
+
+Revenue is counted on the booking's creation date, for CONFIRMED and
+COMPLETED bookings.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import CharField, Count, F, Sum, Value
+from django.db.models.functions import Coalesce, Concat, TruncDate
+from django.utils import timezone
+
+from .models import RevenueRollup
+
+PAID_STATUSES = ('CONFIRMED', 'COMPLETED')
+DIMENSIONS = ('package_id', 'package_name', 'vehicle_type', 'route')
+MEASURES = ('bookings', 'revenue', 'advance')
+
+
+def _sources():
+    """[(source, model, {dimension: expression}, revenue field)]"""
+    from bookings.models import ArchivedBooking, Booking
+    from packages.models import ArchivedPackageBooking, PackageBooking
+
+    trip = {
+        'dim_package_id': Value(0),
+        'dim_package_name': Value(''),
+        'dim_vehicle_type': Value(''),
+        'dim_route': Concat('pickup', Value(' → '), 'drop', output_field=CharField()),
+    }
+    package_route = Coalesce(
+        Concat('package__pickup_location', Value(' → '), 'package__drop_location', output_field=CharField()),
+        Value(''),
+    )
+    package = {
+        'dim_package_id': Coalesce(F('package_id'), Value(0)),
+        'dim_vehicle_type': Coalesce(F('package__vehicle_type'), Value('')),
+        'dim_route': package_route,
+    }
+    return [
+        ('booking', Booking, trip, 'total_price'),
+        ('booking', ArchivedBooking, trip, 'total_price'),
+        ('package', PackageBooking, {**package, 'dim_package_name': F('package__name')}, 'total_amount'),
+        ('package', ArchivedPackageBooking, {**package, 'dim_package_name': F('package_name')}, 'total_amount'),
+    ]
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+PERIODS = {
+    'week': (week_start, lambda start: start + timedelta(days=6)),
+    'month': (month_start, lambda start: (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)),
+}
+
+
+def _day_bounds(start, end):
+    """[start 00:00, day after end 00:00) in local time, for an index range scan on created_at"""
+    zone = timezone.get_current_timezone()
+    return (
+        datetime.combine(start, time.min, tzinfo=zone),
+        datetime.combine(end + timedelta(days=1), time.min, tzinfo=zone),
+    )
+
+
+def _day_rows(start, end):
+    """Aggregated day rows for [start, end], computed from the bookings"""
+    since, until = _day_bounds(start, end)
+    merged = {}
+    for source, model, dims, revenue_field in _sources():
+        rows = (
+            model.objects
+            # Not created_at__date: a cast of every row's created_at can't use the index
+            .filter(status__in=PAID_STATUSES, created_at__gte=since, created_at__lt=until)
+            .annotate(day=TruncDate('created_at'), **dims)
+            .values('day', *dims)
+            .annotate(n=Count('pk'), total=Sum(revenue_field), paid=Sum('advance_paid'))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['day'], source) + tuple(row[f'dim_{name}'] for name in DIMENSIONS)
+            n, total, paid = merged.get(key, (0, 0, 0))
+            merged[key] = (n + row['n'], total + (row['total'] or 0), paid + (row['paid'] or 0))
+    return [
+        RevenueRollup(
+            bucket='day', period_start=key[0], source=key[1],
+            **dict(zip(DIMENSIONS, key[2:])),
+            bookings=n, revenue=total, advance=paid,
+        )
+        for key, (n, total, paid) in merged.items()
+    ]
+
+
+def _replace(bucket, start, end, rollups):
+    """
+    Make the `bucket` rows of [start, end] exactly `rollups`.
+
+    Rows are upserted on the unique (bucket, period, source, dimensions) key
+    rather than deleted and re-inserted, so two refreshes of the same day
+    running at once can't both insert and double the revenue; rows whose
+    combination no longer has paid bookings are deleted.
+    """
+    keep = {(rollup.period_start, rollup.source, *(getattr(rollup, name) for name in DIMENSIONS)) for rollup in rollups}
+    existing = RevenueRollup.objects.filter(bucket=bucket, period_start__gte=start, period_start__lte=end)
+    stale = [
+        pk for pk, *key in existing.values_list('pk', 'period_start', 'source', *DIMENSIONS)
+        if tuple(key) not in keep
+    ]
+    if stale:
+        RevenueRollup.objects.filter(pk__in=stale).delete()
+    RevenueRollup.objects.bulk_create(
+        rollups,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['bucket', 'period_start', 'source', *DIMENSIONS],
+        update_fields=[*MEASURES, 'updated_at'],
+    )
+
+
+def _refresh_period(bucket, period_start):
+    period_end = PERIODS[bucket][1](period_start)
+    rows = (
+        RevenueRollup.objects
+        .filter(bucket='day', period_start__gte=period_start, period_start__lte=period_end)
+        .values('source', *DIMENSIONS)
+        .annotate(n=Sum('bookings'), total=Sum('revenue'), paid=Sum('advance'))
+        .order_by()
+    )
+    _replace(bucket, period_start, period_start, [
+        RevenueRollup(
+            bucket=bucket, period_start=period_start, source=row['source'],
+            **{name: row[name] for name in DIMENSIONS},
+            bookings=row['n'], revenue=row['total'], advance=row['paid'],
+        )
+        for row in rows
+    ])
+
+
+def refresh_range(start, end):
+    """Recompute the day rows of [start, end] and every week/month touching it"""
+    with transaction.atomic():
+        # Write first: concurrent refreshes of these days then queue up behind
+        # this one (row locks on PostgreSQL; on SQLite the write lock, taken
+        # before any read, so they wait instead of failing with "locked")
+        RevenueRollup.objects.filter(
+            bucket='day', period_start__gte=start, period_start__lte=end,
+        ).update(updated_at=timezone.now())
+        _replace('day', start, end, _day_rows(start, end))
+        for bucket, (first_day, last_day) in PERIODS.items():
+            period = first_day(start)
+            while period <= end:
+                _refresh_period(bucket, period)
+                period = last_day(period) + timedelta(days=1)
+
+
+# ============ SIGNALS ============
+# Fields of each model the rollups read; saves that touch none of them are ignored
+TRACKED_FIELDS = {
+    'bookings.Booking': ('status', 'total_price', 'advance_paid', 'pickup', 'drop', 'created_at'),
+    'packages.PackageBooking': ('status', 'total_amount', 'advance_paid', 'package', 'created_at'),
+}
+_UNKNOWN = object()
+
+
+def _tracked_values(sender, instance):
+    # __dict__ rather than getattr: a deferred field stays unknown instead of being loaded
+    return {
+        name: instance.__dict__.get(sender._meta.get_field(name).attname, _UNKNOWN)
+        for name in TRACKED_FIELDS[sender._meta.label]
+    }
+
+
+def refresh_days(days):
+    """Task: recompute each day (and its week and month)"""
+    for day in days:
+        refresh_range(day, day)
+
+
+def _flush(connection):
+    from core.tasks import enqueue
+
+    days = connection.analytics_dirty_days
+    connection.analytics_dirty_days = set()
+    connection.analytics_flush = None
+    enqueue(refresh_days, sorted(days))
+
+
+def mark_dirty(days):
+    """Refresh these days on a task worker once the transaction commits"""
+    from core.tasks import enqueue
+
+    if not days:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        enqueue(refresh_days, sorted(days))
+        return
+
+    # One job per transaction, however many bookings it touches.
+    # A rolled back transaction drops our callback, so check it's still queued.
+    flush = getattr(connection, 'analytics_flush', None)
+    if flush is None or not any(entry[1] is flush for entry in connection.run_on_commit):
+        connection.analytics_dirty_days = set()
+        connection.analytics_flush = flush = lambda: _flush(connection)
+        transaction.on_commit(flush, robust=True)
+    connection.analytics_dirty_days.update(days)
+
+
+def booking_loaded(sender, instance, **kwargs):
+    """post_init: remember the tracked values, to tell on save what changed"""
+    instance._rollup_values = _tracked_values(sender, instance)
+
+
+def booking_saved(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """post_save: mark the booking's day dirty if the save can change its revenue"""
+    if raw or instance.created_at is None:
+        return
+    before = getattr(instance, '_rollup_values', {})
+    after = _tracked_values(sender, instance)
+    if update_fields is not None:
+        saved = {sender._meta.get_field(name).name for name in update_fields}
+        after = {name: value for name, value in after.items() if name in saved}
+    instance._rollup_values = {**before, **after}
+
+    if created:
+        if instance.status in PAID_STATUSES:
+            mark_dirty({timezone.localdate(instance.created_at)})
+        return
+    changed = [
+        name for name, value in after.items()
+        if before.get(name, _UNKNOWN) is _UNKNOWN or before[name] != value
+    ]
+    if not changed:
+        return
+    was_paid = before.get('status', _UNKNOWN) in (*PAID_STATUSES, _UNKNOWN)
+    if not was_paid and instance.status not in PAID_STATUSES:
+        return
+
+    days = {timezone.localdate(instance.created_at)}
+    if 'created_at' in changed and before.get('created_at', _UNKNOWN) not in (_UNKNOWN, None):
+        days.add(timezone.localdate(before['created_at']))
+    mark_dirty(days)
+
+
+def booking_deleted(sender, instance, **kwargs):
+    """post_delete: a paid live booking leaving the table (archive, hard delete) moves its day"""
+    if instance.created_at is None or instance.deleted_at is not None:
+        return
+    if instance.status in PAID_STATUSES:
+        mark_dirty({timezone.localdate(instance.created_at)})
+
+
+def days_of(queryset):
+    """Local creation days of the queryset's bookings, for mark_dirty() around a queryset.update()"""
+    return {timezone.localdate(created_at) for created_at in queryset.values_list('created_at', flat=True)}
+
+
+def bookings_trashed(sender, pks, **kwargs):
+    """core.softdelete.trash_changed: paid bookings leaving or rejoining the live rows move their days"""
+    mark_dirty(days_of(sender._base_manager.filter(pk__in=pks, status__in=PAID_STATUSES)))
+
+
+# ============ QUERIES ============
+def pick_bucket(start, end):
+    """Coarsest bucket that still gives a useful chart for the range"""
+    days = (end - start).days + 1
+    if days <= 62:
+        return 'day'
+    if days <= 366:
+        return 'week'
+    return 'month'
+
+
+def revenue_report(start, end, bucket=None, source=None, group_by='period'):
+    """
+    Rows for the dashboard, read only from the rollups.
+
+    group_by: 'period' (time series) or one of 'package', 'vehicle_type',
+    'route', 'source'. Week/month ranges are widened to whole periods.
+    """
+    bucket = bucket or pick_bucket(start, end)
+    if bucket in PERIODS:
+        start = PERIODS[bucket][0](start)
+    rollups = RevenueRollup.objects.filter(bucket=bucket, period_start__gte=start, period_start__lte=end)
+    if source:
+        rollups = rollups.filter(source=source)
+
+    columns = {
+        'period': ('period_start',),
+        'package': ('package_id', 'package_name'),
+        'vehicle_type': ('vehicle_type',),
+        'route': ('route',),
+        'source': ('source',),
+    }[group_by]
+    ordering = columns if group_by == 'period' else ('-revenue_total',)
+    rows = list(
+        rollups.values(*columns)
+        .annotate(bookings_total=Sum('bookings'), revenue_total=Sum('revenue'), advance_total=Sum('advance'))
+        .order_by(*ordering)
+    )
+    totals = rollups.aggregate(bookings=Sum('bookings'), revenue=Sum('revenue'), advance=Sum('advance'))
+    return {
+        'bucket': bucket,
+        'start': start,
+        'end': end,
+        'rows': rows,
+        'totals': {name: totals[name] or 0 for name in MEASURES},
+    }
@@ -0,0 +1,9 @@
+# analytics/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.revenue_dashboard, name='revenue_dashboard'),
+    path('data/', views.revenue_data, name='revenue_data'),
+    path('export/<str:dataset>/', views.history_export, name='history_export'),
+]
@@ -0,0 +1,147 @@
+# analytics/views.py
+import io
+from datetime import timedelta
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core.routers import use_replica
+from . import exports
+from .models import RevenueRollup
+from .rollups import revenue_report
+
+GROUPS = [
+    ('period', 'Period'),
+    ('package', 'Package'),
+    ('vehicle_type', 'Vehicle type'),
+    ('route', 'Route'),
+    ('source', 'Booking type'),
+]
+
+
+def _report(request):
+    """revenue_report() for the ?from=&to=&bucket=&source=&group= filters"""
+    today = timezone.localdate()
+    try:
+        end = parse_date(request.GET.get('to', '')) or today
+        start = parse_date(request.GET.get('from', '')) or end - timedelta(days=29)
+    except ValueError:
+        start, end = today - timedelta(days=29), today
+    if start > end:
+        start, end = end, start
+
+    bucket = request.GET.get('bucket', '')
+    if bucket not in dict(RevenueRollup.BUCKET_CHOICES):
+        bucket = None
+    source = request.GET.get('source', '')
+    if source not in dict(RevenueRollup.SOURCE_CHOICES):
+        source = None
+    group_by = request.GET.get('group', 'period')
+    if group_by not in dict(GROUPS):
+        group_by = 'period'
+
+    report = revenue_report(start, end, bucket=bucket, source=source, group_by=group_by)
+    report.update({'requested_start': start, 'source': source or '', 'group_by': group_by})
+    return report
+
+
+def _label(row, group_by):
+    if group_by == 'period':
+        return row['period_start'].isoformat()
+    if group_by == 'package':
+        return row['package_name'] or f"Package #{row['package_id']}"
+    if group_by == 'source':
+        return dict(RevenueRollup.SOURCE_CHOICES).get(row['source'], row['source'])
+    return row[group_by] or '-'
+
+
+@staff_member_required
+@use_replica
+def revenue_dashboard(request):
+    """Revenue charts for staff, answered from the rollup tables"""
+    report = _report(request)
+    rows = [dict(row, label=_label(row, report['group_by'])) for row in report['rows']]
+    return render(request, 'analytics/dashboard.html', {
+        'report': report,
+        'rows': rows,
+        'chart': {
+            'labels': [row['label'] for row in rows],
+            'revenue': [row['revenue_total'] for row in rows],
+            'bookings': [row['bookings_total'] for row in rows],
+        },
+        'groups': GROUPS,
+        'buckets': RevenueRollup.BUCKET_CHOICES,
+        'sources': RevenueRollup.SOURCE_CHOICES,
+    })
+
+
+@staff_member_required
+@use_replica
+def revenue_data(request):
+    """Same report as JSON, for finance spreadsheets and scripts"""
+    report = _report(request)
+    return JsonResponse({
+        'bucket': report['bucket'],
+        'from': report['start'],
+        'to': report['end'],
+        'group': report['group_by'],
+        'totals': report['totals'],
+        'rows': [
+            {'label': _label(row, report['group_by']), 'bookings': row['bookings_total'],
+             'revenue': row['revenue_total'], 'advance': row['advance_total']}
+            for row in report['rows']
+        ],
+    })
+
+
+def _arrow_stream(name, since, until):
+    """Arrow IPC stream, one record batch per chunk, never the whole table in memory"""
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, exports.schema(exports.dataset_model(name)))
+    for batch in exports.record_batches(name, since, until):
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+@staff_member_required
+def history_export(request, dataset):
+    """
+    Stream a dataset as an Arrow IPC stream (pyarrow.ipc.open_stream).
+
+    ?since=<ISO datetime> returns only rows changed after it; pass the
+    previous response's X-Export-Until to sync incrementally.
+    """
+    if dataset not in exports.DATASETS:
+        raise Http404("Unknown dataset")
+    try:
+        exports.require_pyarrow()
+    except ImportError as e:
+        return HttpResponseBadRequest(str(e))
+
+    since = None
+    if request.GET.get('since'):
+        try:
+            since = parse_datetime(request.GET['since'])
+        except ValueError:
+            since = None
+        if since is None:
+            return HttpResponseBadRequest("since must be an ISO datetime")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    until = timezone.now() - timedelta(seconds=5)
+
+    response = StreamingHttpResponse(
+        _arrow_stream(dataset, since, until), content_type='application/vnd.apache.arrow.stream',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.arrows"'
+    response['X-Export-Until'] = until.isoformat()
+    return response
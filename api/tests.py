@@ -0,0 +1,87 @@
+# api/tests.py
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.benchmark import make_package
+
+KEY = 'test-key-123'
+
+
+@override_settings(API_KEYS=f'partner:{KEY}', API_PAGE_SIZE=2)
+class PackageListTests(TestCase):
+    """API keys, cursor pagination and ETag revalidation (api.utils)"""
+
+    def setUp(self):
+        for n, price in enumerate((9000, 7000, 7000, 12000, 5000)):
+            make_package(name=f"Package {n}", base_price=price)
+        self.url = reverse('api_package_list')
+
+    def get(self, key=KEY, **extra):
+        headers = {'HTTP_X_API_KEY': key} if key else {}
+        return self.client.get(self.url, extra.pop('data', None), **headers, **extra)
+
+    def test_missing_or_wrong_key_is_401(self):
+        for key in (None, 'wrong'):
+            response = self.get(key)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.json(), {'error': "Missing or invalid X-Api-Key"})
+
+    def test_cursor_round_trip(self):
+        seen, cursor = [], None
+        while True:
+            data = {'sort': 'price', **({'cursor': cursor} if cursor else {})}
+            page = self.get(data=data).json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen.extend(page['results'])
+            cursor = page['next']
+            if not cursor:
+                break
+
+        # Every package once, in (price, id) order across the two with the same price
+        keys = [(row['final_price'], row['id']) for row in seen]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(keys, sorted(keys))
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        cursor = self.get(data={'sort': 'price'}).json()['next']
+        response = self.get(data={'sort': 'newest', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_if_none_match_gets_304(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+
+        response = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], first['ETag'])
+
+        make_package(name="Package 5")
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+
+@override_settings(API_KEYS=f'partner:{KEY}')
+class TripBookingTests(TestCase):
+    """A one-way trip is booked at the quoted fare, and its status is readable straight away"""
+
+    def test_booking_matches_quote(self):
+        travel_date = (timezone.localdate() + timedelta(days=10)).isoformat()
+        quote = self.client.get(
+            reverse('api_trip_quote'), {'distance_km': 120, 'travel_date': travel_date}, HTTP_X_API_KEY=KEY,
+        ).json()
+        response = self.client.post(reverse('api_create_booking'), {
+            'name': 'Asha', 'phone': '9876543210', 'pickup': 'Ahmedabad', 'drop': 'Vadodara',
+            'distance_km': 120, 'travel_date': travel_date, 'travel_time': '09:00',
+        }, HTTP_X_API_KEY=KEY)
+        self.assertEqual(response.status_code, 201)
+        booking = response.json()
+        self.assertEqual(booking['total'], quote['total'])
+
+        status = self.client.get(
+            reverse('api_booking_status', args=[booking['invoice_no']]), {'phone': '9876543210'},
+            HTTP_X_API_KEY=KEY,
+        )
+        self.assertEqual(status.status_code, 200)
@@ -0,0 +1,13 @@
+# api/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('packages/', views.package_list, name='api_package_list'),
+    path('packages/<int:package_id>/', views.package_detail, name='api_package_detail'),
+    path('packages/<int:package_id>/availability/', views.package_availability, name='api_package_availability'),
+    path('packages/<int:package_id>/bookings/', views.create_package_booking, name='api_create_package_booking'),
+    path('quote/', views.trip_quote, name='api_trip_quote'),
+    path('bookings/', views.create_booking, name='api_create_booking'),
+    path('bookings/<str:invoice_no>/', views.booking_status, name='api_booking_status'),
+]
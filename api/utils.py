@@ -0,0 +1,196 @@
+# api/utils.py
+"""
+Plumbing shared by the JSON API views: API keys, compact JSON with ETags,
+sparse fieldsets and cursor pagination.
+
+Every request needs an `X-Api-Key` header holding one of settings.API_KEYS.
+Responses are built from .values() rows, never model instances, and
+written as compact JSON. GET responses carry an ETag (a hash of the body)
+and `Cache-Control: private, max-age=API_CACHE_SECONDS`, so a client
+revalidating with If-None-Match gets an empty 304 when nothing changed.
+
+Lists are paged with an opaque cursor instead of page numbers: the cursor
+holds the sort key of the last row sent, the next page is a keyset query
+(`WHERE (price, id) > (...)`), so deep pages cost the same as the first
+and rows added meanwhile never shift or repeat items.
+"""
+
+import base64
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import csrf_exempt
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+# ============ RESPONSES ============
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False)
+
+
+def error_response(message, status=400):
+    return HttpResponse(dumps({'error': message}), status=status, content_type='application/json')
+
+
+def json_response(request, data, status=200):
+    """JSON response; GETs get an ETag and a 304 when If-None-Match matches it"""
+    body = dumps(data).encode()
+    if request.method != 'GET' or status != 200:
+        return HttpResponse(body, status=status, content_type='application/json')
+
+    etag = quote_etag(hashlib.md5(body).hexdigest())
+    cache_control = f'private, max-age={settings.API_CACHE_SECONDS}'
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    # Compare weakly: GZip marks the ETag of a compressed response W/"..."
+    if etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(',')):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    response['Vary'] = 'X-Api-Key, Accept-Encoding'
+    return response
+
+
+# ============ AUTH ============
+def api_keys():
+    """{key: partner name} from settings.API_KEYS ('partner:key,partner:key')"""
+    keys = {}
+    for entry in settings.API_KEYS.split(','):
+        name, _, key = entry.strip().rpartition(':')
+        if key:
+            keys[key] = name or 'default'
+    return keys
+
+
+def partner_for(request):
+    supplied = request.META.get('HTTP_X_API_KEY', '')
+    if not supplied:
+        return None
+    for key, name in api_keys().items():
+        if constant_time_compare(supplied, key):
+            return name
+    return None
+
+
+def api_view(*methods):
+    """Allow `methods`, require an API key and turn ApiError into a JSON error"""
+    def decorator(view_func):
+        @csrf_exempt
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = error_response(f"Method {request.method} not allowed", status=405)
+                response['Allow'] = ', '.join(methods)
+                return response
+            request.api_partner = partner_for(request)
+            if request.api_partner is None:
+                return error_response("Missing or invalid X-Api-Key", status=401)
+            try:
+                return view_func(request, *args, **kwargs)
+            except ApiError as e:
+                return error_response(e.message, status=e.status)
+        return wrapper
+    return decorator
+
+
+def request_data(request):
+    """Body of a POST: JSON object, or form fields"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            raise ApiError("Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise ApiError("Request body must be a JSON object")
+        return data
+    return request.POST.dict()
+
+
+# ============ SPARSE FIELDSETS ============
+def requested_fields(request, allowed, default):
+    """?fields=id,name,... checked against `allowed`; `default` when absent"""
+    value = request.GET.get('fields', '').strip()
+    if not value:
+        return list(default)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+
+# ============ CURSOR PAGINATION ============
+def page_size(request):
+    value = request.GET.get('limit', '')
+    if not value:
+        return settings.API_PAGE_SIZE
+    if not value.isdigit() or int(value) < 1:
+        raise ApiError("limit must be a positive number")
+    return min(int(value), settings.API_MAX_PAGE_SIZE)
+
+
+def encode_cursor(sort, values):
+    raw = dumps([sort, *values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, *values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ApiError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ApiError("Cursor belongs to a different sort order")
+    return values
+
+
+def _after(ordering, values):
+    """Q for rows after `values` in `ordering` (a tuple like ('-final_price', '-id'))"""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def paginate(request, queryset, fields, sort, ordering):
+    """
+    ({'results': [...], 'next': cursor or None}) for a .values() page.
+    `ordering` must end in a unique column (id) so every row has one place.
+    """
+    limit = page_size(request)
+    keys = [field.lstrip('-') for field in ordering]
+    cursor = request.GET.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, sort)
+        if len(values) != len(keys):
+            raise ApiError("Invalid cursor")
+        queryset = queryset.filter(_after(ordering, values))
+
+    columns = list(dict.fromkeys([*fields, *keys]))
+    rows = list(queryset.order_by(*ordering).values(*columns)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort, [rows[-1][key] for key in keys])
+    if len(columns) > len(fields):
+        rows = [{field: row[field] for field in fields} for row in rows]
+    return {'results': rows, 'next': next_cursor}
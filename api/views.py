@@ -0,0 +1,323 @@
+# api/views.py
+"""
+JSON API for partner agents and the mobile app (/api/v1/, see api.utils).
+
+    GET  packages/                          active packages (?type= &vehicle_type= &min_price= &max_price= &sort=)
+    GET  packages/<id>/                     one package
+    GET  packages/<id>/availability/        price per travel date (?from= &days=)
+    POST packages/<id>/bookings/            book a package
+    GET  quote/                             one-way trip fare (?distance_km= &travel_date=)
+    POST bookings/                          book a one-way trip
+    GET  bookings/<invoice_no>/?phone=      status of either kind of booking
+
+New bookings are PENDING; the response's payment_url is the site's payment
+page, which confirms them as for bookings made on the site.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_time
+from django.views.decorators.gzip import gzip_page
+
+from bookings.models import Booking
+from bookings.utils import calculate_price
+from core.routers import use_replica
+from packages.models import Package, PackageBooking, PackageDailyPrice
+from packages.pricing import daily_prices
+
+from .utils import ApiError, api_view, json_response, paginate, request_data, requested_fields
+
+# ============ FIELDS ============
+PACKAGE_FIELDS = (
+    'id', 'name', 'package_type', 'description', 'pickup_location', 'drop_location', 'distance_km',
+    'duration_days', 'vehicle_type', 'max_passengers', 'final_price', 'advance_amount', 'price_per_km',
+    'scheduled_date', 'scheduled_time', 'cover_image', 'inclusion_list', 'exclusion_list',
+    'important_notes', 'updated_at',
+)
+PACKAGE_LIST_FIELDS = (
+    'id', 'name', 'package_type', 'pickup_location', 'drop_location', 'duration_days',
+    'vehicle_type', 'final_price', 'scheduled_date', 'cover_image',
+)
+
+# ?sort= -> keyset ordering (ends in the unique id)
+PACKAGE_SORTS = {
+    'newest': ('-id',),
+    'price': ('final_price', 'id'),
+    '-price': ('-final_price', '-id'),
+}
+
+MAX_AVAILABILITY_DAYS = 366
+TRIP_ADVANCE = Booking._meta.get_field('advance_paid').default
+
+
+def _media_urls(request, rows):
+    """cover_image paths -> absolute URLs"""
+    for row in rows:
+        if 'cover_image' in row:
+            path = row['cover_image']
+            row['cover_image'] = request.build_absolute_uri(settings.MEDIA_URL + path) if path else None
+    return rows
+
+
+def _positive_int(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"{name} must be a whole number")
+    if number < 0:
+        raise ApiError(f"{name} can't be negative")
+    return number
+
+
+def _date(value, name, required=True):
+    day = None
+    if value:
+        try:
+            day = parse_date(str(value))
+        except ValueError:
+            day = None
+        if day is None:
+            raise ApiError(f"{name} must be a date (YYYY-MM-DD)")
+    elif required:
+        raise ApiError(f"{name} is required")
+    return day
+
+
+def _required(data, *names):
+    missing = [name for name in names if not str(data.get(name) or '').strip()]
+    if missing:
+        raise ApiError(f"Missing field(s): {', '.join(missing)}")
+    return [str(data[name]).strip() for name in names]
+
+
+def _contact(data, name_field, phone_field, email_field):
+    name, phone = _required(data, name_field, phone_field)
+    if not (phone.isdigit() and len(phone) == 10):
+        raise ApiError(f"{phone_field} must be a 10 digit mobile number")
+    email = str(data.get(email_field) or '').strip()
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ApiError(f"{email_field} is not a valid email address")
+    return name[:100], phone, email or None
+
+
+def _active_package(package_id, *fields):
+    package = Package.objects.filter(pk=package_id, is_active=True).values(*fields).first()
+    if package is None:
+        raise ApiError("Package not found", status=404)
+    return package
+
+
+# ============ PACKAGES ============
+@gzip_page
+@api_view('GET')
+@use_replica
+def package_list(request):
+    fields = requested_fields(request, PACKAGE_FIELDS, PACKAGE_LIST_FIELDS)
+    packages = Package.objects.filter(is_active=True)
+
+    package_type = request.GET.get('type', '').upper()
+    if package_type:
+        if package_type not in dict(Package.PACKAGE_TYPES):
+            raise ApiError(f"Unknown type {package_type}")
+        packages = packages.filter(package_type=package_type)
+    vehicle_type = request.GET.get('vehicle_type', '').upper()
+    if vehicle_type:
+        if vehicle_type not in dict(Package.VEHICLE_TYPES):
+            raise ApiError(f"Unknown vehicle_type {vehicle_type}")
+        packages = packages.filter(vehicle_type=vehicle_type)
+    min_price = _positive_int(request.GET.get('min_price'), 'min_price')
+    if min_price is not None:
+        packages = packages.filter(final_price__gte=min_price)
+    max_price = _positive_int(request.GET.get('max_price'), 'max_price')
+    if max_price is not None:
+        packages = packages.filter(final_price__lte=max_price)
+
+    sort = request.GET.get('sort', 'newest')
+    if sort not in PACKAGE_SORTS:
+        raise ApiError(f"sort must be one of: {', '.join(PACKAGE_SORTS)}")
+
+    page = paginate(request, packages, fields, sort, PACKAGE_SORTS[sort])
+    _media_urls(request, page['results'])
+    return json_response(request, page)
+
+
+@gzip_page
+@api_view('GET')
+@use_replica
+def package_detail(request, package_id):
+    fields = requested_fields(request, PACKAGE_FIELDS, PACKAGE_FIELDS)
+    package = _active_package(package_id, *fields)
+    return json_response(request, _media_urls(request, [package])[0])
+
+
+@gzip_page
+@api_view('GET')
+@use_replica
+def package_availability(request, package_id):
+    """Price per travel date: the precomputed calendar, computed for days it doesn't cover yet"""
+    package = _active_package(
+        package_id, 'id', 'base_price', 'vehicle_type', 'is_festival_rate', 'max_passengers',
+        'advance_amount', 'scheduled_date', 'scheduled_time',
+    )
+    today = timezone.localdate()
+    start = max(_date(request.GET.get('from'), 'from', required=False) or today, today)
+    days = _positive_int(request.GET.get('days'), 'days') or 30
+    days = min(days, MAX_AVAILABILITY_DAYS)
+    end = start + timedelta(days=days - 1)
+
+    prices = {
+        row['date']: row
+        for row in PackageDailyPrice.objects.filter(package_id=package_id, date__range=(start, end))
+        .values('date', 'price', 'multiplier')
+    }
+    if len(prices) < days:
+        pricing = Package(
+            base_price=package['base_price'], vehicle_type=package['vehicle_type'],
+            is_festival_rate=package['is_festival_rate'],
+        )
+        for day, price, multiplier in daily_prices(pricing, start, days):
+            prices.setdefault(day, {'date': day, 'price': price, 'multiplier': multiplier})
+
+    return json_response(request, {
+        'package': package['id'],
+        'scheduled_date': package['scheduled_date'],
+        'scheduled_time': package['scheduled_time'],
+        'max_passengers': package['max_passengers'],
+        'advance_amount': package['advance_amount'],
+        'dates': [prices[day] for day in sorted(prices)],
+    })
+
+
+@api_view('POST')
+def create_package_booking(request, package_id):
+    data = request_data(request)
+    package = _active_package(package_id, 'id', 'final_price', 'advance_amount', 'max_passengers')
+    name, phone, email = _contact(data, 'customer_name', 'customer_phone', 'customer_email')
+    passengers = _positive_int(data.get('passengers_count', 1), 'passengers_count') or 0
+    if not 1 <= passengers <= package['max_passengers']:
+        raise ApiError(f"passengers_count must be between 1 and {package['max_passengers']}")
+
+    booking = PackageBooking.objects.create(
+        package_id=package['id'],
+        customer_name=name,
+        customer_phone=phone,
+        customer_email=email,
+        passengers_count=passengers,
+        special_requirements=str(data.get('special_requirements') or '')[:1000],
+        total_amount=package['final_price'],
+        advance_paid=package['advance_amount'],
+    )
+    return json_response(request, {
+        'id': booking.id,
+        'invoice_no': booking.invoice_no,
+        'status': booking.status,
+        'payment_status': booking.payment_status,
+        'total': booking.total_amount,
+        'advance_due': booking.advance_paid,
+        'payment_url': request.build_absolute_uri(reverse('package_payment', args=[booking.id])),
+    }, status=201)
+
+
+# ============ TRIPS ============
+def _trip_quote(distance, travel_date):
+    """(distance, fare) priced exactly as create_booking charges it"""
+    try:
+        distance = float(distance)
+    except (TypeError, ValueError):
+        raise ApiError("distance_km must be a number")
+    if not 0 < distance <= 5000:
+        raise ApiError("distance_km must be between 0 and 5000")
+    if travel_date < timezone.localdate():
+        raise ApiError("travel_date can't be in the past")
+    return distance, calculate_price(distance, travel_date=travel_date)
+
+
+@gzip_page
+@api_view('GET')
+@use_replica
+def trip_quote(request):
+    travel_date = _date(request.GET.get('travel_date'), 'travel_date')
+    distance, total = _trip_quote(request.GET.get('distance_km'), travel_date)
+    return json_response(request, {
+        'distance_km': distance,
+        'travel_date': travel_date,
+        'total': total,
+        'advance_due': TRIP_ADVANCE,
+    })
+
+
+@api_view('POST')
+def create_booking(request):
+    data = request_data(request)
+    name, phone, email = _contact(data, 'name', 'phone', 'email')
+    pickup, drop = _required(data, 'pickup', 'drop')
+    travel_date = _date(data.get('travel_date'), 'travel_date')
+    travel_time = parse_time(str(data.get('travel_time') or ''))
+    if travel_time is None:
+        raise ApiError("travel_time must be a time (HH:MM)")
+    distance, total = _trip_quote(data.get('distance_km'), travel_date)
+
+    booking = Booking.objects.create(
+        name=name,
+        phone=phone,
+        email=email,
+        pickup=pickup[:200],
+        drop=drop[:200],
+        distance_km=distance,
+        total_price=total,
+        travel_date=travel_date,
+        travel_time=travel_time,
+    )
+    return json_response(request, {
+        'id': booking.id,
+        'invoice_no': booking.invoice_no,
+        'status': booking.status,
+        'payment_status': booking.payment_status,
+        'total': booking.total_price,
+        'advance_due': booking.advance_paid,
+        'payment_url': request.build_absolute_uri(reverse('initiate_payment', args=[booking.id])),
+    }, status=201)
+
+
+# ============ BOOKING STATUS ============
+@gzip_page
+@api_view('GET')
+def booking_status(request, invoice_no):
+    """Either kind of booking by invoice number; the customer's phone must match"""
+    # Not @use_replica: clients poll this right after POST bookings/ and don't send
+    # the pin_primary cookie back, so a lagging replica would answer 404
+    phone = request.GET.get('phone', '').strip()
+    if not phone:
+        raise ApiError("phone is required")
+
+    if invoice_no.startswith('PTP-'):
+        booking = PackageBooking.objects.filter(invoice_no=invoice_no, customer_phone=phone).values(
+            'invoice_no', 'status', 'payment_status', 'passengers_count', 'created_at', 'updated_at',
+            package_name=F('package__name'), pickup=F('package__pickup_location'),
+            drop=F('package__drop_location'), travel_date=F('package__scheduled_date'),
+            travel_time=F('package__scheduled_time'), total=F('total_amount'), advance=F('advance_paid'),
+        ).first()
+        kind = 'package'
+    else:
+        booking = Booking.objects.filter(invoice_no=invoice_no, phone=phone).values(
+            'invoice_no', 'status', 'payment_status', 'pickup', 'drop', 'distance_km', 'travel_date',
+            'travel_time', 'created_at', 'updated_at', total=F('total_price'), advance=F('advance_paid'),
+        ).first()
+        kind = 'trip'
+    if booking is None:
+        raise ApiError("Booking not found", status=404)
+
+    booking['kind'] = kind
+    booking['remaining'] = booking['total'] - booking['advance']
+    return json_response(request, booking)
@@ -3,43 +3,44 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.contrib import messages
 from django.urls import reverse
-from .models import Booking
+from django.utils import timezone
+from analytics import rollups
+from core import audit
+from core.admin import TrashAdmin
+from core.notifications import render
+from .models import ArchivedBooking, Booking, DeletedBooking
+from .notifications import SNAPSHOT_VALUES, snapshot
 import urllib.parse
 import webbrowser
 
 
 @admin.action(description="📱 Send WhatsApp confirmation")
 def send_whatsapp_confirmation(modeladmin, request, queryset):
-    for booking in queryset:
-        msg = f"""Hello {booking.name} 👋
-
-Your booking is CONFIRMED ✅
-
-📋 Booking ID: {booking.invoice_no}
-📍 Route: {booking.pickup} → {booking.drop}
-📏 Distance: {booking.distance_km} KM
-
-💰 Total Fare: ₹{booking.total_price}
-💵 Advance Paid: ₹{booking.advance_paid}
-💳 Remaining Amount: ₹{booking.remaining_amount}
-
-Pathan Tours & Travels 🚗
-📞 9879230065"""
+    for row in queryset.values(*SNAPSHOT_VALUES):
+        data = snapshot(row)
+        msg = render('booking_confirmation', 'whatsapp', data)
         
-        url = f"https://wa.me/91{booking.phone}?text={urllib.parse.quote(msg)}"
+        url = f"https://wa.me/91{data['phone']}?text={urllib.parse.quote(msg)}"
         webbrowser.open_new_tab(url)
-        modeladmin.message_user(request, f"WhatsApp opened for {booking.name}")
+        modeladmin.message_user(request, f"WhatsApp opened for {data['name']}")
 
 
 @admin.action(description="✅ Mark as Confirmed")
 def mark_as_confirmed(modeladmin, request, queryset):
-    queryset.update(status='CONFIRMED')
+    # update() sends no save signals: mark the revenue rollup days by hand
+    days = rollups.days_of(queryset)
+    with audit.track(queryset, 'bookings.mark_as_confirmed', fields=('status',)):
+        queryset.update(status='CONFIRMED', updated_at=timezone.now())
+    rollups.mark_dirty(days)
 
 
 @admin.action(description="💰 Mark as Fully Paid")
 def mark_as_fully_paid(modeladmin, request, queryset):
     from django.db.models import F
-    queryset.update(payment_status='FULLY_PAID', advance_paid=F('total_price'))
+    days = rollups.days_of(queryset.filter(status__in=rollups.PAID_STATUSES))
+    with audit.track(queryset, 'bookings.mark_as_fully_paid', fields=('payment_status', 'advance_paid')):
+        queryset.update(payment_status='FULLY_PAID', advance_paid=F('total_price'), updated_at=timezone.now())
+    rollups.mark_dirty(days)
 
 
 # ============ NEW DELETE ACTIONS ============
@@ -61,23 +62,25 @@ def delete_selected_bookings(modeladmin, request, queryset):
     if count > 10:
         messages.warning(
             request, 
-            f"You are about to delete {count} bookings. This action cannot be undone!"
+            f"Deleting {count} bookings. They can be restored from Deleted Bookings (Trash)."
         )
     
-    deleted_count, _ = queryset.delete()
+    with audit.track(queryset, 'bookings.delete_selected_bookings', action='delete'):
+        deleted_count, _ = queryset.delete()
     messages.success(
         request, 
-        f"Successfully deleted {deleted_count} booking(s)."
+        f"Moved {deleted_count} booking(s) to the trash."
     )
 
 
 @admin.action(description="❌ Cancel selected bookings")
 def cancel_selected_bookings(modeladmin, request, queryset):
     """કેટલીક bookings cancel કરવી"""
-    for booking in queryset:
-        booking.status = 'CANCELLED'
-        booking.payment_status = 'PENDING'
-        booking.save()
+    with audit.track(queryset, 'bookings.cancel_selected_bookings', fields=('status', 'payment_status')):
+        for booking in queryset:
+            booking.status = 'CANCELLED'
+            booking.payment_status = 'PENDING'
+            booking.save()
     
     count = queryset.count()
     messages.success(
@@ -96,17 +99,19 @@ def delete_cancelled_bookings(modeladmin, request, queryset):
         messages.info(request, "No cancelled bookings found in selection.")
         return
     
-    deleted_count, _ = cancelled_bookings.delete()
-    messages.success(request, f"Deleted {deleted_count} cancelled booking(s).")
+    with audit.track(cancelled_bookings, 'bookings.delete_cancelled_bookings', action='delete'):
+        deleted_count, _ = cancelled_bookings.delete()
+    messages.success(request, f"Moved {deleted_count} cancelled booking(s) to the trash.")
 
 
 @admin.action(description="🚫 Delete pending bookings (old)")
 def delete_old_pending_bookings(modeladmin, request, queryset):
-    """7 દિવસથી જૂની pending bookings delete કરવી"""
+    """PENDING_BOOKING_TTL_HOURS થી જૂની pending bookings delete કરવી"""
+    from django.conf import settings
     from django.utils import timezone
     from datetime import timedelta
     
-    old_date = timezone.now() - timedelta(days=7)
+    old_date = timezone.now() - timedelta(hours=settings.PENDING_BOOKING_TTL_HOURS)
     old_bookings = queryset.filter(
         status='PENDING',
         created_at__lt=old_date
@@ -117,8 +122,9 @@ def delete_old_pending_bookings(modeladmin, request, queryset):
         messages.info(request, "No old pending bookings found.")
         return
     
-    deleted_count, _ = old_bookings.delete()
-    messages.success(request, f"Deleted {deleted_count} old pending booking(s).")
+    with audit.track(old_bookings, 'bookings.delete_old_pending_bookings', action='delete'):
+        deleted_count, _ = old_bookings.delete()
+    messages.success(request, f"Moved {deleted_count} old pending booking(s) to the trash.")
 # ============ END NEW ACTIONS ============
 
 
@@ -387,4 +393,49 @@ class BookingAdmin(admin.ModelAdmin):
             'can_delete': booking.status not in ['CONFIRMED', 'COMPLETED'],
         })
         
-        return super().delete_view(request, object_id, extra_context)
\ No newline at end of file
+        return super().delete_view(request, object_id, extra_context)
+    
+    def delete_model(self, request, obj):
+        with audit.track(Booking.objects.filter(pk=obj.pk), 'bookings.admin_delete', action='delete'):
+            super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        with audit.track(queryset, 'bookings.admin_delete_selected', action='delete'):
+            super().delete_queryset(request, queryset)
+
+
+# ============ TRASH (soft-deleted, see core.softdelete) ============
+@admin.register(DeletedBooking)
+class DeletedBookingAdmin(TrashAdmin):
+    list_display = ('invoice_no', 'name', 'phone', 'pickup', 'drop', 'travel_date', 'total_price', 'status', 'deleted_at')
+    list_filter = ('status', 'payment_status', 'deleted_at')
+    search_fields = ('invoice_no', 'name', 'phone', 'email')
+
+
+# ============ ARCHIVED BOOKINGS (read-only, see archive_bookings) ============
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    list_display = (
+        'invoice_no',
+        'name',
+        'phone',
+        'pickup',
+        'drop',
+        'travel_date',
+        'total_price',
+        'status',
+        'created_at',
+        'archived_at',
+    )
+    list_filter = ('status', 'payment_status', 'travel_date', 'created_at')
+    search_fields = ('invoice_no', 'name', 'phone', 'email', 'razorpay_payment_id')
+    date_hierarchy = 'created_at'
+    list_per_page = 50
+    # COUNT(*) over years of history is the slowest part of the page
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('phone', models.CharField(max_length=10)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('pickup', models.CharField(max_length=200)),
+                ('drop', models.CharField(max_length=200)),
+                ('distance_km', models.FloatField()),
+                ('travel_date', models.DateField()),
+                ('travel_time', models.TimeField()),
+                ('total_price', models.IntegerField()),
+                ('advance_paid', models.IntegerField()),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=200, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('CONFIRMED', 'Confirmed'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('payment_status', models.CharField(choices=[('PENDING', 'Pending'), ('ADVANCE_PAID', 'Advance Paid'), ('FULLY_PAID', 'Fully Paid')], max_length=20)),
+                ('invoice_no', models.CharField(blank=True, db_index=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Archived Booking',
+                'verbose_name_plural': 'Archived Bookings',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['created_at'], name='archived_booking_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['phone'], name='archived_booking_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
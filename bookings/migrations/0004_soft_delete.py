@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_alter_booking_razorpay_order_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedBooking',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Deleted Booking',
+                'verbose_name_plural': 'Deleted Bookings (Trash)',
+                'ordering': ['-deleted_at'],
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('bookings.booking',),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', 'created_at'], name='booking_live_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='booking_trash_idx'),
+        ),
+    ]
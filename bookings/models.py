@@ -2,7 +2,9 @@
 from django.db import models
 from django.utils import timezone
 
-class Booking(models.Model):
+from core.softdelete import SoftDeleteModel, TrashManager
+
+class Booking(SoftDeleteModel):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('CONFIRMED', 'Confirmed'),
@@ -35,7 +37,7 @@ class Booking(models.Model):
     advance_paid = models.IntegerField(default=1000)
     
     # Payment Information
-    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
     razorpay_signature = models.CharField(max_length=200, blank=True, null=True)
     
@@ -59,7 +61,8 @@ class Booking(models.Model):
             prefix = f"PT-{date_str}-"
             
             # Find the last invoice number for today
-            last_invoice = Booking.objects.filter(
+            # Trashed bookings keep their numbers (invoice_no is unique)
+            last_invoice = Booking.all_objects.filter(
                 invoice_no__startswith=prefix
             ).order_by('-invoice_no').first()
             
@@ -86,4 +89,72 @@ class Booking(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Booking'
-        verbose_name_plural = 'Bookings'
\ No newline at end of file
+        verbose_name_plural = 'Bookings'
+        indexes = [
+            # Admin lists and the archive/expiry jobs: status + age, live rows only
+            models.Index(
+                fields=['status', 'created_at'], name='booking_live_status_idx',
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Trash view and purge_deleted_bookings
+            models.Index(
+                fields=['deleted_at'], name='booking_trash_idx',
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
+
+
+class DeletedBooking(Booking):
+    """Bookings in the trash (soft-deleted), for the admin trash view"""
+    objects = TrashManager()
+    
+    class Meta:
+        proxy = True
+        ordering = ['-deleted_at']
+        verbose_name = 'Deleted Booking'
+        verbose_name_plural = 'Deleted Bookings (Trash)'
+
+
+class ArchivedBooking(models.Model):
+    """
+    Completed/cancelled bookings moved out of Booking by archive_bookings.
+
+    Same columns and id as the original row; read-only history.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    phone = models.CharField(max_length=10)
+    email = models.EmailField(blank=True, null=True)
+    pickup = models.CharField(max_length=200)
+    drop = models.CharField(max_length=200)
+    distance_km = models.FloatField()
+    travel_date = models.DateField()
+    travel_time = models.TimeField()
+    total_price = models.IntegerField()
+    advance_paid = models.IntegerField()
+    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_signature = models.CharField(max_length=200, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    payment_status = models.CharField(max_length=20, choices=Booking.PAYMENT_STATUS_CHOICES)
+    invoice_no = models.CharField(max_length=20, blank=True, null=True, db_index=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    notes = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField()
+    
+    @property
+    def remaining_amount(self):
+        return self.total_price - self.advance_paid
+    
+    def __str__(self):
+        return f"{self.invoice_no} - {self.name} (archived)"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Booking'
+        verbose_name_plural = 'Archived Bookings'
+        indexes = [
+            models.Index(fields=['created_at'], name='archived_booking_created_idx'),
+            models.Index(fields=['phone'], name='archived_booking_phone_idx'),
+        ]
\ No newline at end of file
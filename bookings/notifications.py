@@ -0,0 +1,165 @@
+# bookings/notifications.py
+"""Notification templates and snapshots for one-way trip bookings (see core.notifications)"""
+
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+
+from core.notifications import register
+
+# Columns a snapshot needs: Booking.objects.values(*SNAPSHOT_VALUES)
+SNAPSHOT_VALUES = (
+    'id', 'name', 'phone', 'email', 'invoice_no', 'pickup', 'drop', 'distance_km',
+    'travel_date', 'travel_time', 'total_price', 'advance_paid',
+)
+
+FIELDS = (
+    'id', 'name', 'phone', 'email', 'invoice_no', 'pickup', 'drop', 'distance_km',
+    'travel_date', 'travel_time', 'total', 'advance', 'remaining', 'invoice_url',
+)
+
+
+_from_instance = attrgetter(*SNAPSHOT_VALUES)
+_from_row = itemgetter(*SNAPSHOT_VALUES)
+
+
+def snapshot(booking):
+    """Display strings of a Booking instance or a .values(*SNAPSHOT_VALUES) row"""
+    (pk, name, phone, email, invoice_no, pickup, drop, distance_km,
+     travel_date, travel_time, total, advance) = (
+        _from_row(booking) if isinstance(booking, dict) else _from_instance(booking)
+    )
+    return {
+        'id': str(pk),
+        'name': name,
+        'phone': phone,
+        'email': email or '',
+        'invoice_no': invoice_no or 'N/A',
+        'pickup': pickup,
+        'drop': drop,
+        'distance_km': str(distance_km),
+        'travel_date': str(travel_date),
+        'travel_time': travel_time.strftime('%I:%M %p') if travel_time else '',
+        'total': str(total),
+        'advance': str(advance),
+        'remaining': str(total - advance),
+        'invoice_url': f"{settings.SITE_URL}/book/invoice/{pk}/",
+    }
+
+
+# ============ ENGLISH ============
+register('booking_confirmation', 'whatsapp', fields=FIELDS, body="""\
+Hello {name} 👋
+
+Your booking is CONFIRMED ✅
+
+📋 Booking ID: {invoice_no}
+📍 Route: {pickup} → {drop}
+📏 Distance: {distance_km} KM
+🗓 Travel Date: {travel_date}
+⏰ Travel Time: {travel_time}
+
+💰 Total Fare: ₹{total}
+💵 Advance Paid: ₹{advance}
+💳 Remaining Amount: ₹{remaining}
+
+📄 Invoice Download: {invoice_url}
+
+Pathan Tours & Travels 🚗
+📞 9879230065
+📍 Download invoice from above link""")
+
+register('booking_confirmation', 'share', fields=FIELDS, body="""\
+Hello {name} 👋
+
+Your booking is CONFIRMED ✅
+
+📋 Booking ID: {invoice_no}
+📍 Route: {pickup} → {drop}
+📏 Distance: {distance_km} KM
+🗓 Travel Date: {travel_date}
+⏰ Travel Time: {travel_time}
+
+💰 Total Fare: ₹{total}
+💵 Advance Paid: ₹{advance}
+💳 Remaining Amount: ₹{remaining}
+
+📄 Invoice: {invoice_url}""")
+
+register('booking_confirmation', 'email', fields=FIELDS, subject="Booking Confirmed - {invoice_no}", body="""\
+Hello {name},
+
+Your booking has been confirmed!
+
+Booking ID: {invoice_no}
+Route: {pickup} to {drop}
+Distance: {distance_km} KM
+Travel Date: {travel_date}
+Total Fare: ₹{total}
+Advance Paid: ₹{advance}
+Remaining: ₹{remaining}
+
+Thank you for choosing Pathan Travels!""")
+
+register('booking_confirmation', 'sms', fields=FIELDS, body=(
+    "Pathan Travels: booking {invoice_no} confirmed, {pickup} to {drop} on {travel_date} {travel_time}. "
+    "Paid Rs.{advance}, balance Rs.{remaining}. Invoice: {invoice_url}"
+))
+
+
+# ============ ગુજરાતી ============
+register('booking_confirmation', 'whatsapp', language='gu', fields=FIELDS, body="""\
+નમસ્તે {name} 👋
+
+તમારું બુકિંગ કન્ફર્મ થઈ ગયું છે ✅
+
+📋 બુકિંગ ID: {invoice_no}
+📍 રૂટ: {pickup} → {drop}
+📏 અંતર: {distance_km} KM
+🗓 મુસાફરીની તારીખ: {travel_date}
+⏰ મુસાફરીનો સમય: {travel_time}
+
+💰 કુલ ભાડું: ₹{total}
+💵 ચૂકવેલ એડવાન્સ: ₹{advance}
+💳 બાકી રકમ: ₹{remaining}
+
+📄 ઇન્વૉઇસ ડાઉનલોડ: {invoice_url}
+
+પઠાણ ટુર્સ એન્ડ ટ્રાવેલ્સ 🚗
+📞 9879230065""")
+
+register('booking_confirmation', 'share', language='gu', fields=FIELDS, body="""\
+નમસ્તે {name} 👋
+
+તમારું બુકિંગ કન્ફર્મ થઈ ગયું છે ✅
+
+📋 બુકિંગ ID: {invoice_no}
+📍 રૂટ: {pickup} → {drop}
+🗓 મુસાફરીની તારીખ: {travel_date}
+⏰ મુસાફરીનો સમય: {travel_time}
+
+💰 કુલ ભાડું: ₹{total}
+💳 બાકી રકમ: ₹{remaining}
+
+📄 ઇન્વૉઇસ: {invoice_url}""")
+
+register('booking_confirmation', 'email', language='gu', fields=FIELDS,
+         subject="બુકિંગ કન્ફર્મ - {invoice_no}", body="""\
+નમસ્તે {name},
+
+તમારું બુકિંગ કન્ફર્મ થઈ ગયું છે!
+
+બુકિંગ ID: {invoice_no}
+રૂટ: {pickup} થી {drop}
+અંતર: {distance_km} KM
+મુસાફરીની તારીખ: {travel_date}
+કુલ ભાડું: ₹{total}
+ચૂકવેલ એડવાન્સ: ₹{advance}
+બાકી રકમ: ₹{remaining}
+
+પઠાણ ટ્રાવેલ્સ પસંદ કરવા બદલ આભાર!""")
+
+register('booking_confirmation', 'sms', language='gu', fields=FIELDS, body=(
+    "પઠાણ ટ્રાવેલ્સ: બુકિંગ {invoice_no} કન્ફર્મ, {pickup} થી {drop}, {travel_date} {travel_time}. "
+    "બાકી ₹{remaining}. ઇન્વૉઇસ: {invoice_url}"
+))
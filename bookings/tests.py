@@ -1,3 +1,145 @@
-from django.test import TestCase
+# bookings/tests.py
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from analytics.rollups import revenue_report
+from core.benchmark import make_booking, make_package, make_package_booking, make_user
+from core.models import PaymentEvent
+from core.payments import record_payment
+
+from .models import Booking
+from .views import confirm_booking_payment
+
+
+@override_settings(TASKS_EAGER=True)
+class RecordPaymentTests(TestCase):
+    """core.payments.record_payment: callbacks are idempotent per payment_id"""
+
+    def setUp(self):
+        self.booking = make_booking(razorpay_order_id='order_1')
+        self.notified = []
+
+    def pay(self, payment_id):
+        return record_payment(
+            'booking',
+            Booking.objects.filter(razorpay_order_id='order_1'),
+            payment_id,
+            'order_1',
+            confirm=lambda booking: confirm_booking_payment(booking, payment_id, 'sig'),
+            notify=lambda booking: self.notified.append(booking.pk),
+        )
+
+    def test_duplicate_payment_id_confirms_and_notifies_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, created = self.pay('pay_1')
+        with self.captureOnCommitCallbacks(execute=True):
+            retry, retry_created = self.pay('pay_1')
+
+        self.assertTrue(created)
+        self.assertFalse(retry_created)
+        self.assertEqual(retry.pk, first.pk)
+        self.assertEqual(PaymentEvent.objects.filter(payment_id='pay_1').count(), 1)
+        self.assertEqual(self.notified, [self.booking.pk])
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, 'CONFIRMED')
+        self.assertEqual(self.booking.payment_status, 'ADVANCE_PAID')
+        self.assertEqual(self.booking.razorpay_payment_id, 'pay_1')
+
+    def test_second_payment_for_paid_booking_is_recorded_but_not_applied(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pay('pay_1')
+        with self.captureOnCommitCallbacks(execute=True):
+            event, created = self.pay('pay_2')
+
+        self.assertTrue(created)
+        self.assertEqual(event.outcome, 'ALREADY_PAID')
+        self.assertEqual(self.notified, [self.booking.pk])
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.razorpay_payment_id, 'pay_1')
+
+    def test_unknown_order_raises(self):
+        with self.assertRaises(Booking.DoesNotExist):
+            record_payment('booking', Booking.objects.filter(razorpay_order_id='nope'), 'pay_x', 'nope')
+
+
+@override_settings(TASKS_EAGER=True)
+class SoftDeleteTests(TestCase):
+    """core.softdelete managers, and revenue rollups following bookings in and out of the trash"""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.live = make_booking(0)
+            self.paid = make_booking(1, status='CONFIRMED')
+
+    def trash(self, booking):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+
+    def revenue(self):
+        today = timezone.localdate()
+        return revenue_report(today, today, bucket='day')['totals']['revenue']
+
+    def test_managers(self):
+        self.trash(self.paid)
+
+        self.assertQuerysetEqual(Booking.objects.all(), [self.live])
+        self.assertQuerysetEqual(Booking.trash.all(), [self.paid])
+        self.assertQuerysetEqual(Booking.all_objects.order_by('pk'), [self.live, self.paid])
+        self.assertTrue(Booking.all_objects.get(pk=self.paid.pk).is_deleted)
+
+    def test_reverse_manager_hides_trashed_rows(self):
+        package = make_package()
+        kept = make_package_booking(package, 0)
+        trashed = make_package_booking(package, 1)
+        self.trash(trashed)
+
+        self.assertQuerysetEqual(package.bookings.all(), [kept])
+
+    def test_trashing_paid_booking_removes_its_revenue(self):
+        self.assertEqual(self.revenue(), self.paid.total_price)
+
+        self.trash(self.paid)
+        self.assertEqual(self.revenue(), 0)
+
+    def test_restoring_paid_booking(self):
+        self.trash(self.paid)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(Booking.trash.filter(pk=self.paid.pk).restore(), 1)
+
+        self.assertTrue(Booking.objects.filter(pk=self.paid.pk).exists())
+        self.assertFalse(Booking.trash.exists())
+        self.assertEqual(self.revenue(), self.paid.total_price)
+
+
+@override_settings(TASKS_EAGER=True)
+class BookingAdminActionTests(TestCase):
+    """Bulk admin actions use queryset.update(), so they mark the rollup days themselves"""
+
+    def setUp(self):
+        self.client.force_login(make_user('admin@example.com', is_staff=True, is_superuser=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking = make_booking(0)
+
+    def run_action(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('admin:bookings_booking_changelist'),
+                {'action': action, '_selected_action': [self.booking.pk]},
+            )
+        self.assertEqual(response.status_code, 302)
+
+    def totals(self):
+        today = timezone.localdate()
+        return revenue_report(today, today, bucket='day')['totals']
+
+    def test_confirm_and_fully_paid_reach_dashboard_totals(self):
+        self.assertEqual(self.totals()['revenue'], 0)
+
+        self.run_action('mark_as_confirmed')
+        self.assertEqual(self.totals()['revenue'], self.booking.total_price)
+        self.assertEqual(self.totals()['advance'], self.booking.advance_paid)
+
+        self.run_action('mark_as_fully_paid')
+        self.assertEqual(self.totals()['advance'], self.booking.total_price)
@@ -1,87 +1,55 @@
 import os
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
 from django.conf import settings
-from twilio.rest import Client
 
-def calculate_price(distance_km, is_festival=False):
+def calculate_price(distance_km, is_festival=False, travel_date=None, vehicle_type=None):
+    """Fare for a one-way trip; with a travel_date the pricing calendar's multiplier applies"""
     rate_per_km = 16 if is_festival else 14
+    if travel_date:
+        from packages.pricing import multiplier_for
+        rate_per_km *= multiplier_for(travel_date, vehicle_type)
     return int(distance_km * rate_per_km)
 
 # bookings/utils.py
 import os
-import requests
 from django.conf import settings
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from twilio.rest import Client
+from core.invoices import render_invoice
+from core.messaging import send_whatsapp
+from core.notifications import render, render_email
+from .notifications import snapshot
+
+# ============ MESSAGE BUILDERS ============
+# Pure functions (no I/O) so they can be benchmarked and reused by every sender.
+# The texts live in bookings/notifications.py, in English and Gujarati.
+
+def booking_whatsapp_message(booking, language=None):
+    """WhatsApp confirmation body sent through Twilio"""
+    return render('booking_confirmation', 'whatsapp', snapshot(booking), language)
+
+
+def booking_share_message(booking, language=None):
+    """Text for the api.whatsapp.com share link fallback"""
+    return render('booking_confirmation', 'share', snapshot(booking), language)
+
+
+def booking_confirmation_email(booking, language=None):
+    """(subject, body) of the confirmation email"""
+    return render_email('booking_confirmation', snapshot(booking), language)
+
 
 def send_whatsapp_message(booking):
-    try:
-        client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
-        )
-        
-        # PDF બનાવો
-        pdf_path = create_invoice_pdf(booking)
-        
-        # Site URL (તમારું વેબસાઈટ URL)
-        site_url = settings.SITE_URL
-        
-        # PDF ડાઉનલોડ લિંક
-        pdf_download_url = f"{site_url}/book/invoice/{booking.id}/"
-        
-        msg = (
-            f"Hello {booking.name} 👋\n\n"
-            f"Your booking is CONFIRMED ✅\n\n"
-            f"📋 Booking ID: {booking.invoice_no}\n"
-            f"📍 Route: {booking.pickup} → {booking.drop}\n"
-            f"📏 Distance: {booking.distance_km} KM\n"
-            f"🗓 Travel Date: {booking.travel_date}\n"
-            f"⏰ Travel Time: {booking.travel_time.strftime('%I:%M %p')}\n\n"
-            f"💰 Total Fare: ₹{booking.total_price}\n"
-            f"💵 Advance Paid: ₹{booking.advance_paid}\n"
-            f"💳 Remaining Amount: ₹{booking.remaining_amount}\n\n"
-            f"📄 Invoice Download: {pdf_download_url}\n\n"
-            f"Pathan Tours & Travels 🚗\n"
-            f"📞 9879230065\n"
-            f"📍 Download invoice from above link"
-        )
-        
-        client.messages.create(
-            from_=settings.TWILIO_WHATSAPP_NUMBER,
-            to=f"whatsapp:+91{booking.phone}",
-            body=msg
-        )
+    # The message links to the invoice view, which renders the PDF on demand
+    if send_whatsapp(booking.phone, booking_whatsapp_message(booking)):
         return True
-    except Exception as e:
-        print(f"WhatsApp error: {e}")
-        
-        # Alternative: WhatsApp business API નો ઉપયોગ કરો
-        send_whatsapp_via_url(booking)
-        return False
+    
+    # Alternative: WhatsApp business API નો ઉપયોગ કરો
+    send_whatsapp_via_url(booking)
+    return False
 
 def send_whatsapp_via_url(booking):
     """WhatsApp લિંક દ્વારા મેસેજ મોકલવું"""
     try:
         phone = booking.phone
-        site_url = settings.SITE_URL
-        pdf_download_url = f"{site_url}/book/invoice/{booking.id}/"
-        
-        message = (
-            f"Hello {booking.name} 👋\n\n"
-            f"Your booking is CONFIRMED ✅\n\n"
-            f"📋 Booking ID: {booking.invoice_no}\n"
-            f"📍 Route: {booking.pickup} → {booking.drop}\n"
-            f"📏 Distance: {booking.distance_km} KM\n"
-            f"🗓 Travel Date: {booking.travel_date}\n"
-            f"⏰ Travel Time: {booking.travel_time.strftime('%I:%M %p')}\n\n"
-            f"💰 Total Fare: ₹{booking.total_price}\n"
-            f"💵 Advance Paid: ₹{booking.advance_paid}\n"
-            f"💳 Remaining Amount: ₹{booking.remaining_amount}\n\n"
-            f"📄 Invoice: {pdf_download_url}"
-        )
+        message = booking_share_message(booking)
         
         # WhatsApp લિંક બનાવો
         whatsapp_url = f"https://api.whatsapp.com/send?phone=91{phone}&text={message}"
@@ -94,79 +62,32 @@ def send_whatsapp_via_url(booking):
         print(f"WhatsApp URL error: {e}")
         return None
 
+def booking_invoice_data(booking):
+    """Values stamped on the booking invoice (see core.invoices.LAYOUTS)"""
+    return {
+        'invoice_no': booking.invoice_no,
+        'date': booking.created_at.strftime('%d-%m-%Y %I:%M %p'),
+        'customer': booking.name,
+        'phone': booking.phone,
+        'email': booking.email,
+        'pickup': booking.pickup,
+        'drop': booking.drop,
+        'distance': f"{booking.distance_km} KM",
+        'travel_date': booking.travel_date,
+        'travel_time': booking.travel_time.strftime('%I:%M %p'),
+        'total': booking.total_price,
+        'advance': booking.advance_paid,
+        'remaining': booking.remaining_amount,
+    }
+
+
+def invoice_pdf_path(booking_id):
+    return os.path.join(settings.MEDIA_ROOT, "invoices", f"invoice_{booking_id}.pdf")
+
+
 def create_invoice_pdf(booking):
-    invoice_dir = os.path.join(settings.MEDIA_ROOT, "invoices")
-    os.makedirs(invoice_dir, exist_ok=True)
-    
-    file_path = os.path.join(invoice_dir, f"invoice_{booking.id}.pdf")
-    
-    p = canvas.Canvas(file_path, pagesize=A4)
-    width, height = A4
-    y = height - 50
-    
-    # Header
-    p.setFont("Helvetica-Bold", 18)
-    p.drawCentredString(width/2, y, "PATHAN TRAVELS - INVOICE")
-    y -= 40
-    
-    # Invoice Details
-    p.setFont("Helvetica", 11)
-    p.drawString(50, y, f"Invoice No: {booking.invoice_no}")
-    p.drawString(350, y, f"Date: {booking.created_at.strftime('%d-%m-%Y %I:%M %p')}")
-    y -= 25
-    
-    # Customer Details
-    p.drawString(50, y, f"Customer: {booking.name}")
-    y -= 20
-    p.drawString(50, y, f"Phone: {booking.phone}")
-    if booking.email:
-        y -= 20
-        p.drawString(50, y, f"Email: {booking.email}")
-    y -= 20
-    
-    # Trip Details
-    p.drawString(50, y, f"Pickup: {booking.pickup}")
-    y -= 20
-    p.drawString(50, y, f"Drop: {booking.drop}")
-    y -= 20
-    p.drawString(50, y, f"Distance: {booking.distance_km} KM")
-    y -= 20
-    
-    # Travel Date/Time
-    p.drawString(50, y, f"Travel Date: {booking.travel_date}")
-    y -= 20
-    p.drawString(50, y, f"Travel Time: {booking.travel_time.strftime('%I:%M %p')}")
-    y -= 20
-    
-    # Payment Details
-    y -= 10
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(50, y, "Payment Summary")
-    y -= 25
-    
-    p.setFont("Helvetica", 11)
-    p.drawString(50, y, f"Total Fare: ₹{booking.total_price}")
-    y -= 20
-    p.drawString(50, y, f"Advance Paid: ₹{booking.advance_paid}")
-    y -= 20
-    p.drawString(50, y, f"Remaining Amount: ₹{booking.remaining_amount}")
-    
-    # Contact Information
-    y -= 30
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(50, y, "Contact Information")
-    y -= 20
-    
-    p.setFont("Helvetica", 10)
-    p.drawString(50, y, "Pathan Tours & Travels")
-    y -= 15
-    p.drawString(50, y, "Phone: 9879230065, 9925993770")
-    y -= 15
-    p.drawString(50, y, "Email: pathanashif124@gmail.com")
-    
-    p.showPage()
-    p.save()
-    
-    return file_path
+    file_path = invoice_pdf_path(booking.id)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return render_invoice('booking', booking_invoice_data(booking), file_path)
 
 
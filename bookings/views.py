@@ -3,13 +3,21 @@ from django.http import HttpResponse, JsonResponse
 from django.contrib import messages
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
-from django.core.mail import send_mail
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 import razorpay
 import json
 
+from core import audit
+from core.contact import submit as submit_contact
+from core.http import conditional
+from core.mail import send_email
+from core.payments import record_payment
+from core.providers import razorpay_client
 from .models import Booking
-from .utils import calculate_price, create_invoice_pdf, send_whatsapp_message
+from .utils import (
+    booking_confirmation_email, calculate_price, create_invoice_pdf, send_whatsapp_message,
+)
 
 # ============================================
 # FIXED VERSION WITH ERROR HANDLING
@@ -19,33 +27,40 @@ from .utils import calculate_price, create_invoice_pdf, send_whatsapp_message
 RAZORPAY_ENABLED = False
 client = None
 
-try:
-    if hasattr(settings, 'RAZORPAY_KEY_ID') and hasattr(settings, 'RAZORPAY_KEY_SECRET'):
-        if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
-            # Test if keys are valid
-            if settings.RAZORPAY_KEY_ID.startswith('rzp_') and len(settings.RAZORPAY_KEY_SECRET) > 10:
-                client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-                
-                # Test connection with small amount
-                test_order = client.order.create({
-                    "amount": 100,  # ₹1 for testing
-                    "currency": "INR",
-                    "payment_capture": 1,
-                })
-                
-                RAZORPAY_ENABLED = True
-                print("✅ Razorpay enabled successfully")
+def configure_razorpay():
+    """(Re)build the module Razorpay client from settings"""
+    global client, RAZORPAY_ENABLED
+    RAZORPAY_ENABLED = False
+    client = None
+    try:
+        if hasattr(settings, 'RAZORPAY_KEY_ID') and hasattr(settings, 'RAZORPAY_KEY_SECRET'):
+            if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
+                # Test if keys are valid
+                if settings.RAZORPAY_KEY_ID.startswith('rzp_') and len(settings.RAZORPAY_KEY_SECRET) > 10:
+                    client = razorpay_client()
+                    
+                    # Test connection with small amount
+                    test_order = client.order.create({
+                        "amount": 100,  # ₹1 for testing
+                        "currency": "INR",
+                        "payment_capture": 1,
+                    })
+                    
+                    RAZORPAY_ENABLED = True
+                    print("✅ Razorpay enabled successfully")
+                else:
+                    print("⚠️ Razorpay keys appear invalid")
             else:
-                print("⚠️ Razorpay keys appear invalid")
+                print("⚠️ Razorpay keys are empty")
         else:
-            print("⚠️ Razorpay keys are empty")
-    else:
-        print("⚠️ Razorpay keys not found in settings")
-        
-except Exception as e:
-    print(f"❌ Razorpay initialization failed: {str(e)}")
-    client = None
-    RAZORPAY_ENABLED = False
+            print("⚠️ Razorpay keys not found in settings")
+            
+    except Exception as e:
+        print(f"❌ Razorpay initialization failed: {str(e)}")
+        client = None
+        RAZORPAY_ENABLED = False
+
+configure_razorpay()
 
 def book_trip(request):
     """Booking form - FIXED VERSION"""
@@ -65,8 +80,8 @@ def book_trip(request):
                 messages.error(request, "Please enter valid distance")
                 return render(request, 'bookings/booking_form.html')
             
-            # Calculate price
-            total_price = calculate_price(distance)
+            # Calculate price (seasonal/surge rules for the travel date)
+            total_price = calculate_price(distance, travel_date=parse_date(travel_date or ''))
             
             # Create booking
             booking = Booking.objects.create(
@@ -199,64 +214,34 @@ def payment_success(request):
                     messages.error(request, "Payment verification failed")
                     return redirect('book_trip')
             
-            # Get or create booking
+            # Which booking: simulation order ids carry the booking id
+            # (sim_order_<id>_<timestamp> / sim_fallback_<id>)
             if razorpay_order_id.startswith('sim_'):
-                # Extract booking ID from simulation order ID
                 try:
-                    booking_id = int(razorpay_order_id.split('_')[1])
-                    booking = Booking.objects.get(id=booking_id)
-                except:
+                    booking_id = next(int(part) for part in razorpay_order_id.split('_') if part.isdigit())
+                    bookings = Booking.all_objects.filter(id=booking_id)
+                except StopIteration:
                     messages.error(request, "Invalid booking")
                     return redirect('book_trip')
             else:
-                # Real Razorpay order
-                try:
-                    booking = Booking.objects.get(razorpay_order_id=razorpay_order_id)
-                except Booking.DoesNotExist:
-                    messages.error(request, "Booking not found")
-                    return redirect('book_trip')
+                bookings = Booking.all_objects.filter(razorpay_order_id=razorpay_order_id)
             
-            # Update booking
-            booking.razorpay_payment_id = razorpay_payment_id
-            booking.razorpay_signature = razorpay_signature
-            booking.status = 'CONFIRMED'
-            booking.payment_status = 'ADVANCE_PAID'
-            booking.advance_paid = 1000
-            booking.save()
-            
-            # Send WhatsApp
+            # Retries/double-submits are answered from the stored PaymentEvent
             try:
-                send_whatsapp_message(booking)
-            except Exception as e:
-                print(f"WhatsApp error: {e}")
-            
-            # Send email
-            if booking.email:
-                try:
-                    send_mail(
-                        subject=f"Booking Confirmed - {booking.invoice_no or 'N/A'}",
-                        message=f"""Hello {booking.name},
-
-Your booking has been confirmed!
-
-Booking ID: {booking.invoice_no or 'N/A'}
-Route: {booking.pickup} to {booking.drop}
-Distance: {booking.distance_km} KM
-Travel Date: {booking.travel_date}
-Total Fare: ₹{booking.total_price}
-Advance Paid: ₹{booking.advance_paid}
-Remaining: ₹{booking.remaining_amount}
-
-Thank you for choosing Pathan Travels!""",
-                        from_email=settings.EMAIL_HOST_USER,
-                        recipient_list=[booking.email],
-                        fail_silently=True,
-                    )
-                except Exception as e:
-                    print(f"Email error: {e}")
+                event, created = record_payment(
+                    'booking',
+                    bookings,
+                    razorpay_payment_id,
+                    razorpay_order_id,
+                    confirm=lambda booking: confirm_booking_payment(booking, razorpay_payment_id, razorpay_signature),
+                    notify=notify_booking,
+                )
+            except Booking.DoesNotExist:
+                messages.error(request, "Booking not found")
+                return redirect('book_trip')
             
             messages.success(request, "✅ Payment successful! Booking confirmed.")
-            return redirect('booking_confirmation', booking_id=booking.id)
+            return redirect('booking_confirmation', booking_id=event.booking_id)
             
         except Exception as e:
             messages.error(request, f"❌ Payment processing failed: {str(e)}")
@@ -264,11 +249,38 @@ Thank you for choosing Pathan Travels!""",
     
     return redirect('book_trip')
 
+def confirm_booking_payment(booking, payment_id, signature):
+    """Mark a booking's advance paid; returns the fields to save"""
+    booking.razorpay_payment_id = payment_id
+    booking.razorpay_signature = signature
+    booking.status = 'CONFIRMED'
+    booking.payment_status = 'ADVANCE_PAID'
+    booking.advance_paid = 1000
+    # A paid booking never stays in the trash
+    booking.deleted_at = None
+    return ['razorpay_payment_id', 'razorpay_signature', 'status', 'payment_status', 'advance_paid',
+            'deleted_at', 'updated_at']
+
+def notify_booking(booking):
+    """WhatsApp + email once a booking is paid (runs after commit)"""
+    try:
+        send_whatsapp_message(booking)
+    except Exception as e:
+        print(f"WhatsApp error: {e}")
+    
+    if booking.email:
+        subject, body = booking_confirmation_email(booking)
+        send_email(subject, body, [booking.email])
+
 def booking_confirmation(request, booking_id):
     """Booking confirmation page"""
     booking = get_object_or_404(Booking, id=booking_id)
     return render(request, 'bookings/confirmation.html', {'booking': booking})
 
+def invoice_version(request, booking_id):
+    return Booking.objects.filter(id=booking_id).values_list('updated_at', flat=True).first()
+
+@conditional(invoice_version, last_modified_func=lambda updated_at: updated_at, shared=False)
 def generate_invoice_pdf(request, booking_id):
     """Generate invoice PDF"""
     booking = get_object_or_404(Booking, id=booking_id)
@@ -307,42 +319,12 @@ def generate_invoice_pdf(request, booking_id):
 def contact(request):
     """Contact form"""
     if request.method == "POST":
-        name = request.POST.get('name')
-        email = request.POST.get('email')
-        phone = request.POST.get('phone', '')
-        message = request.POST.get('message')
-        
-        try:
-            # Save to file instead of email (for testing)
-            import os
-            from django.conf import settings
-            
-            contact_dir = os.path.join(settings.MEDIA_ROOT, "contacts")
-            os.makedirs(contact_dir, exist_ok=True)
-            
-            filename = f"contact_{int(timezone.now().timestamp())}.txt"
-            filepath = os.path.join(contact_dir, filename)
-            
-            with open(filepath, 'w') as f:
-                f.write(f"Name: {name}\nEmail: {email}\nPhone: {phone}\n\nMessage:\n{message}")
-            
+        # Stored in the admin inbox; staff are emailed in the background (core.contact)
+        message, error = submit_contact(request, source='booking')
+        if message:
             messages.success(request, "✅ Message sent successfully!")
-            
-            # Also try to send email if configured
-            try:
-                if hasattr(settings, 'CONTACT_EMAIL') and settings.CONTACT_EMAIL:
-                    send_mail(
-                        subject=f"Contact Form: {name}",
-                        message=f"Name: {name}\nEmail: {email}\nPhone: {phone}\n\nMessage:\n{message}",
-                        from_email=settings.EMAIL_HOST_USER,
-                        recipient_list=[settings.CONTACT_EMAIL],
-                        fail_silently=True,
-                    )
-            except:
-                pass
-                
-        except Exception as e:
-            messages.error(request, f"❌ Failed to save message: {str(e)}")
+        else:
+            messages.error(request, f"❌ {error}")
     
     return render(request, 'bookings/contact.html')
 
@@ -393,21 +375,11 @@ def admin_delete_booking(request, booking_id):
                 )
                 return redirect('admin:bookings_booking_change', object_id=booking.id)
             
-            # Delete booking
-            booking.delete()
-            
-            # Log the action
-            import os
-            from django.conf import settings
-            
-            log_dir = os.path.join(settings.MEDIA_ROOT, "logs")
-            os.makedirs(log_dir, exist_ok=True)
-            
-            log_file = os.path.join(log_dir, "deleted_bookings.log")
-            with open(log_file, 'a') as f:
-                f.write(f"[{timezone.now()}] {request.user.username} deleted booking: {booking_info}\n")
+            # Delete booking (recorded in the audit log with its last values)
+            with audit.track(Booking.objects.filter(pk=booking.pk), 'bookings.admin_delete_booking', action='delete'):
+                booking.delete()
             
-            messages.success(request, f"Booking {booking_info} deleted successfully.")
+            messages.success(request, f"Booking {booking_info} moved to the trash.")
             return redirect('admin:bookings_booking_changelist')
             
         except Exception as e:
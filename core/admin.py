@@ -1,4 +1,131 @@
-from django.contrib import admin
+# core/admin.py
+from django.contrib import admin, messages
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 
-# Register your models here.
-# packages/admin.py - SUPER SIMPLE  
+from . import audit
+from .audit import export_csv
+
+from .models import AuditLog, ContactMessage, PaymentEvent
+
+
+@admin.register(PaymentEvent)
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = ('payment_id', 'order_id', 'kind', 'booking_id', 'outcome', 'created_at')
+    list_filter = ('kind', 'outcome', 'created_at')
+    search_fields = ('payment_id', 'order_id')
+    date_hierarchy = 'created_at'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.action(description="👁️ Mark as Read")
+def mark_as_read(modeladmin, request, queryset):
+    queryset.update(status='READ', updated_at=timezone.now())
+
+
+@admin.action(description="✉️ Mark as Replied")
+def mark_as_replied(modeladmin, request, queryset):
+    queryset.update(status='REPLIED', updated_at=timezone.now())
+
+
+@admin.action(description="🚫 Mark as Spam")
+def mark_as_spam(modeladmin, request, queryset):
+    queryset.update(status='SPAM', updated_at=timezone.now())
+
+
+@admin.register(ContactMessage)
+class ContactMessageAdmin(admin.ModelAdmin):
+    list_display = ('name', 'email', 'phone', 'short_message', 'source', 'status', 'created_at', 'notified_at')
+    # notified_at "Empty": messages staff were never emailed about (notify_contact_messages retries them)
+    list_filter = ('status', 'source', ('notified_at', admin.EmptyFieldListFilter), 'created_at')
+    search_fields = ('name', 'email', 'phone', 'message')
+    date_hierarchy = 'created_at'
+    list_per_page = 50
+    show_full_result_count = False
+    actions = [mark_as_read, mark_as_replied, mark_as_spam]
+    fields = ('name', 'email', 'phone', 'message', 'status', 'source', 'ip_address',
+              'created_at', 'notified_at', 'imported_from')
+    readonly_fields = ('name', 'email', 'phone', 'message', 'source', 'ip_address',
+                       'created_at', 'notified_at', 'imported_from')
+    
+    def short_message(self, obj):
+        return obj.message[:60] + ('…' if len(obj.message) > 60 else '')
+    short_message.short_description = 'Message'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        # Opening a new message marks it read
+        if request.method == 'GET':
+            ContactMessage.objects.filter(pk=object_id, status='NEW').update(
+                status='READ', updated_at=timezone.now(),
+            )
+        return super().change_view(request, object_id, form_url, extra_context)
+
+
+@admin.action(description="📥 Export selected entries to CSV")
+def export_audit_csv(modeladmin, request, queryset):
+    response = StreamingHttpResponse(export_csv(queryset), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="audit_log_{timezone.now():%Y%m%d_%H%M}.csv"'
+    return response
+
+
+@admin.register(AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'actor_name', 'action', 'operation', 'model', 'object_id', 'object_repr')
+    list_filter = ('action', 'model', 'created_at')
+    search_fields = ('actor_name', 'operation', 'object_id', 'object_repr')
+    date_hierarchy = 'created_at'
+    list_per_page = 50
+    show_full_result_count = False
+    actions = [export_audit_csv]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+# ============ TRASH (soft-deleted bookings, see core.softdelete) ============
+@admin.action(description="♻️ Restore selected")
+def restore_selected(modeladmin, request, queryset):
+    with audit.track(queryset, f'{modeladmin.opts.app_label}.restore', fields=('deleted_at',)):
+        restored = queryset.restore()
+    messages.success(request, f"Restored {restored} row(s).")
+
+
+@admin.action(description="🔥 Delete selected permanently")
+def purge_selected(modeladmin, request, queryset):
+    with audit.track(queryset, f'{modeladmin.opts.app_label}.purge', action='delete'):
+        purged, _ = queryset.hard_delete()
+    messages.success(request, f"Permanently deleted {purged} row(s).")
+
+
+class TrashAdmin(admin.ModelAdmin):
+    """Read-only list of a SoftDeleteModel proxy whose default manager is `trash`"""
+    date_hierarchy = 'deleted_at'
+    list_per_page = 50
+    show_full_result_count = False
+    actions = [restore_selected, purge_selected]
+    
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Django's delete_selected would only soft-delete again
+        actions.pop('delete_selected', None)
+        return actions
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
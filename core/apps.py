@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_save, pre_save
+        from .db import apply_sqlite_pragmas
+        from .images import image_models, upload_saved, upload_started
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='core.sqlite_pragmas')
+        for model in image_models():
+            pre_save.connect(upload_started, sender=model, dispatch_uid=f'core.upload_started.{model._meta.label}')
+            post_save.connect(upload_saved, sender=model, dispatch_uid=f'core.upload_saved.{model._meta.label}')
@@ -0,0 +1,44 @@
+# core/archive.py
+"""
+Move old rows from a hot table into its archive table.
+
+Archive models mirror the hot model's columns (same names, same primary
+key) plus `archived_at`. Rows are copied and deleted in batches, each batch
+in its own transaction, so a long run never holds one huge lock and an
+interrupted run loses nothing: a row is either still hot or already
+archived.
+
+    moved = archive_rows(Booking.objects.filter(...), ArchivedBooking)
+"""
+
+from django.db import router, transaction
+from django.utils import timezone
+
+
+def archive_rows(queryset, archive_model, batch_size=1000, snapshot=None):
+    """
+    Copy every row of `queryset` into `archive_model`, then delete it.
+
+    `snapshot` maps extra archive fields to expressions evaluated in the
+    same SELECT, e.g. {'package_name': F('package__name')}. Returns rows moved.
+    """
+    model = queryset.model
+    archive_fields = {field.attname for field in archive_model._meta.concrete_fields}
+    columns = [field.attname for field in model._meta.concrete_fields if field.attname in archive_fields]
+    pk = model._meta.pk.attname
+    using = router.db_for_write(model)
+    moved = 0
+
+    while True:
+        with transaction.atomic(using=using):
+            # Re-select each time: the previous batch has been deleted
+            rows = list(queryset.using(using).order_by('pk').values(*columns, **(snapshot or {}))[:batch_size])
+            if not rows:
+                break
+            now = timezone.now()
+            archive_model.objects.using(using).bulk_create(
+                [archive_model(archived_at=now, **row) for row in rows],
+            )
+            model._base_manager.using(using).filter(pk__in=[row[pk] for row in rows]).delete()
+        moved += len(rows)
+    return moved
@@ -0,0 +1,184 @@
+# core/audit.py
+"""
+Audit trail of admin changes (core.models.AuditLog).
+
+Wrap a bulk update or delete in track(): it reads the affected rows'
+values before (one query) and, for updates, after (one more query), and
+records one AuditLog entry per changed row.
+
+    with audit.track(queryset, 'bookings.mark_as_fully_paid'):
+        queryset.update(payment_status='FULLY_PAID', advance_paid=F('total_price'))
+
+    with audit.track(queryset, 'bookings.delete_selected_bookings', action='delete'):
+        queryset.delete()
+
+Entries are not written one by one: during a request AuditMiddleware keeps
+them in a buffer and writes them with one bulk_create when the response is
+ready, filling in the staff user, IP and path. Outside a request (shell,
+management commands) each track() writes its entries straight away, unless
+wrapped in buffered(). A buffer that grows past AUDIT_BUFFER_SIZE entries
+is flushed early, so a huge bulk action can't hold everything in memory.
+
+Nothing is recorded if the wrapped block raises. export_csv() streams
+entries for compliance requests (AuditLogAdmin action, export_audit_log).
+"""
+
+import csv
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .contact import client_ip
+from .models import AuditLog
+
+DESCRIBE_FIELDS = ('invoice_no', 'name', 'customer_name', 'email', 'username')
+
+_buffer = ContextVar('audit_buffer', default=None)
+
+
+class _Buffer:
+    def __init__(self, request=None):
+        self.request = request
+        self.entries = []
+
+
+def _write(entries, request=None):
+    if not entries:
+        return
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        actor, actor_name = user, user.get_username()
+    else:
+        actor, actor_name = None, ''
+    ip = client_ip(request) if request is not None else None
+    path = request.path[:255] if request is not None else ''
+    for entry in entries:
+        entry.actor = actor
+        entry.actor_name = actor_name
+        entry.ip_address = ip
+        entry.path = path
+    try:
+        AuditLog.objects.bulk_create(entries, batch_size=500)
+    except Exception as e:
+        print(f"Audit log error ({len(entries)} entries): {e}")
+
+
+def flush():
+    """Write the current buffer's entries now"""
+    buffer = _buffer.get()
+    if buffer is not None:
+        entries, buffer.entries = buffer.entries, []
+        _write(entries, buffer.request)
+
+
+@contextmanager
+def buffered(request=None):
+    """Collect entries recorded inside the block and write them once at the end"""
+    buffer = _Buffer(request)
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
+        _write(buffer.entries, request)
+
+
+def _add(entries):
+    buffer = _buffer.get()
+    if buffer is None:
+        _write(entries)
+        return
+    buffer.entries.extend(entries)
+    if len(buffer.entries) >= settings.AUDIT_BUFFER_SIZE:
+        flush()
+
+
+def _describe(row):
+    for field in DESCRIBE_FIELDS:
+        if row.get(field):
+            return str(row[field])[:200]
+    return ''
+
+
+def _values(queryset, fields):
+    return {row['pk']: row for row in queryset.values('pk', *fields)}
+
+
+@contextmanager
+def track(queryset, operation, action='update', fields=None):
+    """
+    Record the rows of queryset changed or deleted inside the block.
+    fields limits the snapshot to those columns (default: every column);
+    update entries keep only the columns that actually changed.
+    """
+    model = queryset.model
+    fields = tuple(fields or (field.attname for field in model._meta.concrete_fields))
+    before = _values(queryset, fields)
+    yield queryset
+    if not before:
+        return
+
+    if action == 'delete':
+        after = {}
+    else:
+        after = _values(model._base_manager.filter(pk__in=list(before)), fields)
+
+    label = model._meta.label_lower
+    entries = []
+    for pk, old in before.items():
+        old.pop('pk')
+        new = after.get(pk)
+        if new is not None:
+            new.pop('pk')
+            if action == 'update':
+                changed = [field for field in fields if old[field] != new[field]]
+                if not changed:
+                    continue
+                old = {field: old[field] for field in changed}
+                new = {field: new[field] for field in changed}
+        entries.append(AuditLog(
+            action=action, operation=operation, model=label, object_id=str(pk),
+            object_repr=_describe(old) or _describe(new or {}), before=old, after=new,
+        ))
+    _add(entries)
+
+
+# ============ EXPORT ============
+EXPORT_COLUMNS = (
+    'created_at', 'actor_name', 'ip_address', 'path', 'action', 'operation',
+    'model', 'object_id', 'object_repr', 'before', 'after',
+)
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each line back"""
+
+    def write(self, value):
+        return value
+
+
+def export_csv(queryset):
+    """CSV lines (header first) for AuditLog rows, read in chunks"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in queryset.order_by('created_at', 'pk').values_list(*EXPORT_COLUMNS).iterator(chunk_size=2000):
+        *head, before, after = row
+        yield writer.writerow([
+            *head,
+            json.dumps(before, cls=DjangoJSONEncoder, ensure_ascii=False) if before is not None else '',
+            json.dumps(after, cls=DjangoJSONEncoder, ensure_ascii=False) if after is not None else '',
+        ])
+
+
+class AuditMiddleware:
+    """Buffer a request's audit entries and write them in one bulk_create"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered(request):
+            return self.get_response(request)
@@ -0,0 +1,213 @@
+# core/benchmark.py
+"""Helpers shared by the bench_* management commands"""
+
+import gc
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, time as dtime, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def benchmark_database(aliases=('default',), file_backed=False):
+    """
+    Run the block against throwaway test databases, never the real ones.
+
+    SQLite test databases live in memory unless file_backed is set, which is
+    what you want when measuring locking and journaling behaviour.
+    """
+    setup_test_environment()
+    old_names = []
+    for alias in aliases:
+        connection = connections[alias]
+        old_names.append((connection, connection.settings_dict['NAME']))
+        if file_backed and connection.vendor == 'sqlite':
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(
+                tempfile.gettempdir(), f"pathan_bench_{alias}_{os.getpid()}.sqlite3"
+            )
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        for connection, old_name in old_names:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, elapsed=None):
+    """p50/p95/p99 (ms) and throughput for a list of per-call timings in seconds"""
+    summary = {
+        'count': len(samples),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+    if elapsed:
+        summary['per_second'] = round(len(samples) / elapsed, 1)
+    return summary
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (seconds, result)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def measure(func, loops=5, warmup=1, budget=None):
+    """
+    pyperf-style timing of func().
+
+    `warmup` calls are discarded, then up to `loops` calls are timed (fewer
+    when `budget` seconds would be exceeded), then one more call runs under
+    tracemalloc to record peak memory.
+    """
+    first = None
+    for _ in range(warmup):
+        first, _ = timed(func)
+    if budget and first:
+        loops = max(1, min(loops, int(budget / first)))
+
+    samples = []
+    gc.collect()
+    for _ in range(loops):
+        seconds, _ = timed(func)
+        samples.append(seconds)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'loops': loops,
+        'mean_ms': round(statistics.mean(samples) * 1000, 3),
+        'stdev_ms': round(statistics.stdev(samples) * 1000, 3) if len(samples) > 1 else 0.0,
+        'min_ms': round(min(samples) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def write_results(path, payload):
+    """Write benchmark output as JSON, creating the directory if needed"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, default=str)
+    return path
+
+
+def results_dir():
+    return getattr(settings, 'BENCHMARK_RESULTS_DIR', os.path.join(settings.BASE_DIR, 'bench_results'))
+
+
+def git_revision():
+    """Short commit hash of the working tree (with '+dirty' for local edits), or 'unknown'"""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{revision}+dirty" if dirty else revision
+
+
+# ============ FIXTURE DATA ============
+def make_user(email='bench@example.com', password='bench-pass-123', **extra):
+    from users.models import User
+
+    user = User.objects.create_user(
+        username=email.split('@')[0],
+        email=email,
+        password=password,
+        is_email_verified=True,
+        **extra,
+    )
+    return user
+
+
+def make_package(**overrides):
+    from packages.models import Package
+
+    data = {
+        'name': 'Somnath Darshan',
+        'package_type': 'PILGRIMAGE',
+        'description': 'Benchmark package',
+        'scheduled_date': date.today() + timedelta(days=30),
+        'scheduled_time': dtime(6, 30),
+        'pickup_location': 'Ahmedabad',
+        'drop_location': 'Somnath',
+        'distance_km': 410,
+        'duration_days': 2,
+        'vehicle_type': 'ERTIGA',
+        'max_passengers': 6,
+        'base_price': 9000,
+        'advance_amount': 1000,
+        'inclusions': 'Fuel, Driver allowance, Toll',
+        'exclusions': 'Meals, Hotel',
+    }
+    data.update(overrides)
+    return Package.objects.create(**data)
+
+
+def make_package_booking(package, index=0, **overrides):
+    from packages.models import PackageBooking
+
+    data = {
+        'package': package,
+        'customer_name': f'Customer {index}',
+        'customer_phone': f'98{index:08d}'[:10],
+        'customer_email': f'customer{index}@example.com',
+        'passengers_count': 2,
+        'total_amount': package.base_price,
+        'advance_paid': package.advance_amount,
+    }
+    data.update(overrides)
+    return PackageBooking.objects.create(**data)
+
+
+def make_booking(index=0, **overrides):
+    from bookings.models import Booking
+
+    data = {
+        'name': f'Traveller {index}',
+        'phone': f'97{index:08d}'[:10],
+        'email': f'traveller{index}@example.com',
+        'pickup': 'Ahmedabad',
+        'drop': 'Vadodara',
+        'distance_km': 110,
+        'travel_date': date.today() + timedelta(days=7),
+        'travel_time': dtime(9, 0),
+        'total_price': 1540,
+    }
+    data.update(overrides)
+    return Booking.objects.create(**data)
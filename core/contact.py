@@ -0,0 +1,112 @@
+# core/contact.py
+"""
+Contact inbox: both contact forms (/contact/ and /book/contact/) store a
+ContactMessage row and return straight away; staff are emailed from a
+background job (core.tasks), so a slow or down mail server can't fail the
+form. A message whose email never went out keeps notified_at empty and
+is retried by `manage.py notify_contact_messages` (cron). The admin inbox
+is ContactMessageAdmin.
+
+    message, error = submit(request, source='site')
+
+Each client IP and each email address may send CONTACT_THROTTLE_COUNT
+messages per CONTACT_THROTTLE_SECONDS. With a shared cache (SHARED_CACHE)
+the counters live there; the default locmem cache is private to each
+worker process, so the limit then counts the window's stored messages
+instead (attempts that were turned away aren't counted).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .mail import send_email
+from .models import ContactMessage
+from .tasks import enqueue
+
+THROTTLE_PREFIX = 'contact:throttle:'
+
+
+def client_ip(request):
+    if settings.USE_X_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def _hit(key):
+    """Count one message against key; False once the window's limit is used up"""
+    key = THROTTLE_PREFIX + key
+    if cache.add(key, 1, settings.CONTACT_THROTTLE_SECONDS):
+        return True
+    try:
+        return cache.incr(key) <= settings.CONTACT_THROTTLE_COUNT
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, 1, settings.CONTACT_THROTTLE_SECONDS)
+        return True
+
+
+def _over_limit(ip, email):
+    """Without a shared cache: the window's ContactMessage rows, which every worker sees"""
+    since = timezone.now() - timedelta(seconds=settings.CONTACT_THROTTLE_SECONDS)
+    recent = ContactMessage.objects.filter(created_at__gte=since)
+    if ip and recent.filter(ip_address=ip).count() >= settings.CONTACT_THROTTLE_COUNT:
+        return True
+    return bool(email) and recent.filter(email__iexact=email).count() >= settings.CONTACT_THROTTLE_COUNT
+
+
+def throttled(ip, email):
+    if not settings.SHARED_CACHE:
+        return _over_limit(ip, email)
+    keys = [f"ip:{ip}"] if ip else []
+    if email:
+        keys.append(f"email:{email.lower()}")
+    # Count every key, so a blocked IP can't reset by switching address and vice versa
+    return not all([_hit(key) for key in keys])
+
+
+def submit(request, source='site'):
+    """(ContactMessage, None) or (None, error text for the user)"""
+    name = request.POST.get('name', '').strip()
+    email = request.POST.get('email', '').strip()
+    phone = request.POST.get('phone', '').strip()
+    text = request.POST.get('message', '').strip()
+
+    if not name or not text:
+        return None, 'Please enter your name and message.'
+    if not (email or phone):
+        return None, 'Please enter an email address or phone number.'
+
+    ip = client_ip(request)
+    if throttled(ip, email):
+        return None, 'Too many messages. Please call us or try again later.'
+
+    message = ContactMessage.objects.create(
+        name=name[:100], email=email[:254], phone=phone[:20], message=text,
+        source=source, ip_address=ip,
+    )
+    transaction.on_commit(lambda: enqueue(notify_staff, message.pk))
+    return message, None
+
+
+def notify_staff(message_id):
+    """Email CONTACT_EMAIL about a new message (background job); replies go to the sender"""
+    message = ContactMessage.objects.filter(pk=message_id, notified_at__isnull=True).first()
+    if message is None:
+        return False
+    body = (
+        f"Name: {message.name}\nEmail: {message.email}\nPhone: {message.phone}\n"
+        f"Received: {timezone.localtime(message.created_at):%d %b %Y %I:%M %p}\n\n"
+        f"Message:\n{message.message}\n\n"
+        f"Inbox: {settings.SITE_URL}/admin/core/contactmessage/{message.pk}/change/"
+    )
+    reply_to = [message.email] if message.email else None
+    if not send_email(f"Contact Form: {message.name}", body, [settings.CONTACT_EMAIL], reply_to=reply_to):
+        return False
+    ContactMessage.objects.filter(pk=message.pk).update(notified_at=timezone.now())
+    return True
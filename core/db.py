@@ -0,0 +1,15 @@
+# core/db.py
+"""Database connection tuning"""
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """connection_created handler: apply settings.SQLITE_PRAGMAS to new SQLite connections"""
+    if connection.vendor != 'sqlite':
+        return
+
+    cursor = connection.cursor()
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
@@ -0,0 +1,164 @@
+# core/fakes.py
+"""
+Local stand-ins for Razorpay, Twilio and an SMTP server.
+
+Used by the benchmarks so the booking funnel can be load tested without
+touching real providers. Each server runs in a daemon thread, answers just
+enough of the protocol for the SDKs we use, and can add a fixed delay to
+mimic provider latency.
+
+    with FakeProviders(latency=0.05) as fakes:
+        fakes.settings()  # -> dict for override_settings
+"""
+
+import itertools
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ids = itertools.count(1)
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    """Base handler: read the body, sleep, reply with JSON"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        body = self._read_body()
+        self.server.calls += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status, payload = self.respond(method, body)
+        self._reply(status, payload)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def respond(self, method, body):
+        return 404, {'error': 'not found'}
+
+
+class _RazorpayHandler(_JSONHandler):
+    def respond(self, method, body):
+        if method == 'POST' and self.path.rstrip('/').endswith('/orders'):
+            data = json.loads(body or b'{}')
+            return 200, {
+                'id': f"order_fake{next(_ids):010d}",
+                'entity': 'order',
+                'amount': data.get('amount', 0),
+                'currency': data.get('currency', 'INR'),
+                'status': 'created',
+                'notes': data.get('notes', {}),
+            }
+        return 404, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'not found'}}
+
+
+class _TwilioHandler(_JSONHandler):
+    def respond(self, method, body):
+        if method == 'POST' and self.path.endswith('/Messages.json'):
+            return 201, {'sid': f"SM{next(_ids):032d}", 'status': 'queued'}
+        return 404, {'code': 20404, 'message': 'not found'}
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts and discards every message"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 fake-smtp ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 fake-smtp')
+            elif command == 'DATA':
+                self.reply('354 end with <CRLF>.<CRLF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                self.server.calls += 1
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                self.reply('250 ok')
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _start(server_class, handler, latency):
+    server = server_class(('127.0.0.1', 0), handler)
+    server.latency = latency
+    server.calls = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+class FakeProviders:
+    """Start fake Razorpay, Twilio and SMTP servers for the duration of a block"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.servers = {}
+
+    def __enter__(self):
+        self.servers = {
+            'razorpay': _start(ThreadingHTTPServer, _RazorpayHandler, self.latency),
+            'twilio': _start(ThreadingHTTPServer, _TwilioHandler, self.latency),
+            'smtp': _start(_ThreadingSMTPServer, _SMTPHandler, self.latency),
+        }
+        return self
+
+    def __exit__(self, *exc_info):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def port(self, name):
+        return self.servers[name].server_address[1]
+
+    def calls(self):
+        return {name: server.calls for name, server in self.servers.items()}
+
+    def settings(self):
+        """Settings overrides that point the site at the fakes"""
+        return {
+            'RAZORPAY_BASE_URL': f"http://127.0.0.1:{self.port('razorpay')}",
+            'TWILIO_API_BASE_URL': f"http://127.0.0.1:{self.port('twilio')}",
+            'EMAIL_BACKEND': 'core.mail.PooledEmailBackend',
+            'EMAIL_HOST': '127.0.0.1',
+            'EMAIL_PORT': self.port('smtp'),
+            'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': 'bookings@example.com',
+            'EMAIL_HOST_PASSWORD': '',
+        }
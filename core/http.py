@@ -0,0 +1,112 @@
+# core/http.py
+"""
+Conditional GET and caching headers for public pages.
+
+    @conditional(lambda request: Package.objects.aggregate(Max('updated_at'), Count('id')))
+    def package_list(request): ...
+
+The version function runs one cheap query (a max timestamp, a count) and
+returns anything that changes when the page's data changes; None means
+"can't tell", the view runs as usual. The ETag hashes that version with
+the URL, the logged in user (the navbar shows their name), the visitor's
+CSRF cookie (a cached form must carry a token that still works) and the release
+(settings.RELEASE, or the newest template file), so a deploy that changes
+a template invalidates every ETag. A request whose If-None-Match (or
+If-Modified-Since, when the version function also returns a timestamp)
+still matches gets a 304 without rendering anything.
+
+Cache-Control:
+    anonymous visitors, shared=True   public, max-age=HTTP_CACHE_MAX_AGE, s-maxage=HTTP_CACHE_SHARED_MAX_AGE
+    logged in users, private pages    private, no-cache (always revalidate; 304 when unchanged)
+
+A response carrying flash messages is never cached or answered with a 304,
+so messages always show.
+"""
+
+import hashlib
+import os
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+_release = None
+
+
+def release():
+    """settings.RELEASE, or the modification time of the newest template"""
+    global _release
+    if _release is None:
+        _release = settings.RELEASE
+        if not _release:
+            newest = 0
+            directories = [str(d) for d in settings.TEMPLATES[0]['DIRS']] + [
+                os.path.join(app.path, 'templates') for app in apps.get_app_configs()
+                if app.path.startswith(str(settings.BASE_DIR))
+            ]
+            for directory in directories:
+                for root, _, files in os.walk(directory):
+                    for name in files:
+                        newest = max(newest, os.path.getmtime(os.path.join(root, name)))
+            _release = str(int(newest))
+    return _release
+
+
+def _has_messages(request):
+    # len() loads the stored messages without marking them used
+    return hasattr(request, '_messages') and len(get_messages(request)) > 0
+
+
+def _cache_headers(request, response, shared):
+    if shared and not request.user.is_authenticated:
+        patch_cache_control(
+            response, public=True,
+            max_age=settings.HTTP_CACHE_MAX_AGE, s_maxage=settings.HTTP_CACHE_SHARED_MAX_AGE,
+        )
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+
+
+def conditional(version_func, last_modified_func=None, shared=True):
+    """
+    ETag/Last-Modified/Cache-Control for a GET view.
+
+    version_func(request, *args, **kwargs) -> hashable version or None.
+    last_modified_func(version) -> aware datetime (only when every change
+    to the page also moves it) or None.
+    shared: anonymous responses may be stored by proxies and CDNs.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or _has_messages(request):
+                return view_func(request, *args, **kwargs)
+
+            version = version_func(request, *args, **kwargs)
+            if version is None:
+                return view_func(request, *args, **kwargs)
+
+            user = request.user.pk if request.user.is_authenticated else None
+            csrf = request.META.get('CSRF_COOKIE', '')
+            key = repr((release(), request.get_full_path(), user, csrf, version))
+            etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+            last_modified = last_modified_func(version) if last_modified_func else None
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or _has_messages(request):
+                    return response
+            if not response.has_header('ETag'):
+                response['ETag'] = etag
+            if timestamp and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(timestamp)
+            _cache_headers(request, response, shared)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,178 @@
+# core/images.py
+"""
+Uploaded images are processed on a background worker, not in the request.
+
+The request only stores the upload as it came: Django streams anything
+over FILE_UPLOAD_MAX_MEMORY_SIZE to a temp file in chunks, and the storage
+moves that file into MEDIA_ROOT. Once the save commits, a core.tasks job:
+
+    - turns the image upright (EXIF orientation) and drops its metadata
+      (EXIF, GPS, camera details); the ICC colour profile is kept
+    - caps the longest side at IMAGE_MAX_DIMENSION
+    - writes the result over the upload, under the same name, so URLs
+      already handed out (pages in proxy caches, API responses) keep working
+    - writes a thumbnail (longest side IMAGE_THUMBNAIL_SIZE) next to it:
+      packages/x.jpg -> packages/thumbs/x.jpg
+
+Until the thumbnail exists the admin shows a placeholder (preview()) and
+templates fall back to the original ({{ image|thumbnail }}).
+
+Every model with an ImageField is hooked up in CoreConfig.ready.
+`manage.py process_images` handles files uploaded before this existed.
+"""
+
+import io
+import os
+import tempfile
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.html import format_html
+from PIL import Image, ImageOps
+
+THUMBS_DIR = 'thumbs'
+
+
+def image_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, models.ImageField)]
+
+
+def image_models():
+    return [model for model in apps.get_models() if image_fields(model)]
+
+
+def thumbnail_name(name):
+    directory, filename = os.path.split(name)
+    return os.path.join(directory, THUMBS_DIR, filename)
+
+
+def is_processed(file):
+    return bool(file) and file.storage.exists(thumbnail_name(file.name))
+
+
+# ============ SIGNALS ============
+def upload_started(sender, instance, raw=False, **kwargs):
+    """pre_save: note which image fields hold a new, not yet stored upload"""
+    if raw:
+        return
+    instance._new_images = [
+        field.attname for field in image_fields(sender)
+        if getattr(instance, field.attname) and not getattr(instance, field.attname)._committed
+    ]
+
+
+def upload_saved(sender, instance, raw=False, **kwargs):
+    """post_save: process the stored uploads once the transaction commits"""
+    from core.tasks import enqueue
+
+    for attname in getattr(instance, '_new_images', ()):
+        name = getattr(instance, attname).name
+        transaction.on_commit(
+            lambda attname=attname, name=name: enqueue(process, sender._meta.label, instance.pk, attname, name)
+        )
+    instance._new_images = []
+
+
+# ============ PROCESSING ============
+def _encode(image, format):
+    """Bytes of `image` in `format` without its metadata"""
+    options = {}
+    icc_profile = image.info.get('icc_profile')
+    if icc_profile:
+        options['icc_profile'] = icc_profile
+    if format == 'JPEG':
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        options.update(quality=settings.IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    elif format == 'PNG':
+        options['optimize'] = True
+    elif format == 'WEBP':
+        options['quality'] = settings.IMAGE_JPEG_QUALITY
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+def _resized(image, size):
+    image = image.copy()
+    image.thumbnail((size, size), Image.LANCZOS)
+    return image
+
+
+def _overwrite(storage, name, data):
+    """Replace the file `name` with `data`, keeping its name"""
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: no local path to swap; save() would pick a new name while the old exists
+        storage.delete(name)
+        storage.save(name, ContentFile(data))
+        return
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write next to it, then rename over it: readers see the old file or the new one, never a gap
+    fd, temp = tempfile.mkstemp(dir=directory, prefix='.processing-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        os.chmod(temp, 0o644)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def process(label, pk, attname, name):
+    """Clean up one stored upload in place, if the row still points at it"""
+    model = apps.get_model(label)
+    storage = model._meta.get_field(attname).storage
+    current = model._base_manager.filter(pk=pk, **{attname: name})
+    if not current.exists():
+        # Replaced (or deleted) since the job was queued; a newer upload has its own job
+        return
+
+    with storage.open(name) as source:
+        image = Image.open(source)
+        # Phone "MPO" files are JPEGs with an extra preview frame
+        format = 'JPEG' if image.format == 'MPO' else image.format
+        animated = getattr(image, 'is_animated', False)
+        # Upright copy of the (first) frame, decoded while the file is open
+        image = ImageOps.exif_transpose(image)
+    thumb = _resized(image, settings.IMAGE_THUMBNAIL_SIZE)
+
+    # Re-encoding an animation would keep only the first frame: leave the file as it is
+    if not animated:
+        _overwrite(storage, name, _encode(_resized(image, settings.IMAGE_MAX_DIMENSION), format))
+    # Last: a thumbnail marks the image processed (is_processed)
+    _overwrite(storage, thumbnail_name(name), _encode(thumb, format))
+
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        # So cached pages (core.http) and incremental exports see the new file
+        current.update(updated_at=timezone.now())
+
+
+# ============ DISPLAY ============
+def thumbnail_url(file):
+    """URL of the thumbnail, or of the file itself while it's being processed"""
+    if not file:
+        return ''
+    return file.storage.url(thumbnail_name(file.name)) if is_processed(file) else file.url
+
+
+def preview(file, width=60, height=40):
+    """Admin preview: the thumbnail, or a placeholder until the worker has made it"""
+    if not file:
+        return "-"
+    if not is_processed(file):
+        return format_html(
+            '<span style="display:inline-block; width:{}px; height:{}px; line-height:{}px; background:#eee; '
+            'color:#666; font-size:11px; text-align:center;" title="Processing upload">⏳</span>',
+            width, height, height,
+        )
+    return format_html(
+        '<img src="{}" style="width: {}px; height: {}px; object-fit: cover;" />',
+        thumbnail_url(file), width, height,
+    )
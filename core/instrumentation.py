@@ -0,0 +1,294 @@
+# core/instrumentation.py
+"""
+Per-request performance metrics.
+
+PerformanceMiddleware records, for every request: view, status, total time,
+SQL query count/time (and the worst repeated query, the usual N+1 sign),
+template render time and outbound calls to Twilio, Razorpay and SMTP.
+Recent requests live in a ring buffer; per-view totals and the per-message
+mail delivery histogram (fed by core.mail) feed the Prometheus text page. Both are served by the staff-only views in core.views.
+"""
+
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OUTBOUND_HOSTS = {
+    'twilio.com': 'twilio',
+    'razorpay.com': 'razorpay',
+}
+
+_current = ContextVar('perf_metrics', default=None)
+_lock = threading.Lock()
+_installed = False
+
+recent = deque(maxlen=getattr(settings, 'PERF_BUFFER_SIZE', 500))
+totals = defaultdict(lambda: {
+    'requests': 0,
+    'seconds': 0.0,
+    'sql_queries': 0,
+    'sql_seconds': 0.0,
+    'template_seconds': 0.0,
+    'buckets': [0] * len(LATENCY_BUCKETS),
+})
+outbound_totals = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'errors': 0})
+mail_totals = {'messages': 0, 'seconds': 0.0, 'errors': 0, 'buckets': [0] * len(LATENCY_BUCKETS)}
+
+
+class RequestMetrics:
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.view = None
+        self.status = None
+        self.started = time.time()
+        self.seconds = 0.0
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.sql_repeats = Counter()
+        self.template_seconds = 0.0
+        self.outbound = defaultdict(lambda: {'calls': 0, 'seconds': 0.0})
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.sql_queries += 1
+            self.sql_repeats[sql] += 1
+
+    def as_dict(self):
+        worst_sql, worst_count = ('', 0)
+        if self.sql_repeats:
+            worst_sql, worst_count = self.sql_repeats.most_common(1)[0]
+        return {
+            'started': self.started,
+            'method': self.method,
+            'path': self.path,
+            'view': self.view,
+            'status': self.status,
+            'ms': round(self.seconds * 1000, 2),
+            'sql_queries': self.sql_queries,
+            'sql_ms': round(self.sql_seconds * 1000, 2),
+            'most_repeated_sql': worst_sql[:300],
+            'most_repeated_count': worst_count,
+            'template_ms': round(self.template_seconds * 1000, 2),
+            'outbound': {
+                name: {'calls': data['calls'], 'ms': round(data['seconds'] * 1000, 2)}
+                for name, data in self.outbound.items()
+            },
+        }
+
+
+def record_outbound(service, seconds, error=False):
+    """Add an outbound call to the current request and to the process totals"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.outbound[service]['calls'] += 1
+        metrics.outbound[service]['seconds'] += seconds
+    with _lock:
+        outbound_totals[service]['calls'] += 1
+        outbound_totals[service]['seconds'] += seconds
+        if error:
+            outbound_totals[service]['errors'] += 1
+
+
+def record_mail(seconds, error=False):
+    """Add one message's SMTP delivery time to the mail histogram"""
+    with _lock:
+        mail_totals['messages'] += 1
+        mail_totals['seconds'] += seconds
+        if error:
+            mail_totals['errors'] += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                mail_totals['buckets'][i] += 1
+
+
+def _service_for_url(url):
+    host = urlsplit(url).hostname or ''
+    for suffix, service in OUTBOUND_HOSTS.items():
+        if host == suffix or host.endswith('.' + suffix):
+            return service
+    return 'http'
+
+
+def install():
+    """Wrap template rendering, requests and SMTP sending once per process"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return original_render(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            metrics.template_seconds += time.perf_counter() - start
+
+    Template.render = render
+
+    try:
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        HTTPAdapter = None
+
+    if HTTPAdapter is not None:
+        original_send = HTTPAdapter.send
+
+        def send(self, request, *args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return original_send(self, request, *args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                record_outbound(_service_for_url(request.url), time.perf_counter() - start, error)
+
+        HTTPAdapter.send = send
+
+    from django.core.mail.backends.smtp import EmailBackend
+
+    original_send_messages = EmailBackend.send_messages
+
+    def send_messages(self, email_messages):
+        start = time.perf_counter()
+        error = False
+        try:
+            return original_send_messages(self, email_messages)
+        except Exception:
+            error = True
+            raise
+        finally:
+            record_outbound('smtp', time.perf_counter() - start, error)
+
+    EmailBackend.send_messages = send_messages
+
+
+def finish(metrics):
+    data = metrics.as_dict()
+    with _lock:
+        recent.append(data)
+        view_totals = totals[metrics.view or 'unresolved']
+        view_totals['requests'] += 1
+        view_totals['seconds'] += metrics.seconds
+        view_totals['sql_queries'] += metrics.sql_queries
+        view_totals['sql_seconds'] += metrics.sql_seconds
+        view_totals['template_seconds'] += metrics.template_seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if metrics.seconds <= bound:
+                view_totals['buckets'][i] += 1
+
+
+def snapshot():
+    """Most recent requests first"""
+    with _lock:
+        return list(reversed(recent))
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text():
+    """Render the process totals in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        view_items = [(view, dict(data, buckets=list(data['buckets']))) for view, data in totals.items()]
+        outbound_items = [(service, dict(data)) for service, data in outbound_totals.items()]
+        mail = dict(mail_totals, buckets=list(mail_totals['buckets']))
+
+    lines.append('# HELP pathan_request_seconds Request latency by view.')
+    lines.append('# TYPE pathan_request_seconds histogram')
+    for view, data in view_items:
+        # buckets are already cumulative: finish() counts a request in every bucket it fits
+        for bound, count in zip(LATENCY_BUCKETS, data['buckets']):
+            lines.append(f'pathan_request_seconds_bucket{{view="{_label(view)}",le="{bound}"}} {count}')
+        lines.append(f'pathan_request_seconds_bucket{{view="{_label(view)}",le="+Inf"}} {data["requests"]}')
+        lines.append(f'pathan_request_seconds_sum{{view="{_label(view)}"}} {data["seconds"]:.6f}')
+        lines.append(f'pathan_request_seconds_count{{view="{_label(view)}"}} {data["requests"]}')
+
+    for metric, key, help_text in (
+        ('pathan_sql_queries_total', 'sql_queries', 'SQL queries executed by view.'),
+        ('pathan_sql_seconds_total', 'sql_seconds', 'Time spent in SQL by view.'),
+        ('pathan_template_seconds_total', 'template_seconds', 'Template render time by view.'),
+    ):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for view, data in view_items:
+            lines.append(f'{metric}{{view="{_label(view)}"}} {data[key]}')
+
+    for metric, key, help_text in (
+        ('pathan_outbound_calls_total', 'calls', 'Outbound calls by provider.'),
+        ('pathan_outbound_seconds_total', 'seconds', 'Time spent waiting on providers.'),
+        ('pathan_outbound_errors_total', 'errors', 'Failed outbound calls by provider.'),
+    ):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for service, data in outbound_items:
+            lines.append(f'{metric}{{service="{_label(service)}"}} {data[key]}')
+
+    lines.append('# HELP pathan_mail_delivery_seconds SMTP delivery time per message.')
+    lines.append('# TYPE pathan_mail_delivery_seconds histogram')
+    for bound, count in zip(LATENCY_BUCKETS, mail['buckets']):
+        lines.append(f'pathan_mail_delivery_seconds_bucket{{le="{bound}"}} {count}')
+    lines.append(f'pathan_mail_delivery_seconds_bucket{{le="+Inf"}} {mail["messages"]}')
+    lines.append(f'pathan_mail_delivery_seconds_sum {mail["seconds"]:.6f}')
+    lines.append(f'pathan_mail_delivery_seconds_count {mail["messages"]}')
+    lines.append('# HELP pathan_mail_errors_total Messages the SMTP server did not accept.')
+    lines.append('# TYPE pathan_mail_errors_total counter')
+    lines.append(f'pathan_mail_errors_total {mail["errors"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class PerformanceMiddleware:
+    """Collect RequestMetrics for every request (settings.PERF_INSTRUMENTATION)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERF_INSTRUMENTATION', True)
+        if self.enabled:
+            install()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(request.method, request.path)
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        wrappers = [conn.execute_wrapper(metrics.sql_wrapper) for conn in connections.all()]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+            metrics.status = response.status_code
+            return response
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+            metrics.seconds = time.perf_counter() - start
+            match = getattr(request, 'resolver_match', None)
+            metrics.view = match.view_name if match else None
+            _current.reset(token)
+            finish(metrics)
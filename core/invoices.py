@@ -0,0 +1,251 @@
+# core/invoices.py
+"""
+Invoice rendering engine shared by bookings and packages.
+
+The static part of an invoice (title, labels, section headings, contact
+block) is laid out once per process and drawn once per document as a form
+XObject that every page reuses; only the booking's values are stamped on
+each page. A Unicode TTF font is registered once per process and used for
+values Helvetica cannot show, like the rupee sign or a route arrow
+(settings.INVOICE_FONT_PATH, else DejaVu Sans); when no such font is
+available amounts are printed with "Rs." instead.
+
+    render_invoice('booking', booking_invoice_data(booking), path)
+    render_invoices('package', [package_invoice_data(b) for b in bookings], path)
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+from reportlab.pdfgen import canvas
+
+DEFAULT_FONT_PATHS = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',
+    '/usr/local/share/fonts/DejaVuSans.ttf',
+    '/Library/Fonts/DejaVuSans.ttf',
+)
+RUPEE = '₹'
+
+CONTACT_LINES = (
+    "Pathan Tours & Travels",
+    "Phone: 9879230065, 9925993770",
+    "Email: pathanashif124@gmail.com",
+)
+
+BODY_FONT = 'Helvetica'
+HEADING_FONT = 'Helvetica-Bold'
+
+# Values printed with the currency symbol in front
+MONEY_FIELDS = {'total', 'advance', 'remaining'}
+
+LAYOUTS = {
+    'booking': {
+        'title': "PATHAN TRAVELS - INVOICE",
+        'sections': [
+            (None, [
+                ('Customer', 'customer'),
+                ('Phone', 'phone'),
+                ('Email', 'email'),
+                ('Pickup', 'pickup'),
+                ('Drop', 'drop'),
+                ('Distance', 'distance'),
+                ('Travel Date', 'travel_date'),
+                ('Travel Time', 'travel_time'),
+            ]),
+            ('Payment Summary', [
+                ('Total Fare', 'total'),
+                ('Advance Paid', 'advance'),
+                ('Remaining Amount', 'remaining'),
+            ]),
+        ],
+    },
+    'package': {
+        'title': "PATHAN TOURS - PACKAGE INVOICE",
+        'sections': [
+            (None, [
+                ('Customer', 'customer'),
+                ('Phone', 'phone'),
+                ('Email', 'email'),
+            ]),
+            ('Package Details', [
+                ('Package', 'package'),
+                ('Route', 'route'),
+                ('Distance', 'distance'),
+                ('Duration', 'duration'),
+                ('Vehicle', 'vehicle'),
+                ('Passengers', 'passengers'),
+                ('Scheduled Date', 'scheduled_date'),
+                ('Scheduled Time', 'scheduled_time'),
+            ]),
+            ('Payment Summary', [
+                ('Total Package Fare', 'total'),
+                ('Advance Paid', 'advance'),
+                ('Remaining Amount', 'remaining'),
+            ]),
+        ],
+    },
+}
+
+
+def _cache_subsets(face):
+    """
+    Reuse subset font programs across documents.
+
+    reportlab rebuilds the embedded subset for every PDF, which costs more
+    than the rest of a one-page invoice; invoices keep needing the same
+    handful of glyphs (rupee sign, digits, arrow), so the result is cached.
+    """
+    build = face.makeSubset
+    built = {}
+
+    def make_subset(subset):
+        key = tuple(subset)
+        if key not in built:
+            if len(built) >= 256:
+                built.clear()
+            built[key] = build(subset)
+        return built[key]
+
+    face.makeSubset = make_subset
+
+
+@lru_cache(maxsize=None)
+def unicode_font():
+    """(font name, currency symbol); registers the TTF font on first call"""
+    configured = getattr(settings, 'INVOICE_FONT_PATH', '')
+    for path in ([configured] if configured else DEFAULT_FONT_PATHS):
+        if not os.path.exists(path):
+            continue
+        try:
+            font = TTFont('InvoiceSans', path)
+        except TTFError as e:
+            print(f"Invoice font error: {e}")
+            continue
+        pdfmetrics.registerFont(font)
+        _cache_subsets(font.face)
+        currency = RUPEE if ord(RUPEE) in font.face.charToGlyph else 'Rs.'
+        return 'InvoiceSans', currency
+    return None, 'Rs.'
+
+
+def _font_for(text):
+    """
+    Helvetica when the text fits its encoding, else the Unicode font.
+
+    Helvetica is built into every PDF viewer, so it costs nothing per
+    document; a TTF has to be subset and embedded in each file, and the
+    fewer glyphs it carries the cheaper that is.
+    """
+    try:
+        text.encode('cp1252')
+        return BODY_FONT
+    except UnicodeEncodeError:
+        return unicode_font()[0] or BODY_FONT
+
+
+@lru_cache(maxsize=None)
+def _compiled(kind):
+    """
+    ([static text], [value slot]) for a layout, worked out once per process.
+
+    Static text is (font, size, x, y, text, centred); a value slot is
+    (x, y, key) where the booking's value goes, just after its label.
+    """
+    layout = LAYOUTS[kind]
+    width, height = A4
+    statics, slots = [], []
+
+    def field(x, y, label, key):
+        text = f"{label}:"
+        statics.append((BODY_FONT, 11, x, y, text, False))
+        slots.append((x + pdfmetrics.stringWidth(text + ' ', BODY_FONT, 11), y, key))
+
+    y = height - 50
+    statics.append((HEADING_FONT, 18, width / 2, y, layout['title'], True))
+    y -= 40
+    field(50, y, 'Invoice No', 'invoice_no')
+    field(350, y, 'Date', 'date')
+    y -= 25
+
+    for heading, fields in layout['sections']:
+        if heading:
+            y -= 10
+            statics.append((HEADING_FONT, 12, 50, y, heading, False))
+            y -= 25
+        for label, key in fields:
+            field(50, y, label, key)
+            y -= 20
+
+    y -= 10
+    statics.append((HEADING_FONT, 12, 50, y, "Contact Information", False))
+    y -= 20
+    for line in CONTACT_LINES:
+        statics.append((BODY_FONT, 10, 50, y, line, False))
+        y -= 15
+
+    return statics, slots
+
+
+def _draw_static(p, statics):
+    for font, size, x, y, text, centred in statics:
+        p.setFont(font, size)
+        if centred:
+            p.drawCentredString(x, y, text)
+        else:
+            p.drawString(x, y, text)
+
+
+def render_invoices(kind, rows, target):
+    """
+    Render one page per data dict into a single PDF.
+
+    `target` is a file path or a binary file object. Returns `target`.
+    """
+    _, currency = unicode_font()
+    statics, slots = _compiled(kind)
+
+    p = canvas.Canvas(target, pagesize=A4)
+    form_name = f"{kind}_invoice"
+    p.beginForm(form_name)
+    _draw_static(p, statics)
+    p.endForm()
+
+    for data in rows:
+        p.doForm(form_name)
+        for x, y, key in slots:
+            value = data.get(key)
+            if value is None or value == '':
+                value = '-'
+            elif key in MONEY_FIELDS:
+                value = f"{currency}{value}"
+            value = str(value)
+            p.setFont(_font_for(value), 11)
+            p.drawString(x, y, value)
+        p.showPage()
+
+    p.save()
+    return target
+
+
+def render_invoice(kind, data, target):
+    return render_invoices(kind, [data], target)
+
+
+def fingerprint(kind, data):
+    """
+    sha256 of everything that ends up on the page: the values, the layout,
+    the contact block and the currency symbol. Equal fingerprints mean an
+    identical invoice, so regeneration can skip it.
+    """
+    payload = json.dumps(
+        [kind, LAYOUTS[kind], CONTACT_LINES, unicode_font()[1], data],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
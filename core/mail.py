@@ -0,0 +1,178 @@
+# core/mail.py
+"""
+Pooled SMTP backend and helpers for sending site mail.
+
+Django's SMTP backend connects (TCP, STARTTLS, AUTH) for every send_mail()
+and quits right after, which costs several round trips to smtp.gmail.com
+per message. PooledEmailBackend keeps up to EMAIL_POOL_SIZE authenticated
+connections per server in a process-wide pool: open() borrows one (after a
+NOOP to make sure the server hasn't hung up), close() hands it back instead
+of quitting. Connections idle for more than EMAIL_POOL_IDLE_SECONDS are
+dropped, and a connection that failed mid-send is never pooled again.
+
+Every message's delivery time goes to core.instrumentation (the
+pathan_mail_delivery_seconds histogram on /perf/metrics/).
+
+    send_email(subject, body, [to], html_message=html)   # never raises, returns bool
+    send_bulk(messages)                                   # batches of EMAIL_BATCH_SIZE per connection
+
+Set EMAIL_BACKEND=console, file (EMAIL_FILE_PATH) or locmem to keep mail
+local in development and tests.
+"""
+
+import atexit
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends import smtp
+
+from . import instrumentation
+
+_pool = {}  # (host, port, user, tls, ssl) -> [(connection, returned at)]
+_pool_lock = threading.Lock()
+
+
+def _quit(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+
+def _alive(connection):
+    try:
+        return connection.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def close_pool():
+    """Quit every pooled connection (process exit, tests, settings changes)"""
+    with _pool_lock:
+        idle = [connection for connections in _pool.values() for connection, _ in connections]
+        _pool.clear()
+    for connection in idle:
+        _quit(connection)
+
+
+atexit.register(close_pool)
+
+
+class PooledEmailBackend(smtp.EmailBackend):
+    """smtp.EmailBackend that reuses warm, authenticated connections"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._broken = False
+
+    def _pool_key(self):
+        return (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+
+    def _borrow(self):
+        max_idle = settings.EMAIL_POOL_IDLE_SECONDS
+        while True:
+            with _pool_lock:
+                idle = _pool.get(self._pool_key())
+                if not idle:
+                    return None
+                connection, returned_at = idle.pop()
+            if time.monotonic() - returned_at <= max_idle and _alive(connection):
+                return connection
+            _quit(connection)
+
+    def open(self):
+        if self.connection:
+            return False
+        self._broken = False
+        connection = self._borrow()
+        if connection is not None:
+            self.connection = connection
+            return True
+        return super().open()
+
+    def close(self):
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        if not self._broken:
+            with _pool_lock:
+                idle = _pool.setdefault(self._pool_key(), [])
+                if len(idle) < settings.EMAIL_POOL_SIZE:
+                    idle.append((connection, time.monotonic()))
+                    return
+        _quit(connection)
+
+    def _send(self, email_message):
+        if not email_message.recipients():
+            return False
+        start = time.perf_counter()
+        sent = False
+        try:
+            sent = super()._send(email_message)
+            return sent
+        finally:
+            if not sent:
+                # The session may be half way through a transaction; don't reuse it
+                self._broken = True
+            instrumentation.record_mail(time.perf_counter() - start, error=not sent)
+
+
+# ============ HELPERS ============
+def build_email(subject, body, recipients, html_message=None, from_email=None, reply_to=None):
+    message = EmailMultiAlternatives(
+        subject, body, from_email or settings.EMAIL_HOST_USER, recipients, reply_to=reply_to,
+    )
+    if html_message:
+        message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def send_email(subject, body, recipients, html_message=None, from_email=None, reply_to=None):
+    """
+    send_mail() for views: a mail server problem is printed, not raised,
+    so it can't turn a booking or signup into an error page. Returns True
+    if the server accepted the message.
+    """
+    recipients = [address for address in recipients if address]
+    if not recipients:
+        return False
+    try:
+        return build_email(subject, body, recipients, html_message, from_email, reply_to).send() > 0
+    except Exception as e:
+        print(f"Email error ({subject}): {e}")
+        return False
+
+
+def send_bulk(messages, batch_size=None, fail_silently=True):
+    """
+    Send many EmailMessages, batch_size per connection, with up to
+    EMAIL_POOL_SIZE batches in flight. Returns how many were accepted.
+    """
+    messages = list(messages)
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    if not batches:
+        return 0
+
+    def send_batch(batch):
+        connection = get_connection(fail_silently=fail_silently)
+        try:
+            return connection.send_messages(batch) or 0
+        except Exception as e:
+            if not fail_silently:
+                raise
+            print(f"Email error (bulk batch of {len(batch)}): {e}")
+            return 0
+
+    workers = max(1, min(settings.EMAIL_POOL_SIZE, len(batches)))
+    if workers == 1:
+        return sum(send_batch(batch) for batch in batches)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(send_batch, batches))
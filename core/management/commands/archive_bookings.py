@@ -0,0 +1,57 @@
+# core/management/commands/archive_bookings.py
+"""
+Move old completed/cancelled bookings into the archive tables.
+
+Run from cron, e.g. nightly:
+    python manage.py archive_bookings
+    python manage.py archive_bookings --days 180 --dry-run
+
+Booking -> ArchivedBooking, PackageBooking -> ArchivedPackageBooking, for
+rows created more than BOOKING_ARCHIVE_AFTER_DAYS days ago. Archived
+bookings stay searchable in the admin; the hot tables only keep recent and
+still-open bookings.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+from django.utils import timezone
+
+from bookings.models import ArchivedBooking, Booking
+from core.archive import archive_rows
+from packages.models import ArchivedPackageBooking, PackageBooking
+
+ARCHIVE_STATUSES = ('COMPLETED', 'CANCELLED')
+
+
+class Command(BaseCommand):
+    help = "Archive completed/cancelled bookings older than BOOKING_ARCHIVE_AFTER_DAYS"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.BOOKING_ARCHIVE_AFTER_DAYS,
+                            help="Archive bookings created more than this many days ago")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be archived")
+
+    def handle(self, *args, **options):
+        # Invoice numbers restart daily from the newest hot row, so keep today's
+        if options['days'] < 1:
+            raise CommandError("--days must be at least 1")
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        jobs = [
+            ('booking', Booking.objects, ArchivedBooking, None),
+            ('package booking', PackageBooking.objects, ArchivedPackageBooking,
+             {'package_name': F('package__name')}),
+        ]
+        for label, manager, archive_model, snapshot in jobs:
+            queryset = manager.filter(status__in=ARCHIVE_STATUSES, created_at__lt=cutoff)
+            if options['dry_run']:
+                self.stdout.write(f"{queryset.count()} {label}(s) would be archived")
+                continue
+            moved = archive_rows(queryset, archive_model, options['batch_size'], snapshot)
+            self.stdout.write(f"{moved} {label}(s) archived")
+
+        self.stdout.write(self.style.SUCCESS(f"Done (cutoff {cutoff:%Y-%m-%d %H:%M})"))
@@ -0,0 +1,116 @@
+# core/management/commands/bench_checkout_contention.py
+"""
+Simulate simultaneous package checkouts and measure write contention.
+
+    python manage.py bench_checkout_contention --threads 8 --checkouts 50
+
+Each worker creates a PackageBooking (which also allocates an invoice number)
+and then confirms it, the same writes package_detail and
+package_payment_success make. On SQLite the run is repeated with Django's
+default journaling and with settings.SQLITE_PRAGMAS so the two can be compared.
+"""
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, IntegrityError, connection, connections
+from django.test import override_settings
+
+from core.benchmark import benchmark_database, make_package, results_dir, summarize, write_results
+
+BASELINE_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent checkout writes against the configured database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--checkouts', type=int, default=50, help="Checkouts per thread")
+        parser.add_argument('--output', help="Write JSON results to this path")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        profiles = {'configured': settings.SQLITE_PRAGMAS}
+        if connection.vendor == 'sqlite':
+            profiles = {'default-journal': BASELINE_PRAGMAS, 'tuned': settings.SQLITE_PRAGMAS}
+
+        results = {}
+        with benchmark_database(file_backed=True):
+            package = make_package()
+            for name, pragmas in profiles.items():
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    # Reconnect so the new pragmas take effect
+                    connection.close()
+                    results[name] = self.run_profile(package, options['threads'], options['checkouts'])
+
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<16} {stats.get('per_second', 0):>8} checkouts/s  "
+                f"p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms  "
+                f"locked {stats['locked']}  duplicate invoice {stats['integrity_errors']}"
+            )
+
+        output = options['output'] or f"{results_dir()}/checkout-contention-{int(time.time())}.json"
+        write_results(output, {
+            'vendor': connection.vendor,
+            'threads': options['threads'],
+            'checkouts_per_thread': options['checkouts'],
+            'results': results,
+        })
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def run_profile(self, package, threads, checkouts):
+        from packages.models import PackageBooking
+
+        timings = []
+        errors = {'locked': 0, 'integrity_errors': 0}
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads)
+
+        def worker(worker_id):
+            local_timings = []
+            local_errors = {'locked': 0, 'integrity_errors': 0}
+            start_gate.wait()
+            for i in range(checkouts):
+                t0 = time.perf_counter()
+                try:
+                    # Autocommit, like the views: no wrapping transaction
+                    booking = PackageBooking.objects.create(
+                        package=package,
+                        customer_name=f"Worker {worker_id}",
+                        customer_phone=f"9{worker_id:03d}{i:06d}"[:10],
+                        passengers_count=2,
+                        total_amount=package.final_price,
+                        advance_paid=package.advance_amount,
+                    )
+                    booking.status = 'CONFIRMED'
+                    booking.payment_status = 'ADVANCE_PAID'
+                    booking.save(update_fields=['status', 'payment_status', 'updated_at'])
+                    local_timings.append(time.perf_counter() - t0)
+                except IntegrityError:
+                    local_errors['integrity_errors'] += 1
+                except DatabaseError:
+                    local_errors['locked'] += 1
+            connections.close_all()
+            with lock:
+                timings.extend(local_timings)
+                for key, value in local_errors.items():
+                    errors[key] += value
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        stats = summarize(timings, elapsed)
+        stats.update(errors)
+        return stats
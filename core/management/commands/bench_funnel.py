@@ -0,0 +1,298 @@
+# core/management/commands/bench_funnel.py
+"""
+End-to-end load test of the booking funnel.
+
+    python manage.py bench_funnel --levels 1,2,4,8 --iterations 5
+    python manage.py bench_funnel --compare bench_results/funnel-abc1234-....json
+
+Each worker thread logs in and walks the whole funnel: package list, package
+booking, Razorpay checkout, payment success, invoice download, then the
+one-way book_trip flow. Razorpay, Twilio and SMTP are local fakes
+(core.fakes) with a configurable delay, and the data lives in a throwaway
+file-backed test database, so nothing real is touched.
+
+Per step and per concurrency level it reports p50/p95/p99 latency,
+throughput and failures. Results are written as JSON tagged with the git
+revision; --compare prints the p95 change against an earlier run.
+"""
+
+import hashlib
+import hmac
+import json
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import Resolver404, resolve, reverse
+
+from core.benchmark import (
+    benchmark_database, git_revision, make_package, make_user, results_dir, summarize,
+    write_results,
+)
+from core.fakes import FakeProviders
+from core.providers import razorpay_client
+
+STEPS = [
+    'package_list',
+    'package_detail',
+    'package_payment',
+    'package_payment_success',
+    'package_invoice',
+    'book_trip_form',
+    'book_trip',
+    'initiate_payment',
+    'payment_success',
+]
+
+
+def _signature(order_id, payment_id):
+    """What Razorpay checkout would post back for a successful payment"""
+    message = f"{order_id}|{payment_id}".encode()
+    return hmac.new(settings.RAZORPAY_KEY_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _redirects_to(response, url_name):
+    if response.status_code != 302:
+        return False
+    try:
+        return resolve(response.url).url_name == url_name
+    except Resolver404:
+        return False
+
+
+class StepFailed(Exception):
+    pass
+
+
+class Worker:
+    """One logged-in customer walking the funnel `iterations` times"""
+
+    def __init__(self, user, package, iterations):
+        self.client = Client()
+        self.client.force_login(user)
+        self.package = package
+        self.iterations = iterations
+        self.timings = defaultdict(list)
+        self.failures = defaultdict(int)
+        self.errors = []
+
+    def step(self, name, call, ok):
+        start = time.perf_counter()
+        try:
+            response = call()
+        except Exception as e:
+            self.failures[name] += 1
+            raise StepFailed(f"{name}: {type(e).__name__}: {e}")
+        self.timings[name].append(time.perf_counter() - start)
+        if not ok(response):
+            self.failures[name] += 1
+            raise StepFailed(f"{name}: HTTP {response.status_code} {response.get('Location', '')}")
+        return response
+
+    def run(self, barrier):
+        barrier.wait()
+        try:
+            for i in range(self.iterations):
+                try:
+                    self.package_funnel(i)
+                except StepFailed as e:
+                    self.errors.append(str(e))
+                try:
+                    self.trip_funnel(i)
+                except StepFailed as e:
+                    self.errors.append(str(e))
+        finally:
+            connection.close()
+
+    def package_funnel(self, i):
+        from packages.models import PackageBooking
+
+        client = self.client
+        self.step('package_list', lambda: client.get(reverse('package_list')),
+                  lambda r: r.status_code == 200)
+
+        response = self.step('package_detail', lambda: client.post(
+            reverse('package_detail', args=[self.package.id]),
+            {
+                'customer_name': 'Funnel Customer',
+                'customer_phone': '9876543210',
+                'customer_email': 'funnel@example.com',
+                'passengers_count': 2,
+            },
+        ), lambda r: _redirects_to(r, 'package_payment'))
+        booking_id = resolve(response.url).kwargs['booking_id']
+
+        self.step('package_payment', lambda: client.get(reverse('package_payment', args=[booking_id])),
+                  lambda r: r.status_code == 200)
+
+        order_id = PackageBooking.objects.values_list('razorpay_order_id', flat=True).get(id=booking_id)
+        payment_id = f"pay_fake{booking_id:010d}"
+        self.step('package_payment_success', lambda: client.post(reverse('package_payment_success'), {
+            'razorpay_order_id': order_id,
+            'razorpay_payment_id': payment_id,
+            'razorpay_signature': _signature(order_id, payment_id),
+        }), lambda r: _redirects_to(r, 'package_booking_confirmation'))
+
+        self.step('package_invoice', lambda: client.get(reverse('package_invoice', args=[booking_id])),
+                  lambda r: r.status_code == 200 and r['Content-Type'] == 'application/pdf')
+
+    def trip_funnel(self, i):
+        from bookings.models import Booking
+
+        client = self.client
+        self.step('book_trip_form', lambda: client.get(reverse('book_trip')),
+                  lambda r: r.status_code == 200)
+
+        response = self.step('book_trip', lambda: client.post(reverse('book_trip'), {
+            'name': 'Funnel Traveller',
+            'phone': '9876543210',
+            'email': 'traveller@example.com',
+            'pickup': 'Ahmedabad',
+            'drop': 'Vadodara',
+            'distance': 110,
+            'travel_date': (date.today() + timedelta(days=7)).isoformat(),
+            'travel_time': '09:00',
+        }), lambda r: _redirects_to(r, 'initiate_payment'))
+        booking_id = resolve(response.url).kwargs['booking_id']
+
+        self.step('initiate_payment', lambda: client.get(reverse('initiate_payment', args=[booking_id])),
+                  lambda r: r.status_code == 200)
+
+        order_id = Booking.objects.values_list('razorpay_order_id', flat=True).get(id=booking_id)
+        payment_id = f"pay_fake{booking_id:010d}"
+        self.step('payment_success', lambda: client.post(reverse('payment_success'), {
+            'razorpay_order_id': order_id,
+            'razorpay_payment_id': payment_id,
+            'razorpay_signature': _signature(order_id, payment_id),
+        }), lambda r: _redirects_to(r, 'booking_confirmation'))
+
+
+class Command(BaseCommand):
+    help = "Load test the booking funnel against fake Razorpay/Twilio/SMTP servers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--levels', default='1,2,4,8', help="Comma separated concurrency levels")
+        parser.add_argument('--iterations', type=int, default=5, help="Funnel runs per worker")
+        parser.add_argument('--latency', type=float, default=0.05,
+                            help="Seconds each fake provider call takes")
+        parser.add_argument('--output', help="Write JSON results to this path")
+        parser.add_argument('--compare', help="Earlier results JSON to compare p95 against")
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['levels'].split(',') if level.strip()]
+        except ValueError:
+            raise CommandError("--levels must be comma separated integers, e.g. 1,2,4,8")
+
+        import bookings.views as booking_views
+        import packages.views as package_views
+
+        saved_clients = (package_views.client, booking_views.client, booking_views.RAZORPAY_ENABLED)
+        results = {}
+        media_root = tempfile.mkdtemp(prefix='pathan_bench_media_')
+
+        with benchmark_database(file_backed=True), FakeProviders(options['latency']) as fakes, \
+                override_settings(MEDIA_ROOT=media_root, **fakes.settings()):
+            package_views.client = razorpay_client()
+            booking_views.configure_razorpay()
+            if not booking_views.RAZORPAY_ENABLED:
+                raise CommandError("Razorpay client could not reach the fake server")
+            try:
+                package = make_package(max_passengers=50)
+                for level in levels:
+                    results[level] = self.run_level(level, package, options['iterations'])
+                    self.report(level, results[level])
+                provider_calls = fakes.calls()
+            finally:
+                package_views.client, booking_views.client, booking_views.RAZORPAY_ENABLED = saved_clients
+
+        revision = git_revision()
+        output = options['output'] or f"{results_dir()}/funnel-{revision}-{int(time.time())}.json"
+        write_results(output, {
+            'revision': revision,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'provider_latency': options['latency'],
+            'provider_calls': provider_calls,
+            'levels': results,
+        })
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def run_level(self, level, package, iterations):
+        workers = [
+            Worker(make_user(email=f"funnel{level}x{n}@example.com"), package, iterations)
+            for n in range(level)
+        ]
+        barrier = threading.Barrier(level + 1)
+        threads = [threading.Thread(target=worker.run, args=(barrier,)) for worker in workers]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        steps = {}
+        for name in STEPS:
+            timings = [t for worker in workers for t in worker.timings[name]]
+            # This step's calls per second of the level's wall time, all workers together
+            steps[name] = summarize(timings, elapsed)
+            steps[name]['failures'] = sum(worker.failures[name] for worker in workers)
+        errors = [e for worker in workers for e in worker.errors]
+        return {
+            'workers': level,
+            'seconds': round(elapsed, 3),
+            'funnels_per_second': round(level * iterations / elapsed, 2),
+            'steps': steps,
+            'errors': errors[:20],
+        }
+
+    def report(self, level, result):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{level} worker(s): {result['seconds']}s, {result['funnels_per_second']} funnels/s"
+        ))
+        for name, stats in result['steps'].items():
+            line = (
+                f"  {name:<24} {stats.get('per_second', 0):>7} /s  p50 {stats['p50_ms']:>8} ms  "
+                f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms"
+            )
+            if stats['failures']:
+                line += f"  {stats['failures']} failed"
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+        for error in result['errors'][:5]:
+            self.stdout.write(self.style.NOTICE(f"    {error}"))
+
+    def compare(self, path, results):
+        try:
+            with open(path) as f:
+                earlier = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"p95 vs {earlier.get('revision', path)}"))
+        for level, result in results.items():
+            before = earlier.get('levels', {}).get(str(level))
+            if not before:
+                continue
+            for name, stats in result['steps'].items():
+                old = before['steps'].get(name, {}).get('p95_ms')
+                if not old:
+                    continue
+                change = (stats['p95_ms'] - old) / old * 100
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+                self.stdout.write(style(
+                    f"  {level:>3} x {name:<24} {old:>8} -> {stats['p95_ms']:>8} ms ({change:+.1f}%)"
+                ))
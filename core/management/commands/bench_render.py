@@ -0,0 +1,248 @@
+# core/management/commands/bench_render.py
+"""
+Microbenchmarks for invoice/report PDFs, notification message builders and
+the compiled notification templates (snapshot once, render each channel).
+
+    python manage.py bench_render
+    python manage.py bench_render --rows 10,1000 --bench invoice
+    python manage.py bench_render --baseline bench_results/render-abc1234-....json
+
+Every benchmark runs at each --rows size: invoices and messages are built
+that many times (render_invoices_batch puts them all in one PDF), the
+bookings report gets that many rows. Bookings are unsaved model instances,
+so no database is needed, and PDFs are written to a temporary MEDIA_ROOT.
+
+For each case the mean/stdev/min time and the peak traced memory are
+printed and saved as JSON. With --baseline the run fails (non-zero exit)
+when a case is slower or uses more memory than the baseline by more than
+--threshold, which makes it usable as a pre-deploy check.
+"""
+
+import io
+import json
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from core.benchmark import git_revision, measure, results_dir, write_results
+
+
+def _package():
+    from packages.models import Package
+    from packages.pricing import PricingCalendar
+
+    package = Package(
+        id=1,
+        name='Somnath Dwarka Darshan',
+        package_type='PILGRIMAGE',
+        description='Benchmark package',
+        scheduled_date=date.today() + timedelta(days=30),
+        scheduled_time=dtime(6, 30),
+        pickup_location='Ahmedabad',
+        drop_location='Somnath',
+        distance_km=410,
+        duration_days=2,
+        vehicle_type='ERTIGA',
+        max_passengers=6,
+        base_price=9000,
+        advance_amount=1000,
+        inclusions='Fuel, Driver allowance, Toll, Parking',
+        exclusions='Meals, Hotel',
+        important_notes='Carry a valid photo ID.',
+    )
+    package.refresh_computed_fields(PricingCalendar([]))  # no rules, no database
+    return package
+
+
+def package_bookings(rows):
+    from packages.models import PackageBooking
+
+    package = _package()
+    created = timezone.make_aware(datetime(2025, 1, 1, 10, 0))
+    statuses = ['PENDING', 'CONFIRMED', 'COMPLETED', 'CANCELLED']
+    return [
+        PackageBooking(
+            id=i,
+            package=package,
+            customer_name=f'Customer {i}',
+            customer_phone=f'98{i:08d}'[:10],
+            customer_email=f'customer{i}@example.com',
+            passengers_count=2,
+            total_amount=9000,
+            advance_paid=1000,
+            status=statuses[i % len(statuses)],
+            invoice_no=f'PTP-20250101-{i:04d}',
+            created_at=created,
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def bookings(rows):
+    from bookings.models import Booking
+
+    created = timezone.make_aware(datetime(2025, 1, 1, 10, 0))
+    return [
+        Booking(
+            id=i,
+            name=f'Traveller {i}',
+            phone=f'97{i:08d}'[:10],
+            email=f'traveller{i}@example.com',
+            pickup='Ahmedabad',
+            drop='Vadodara',
+            distance_km=110,
+            travel_date=date.today() + timedelta(days=7),
+            travel_time=dtime(9, 0),
+            total_price=1540,
+            advance_paid=1000,
+            invoice_no=f'PT-202501-{i:04d}',
+            created_at=created,
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def _each(func, items):
+    def run():
+        for item in items:
+            func(item)
+    return run
+
+
+def _render_channels(name, snapshots, language):
+    """Every confirmation channel for each booking, from prebuilt snapshots"""
+    from core.notifications import get_template
+
+    templates = [get_template(name, channel, language) for channel in ('whatsapp', 'share', 'email')]
+
+    def run():
+        for data in snapshots:
+            for template in templates:
+                if template.channel == 'email':
+                    template.render_email(data)
+                else:
+                    template.render(data)
+    return run
+
+
+def build_cases(rows):
+    """{name: zero-argument callable} for one data size"""
+    from bookings.utils import (
+        booking_confirmation_email, booking_share_message, booking_whatsapp_message,
+        create_invoice_pdf,
+    )
+    from core.invoices import render_invoices
+    from packages.utils import (
+        create_package_invoice_pdf, generate_package_bookings_pdf, package_confirmation_email,
+        package_invoice_data, package_share_message, package_whatsapp_message,
+    )
+
+    from bookings.notifications import snapshot as trip_snapshot
+    from packages.notifications import snapshot as package_snapshot
+
+    trips = bookings(rows)
+    packages = package_bookings(rows)
+    trip_snapshots = [trip_snapshot(b) for b in trips]
+    package_snapshots = [package_snapshot(b) for b in packages]
+    return {
+        'create_invoice_pdf': _each(create_invoice_pdf, trips),
+        'create_package_invoice_pdf': _each(create_package_invoice_pdf, packages),
+        'render_invoices_batch': lambda: render_invoices(
+            'package', [package_invoice_data(b) for b in packages], io.BytesIO(),
+        ),
+        'generate_package_bookings_pdf': lambda: generate_package_bookings_pdf(packages),
+        'booking_whatsapp_message': _each(booking_whatsapp_message, trips),
+        'booking_share_message': _each(booking_share_message, trips),
+        'booking_confirmation_email': _each(booking_confirmation_email, trips),
+        'package_whatsapp_message': _each(package_whatsapp_message, packages),
+        'package_share_message': _each(package_share_message, packages),
+        'package_confirmation_email': _each(package_confirmation_email, packages),
+        # Snapshot once, then render every channel (core.notifications)
+        'booking_snapshot': _each(trip_snapshot, trips),
+        'package_snapshot': _each(package_snapshot, packages),
+        'booking_notifications_en': _render_channels('booking_confirmation', trip_snapshots, 'en'),
+        'package_notifications_en': _render_channels('package_confirmation', package_snapshots, 'en'),
+        'package_notifications_gu': _render_channels('package_confirmation', package_snapshots, 'gu'),
+    }
+
+
+class Command(BaseCommand):
+    help = "Time and memory microbenchmarks for PDF rendering and message builders"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='10,1000,10000', help="Comma separated data sizes")
+        parser.add_argument('--bench', action='append', help="Only run cases whose name contains this")
+        parser.add_argument('--loops', type=int, default=5, help="Timed runs per case (at most)")
+        parser.add_argument('--warmup', type=int, default=1, help="Discarded runs per case")
+        parser.add_argument('--budget', type=float, default=10.0,
+                            help="Seconds of timed runs per case; large cases get fewer loops")
+        parser.add_argument('--baseline', help="Earlier results JSON to check for regressions")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Allowed slowdown / memory growth vs the baseline (0.25 = 25%%)")
+        parser.add_argument('--output', help="Write JSON results to this path")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['rows'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError("--rows must be comma separated integers, e.g. 10,1000")
+
+        results = {}
+        media_root = tempfile.mkdtemp(prefix='pathan_bench_media_')
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                for rows in sizes:
+                    for name, func in build_cases(rows).items():
+                        if options['bench'] and not any(b in name for b in options['bench']):
+                            continue
+                        key = f"{name}[{rows}]"
+                        results[key] = measure(
+                            func, loops=options['loops'], warmup=options['warmup'], budget=options['budget'],
+                        )
+                        self.report(key, results[key])
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        revision = git_revision()
+        output = options['output'] or f"{results_dir()}/render-{revision}-{int(time.time())}.json"
+        write_results(output, {'revision': revision, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                               'results': results})
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+        if options['baseline']:
+            self.check_baseline(options['baseline'], results, options['threshold'])
+
+    def report(self, key, stats):
+        self.stdout.write(
+            f"{key:<44} {stats['mean_ms']:>10} ms +- {stats['stdev_ms']:<8} "
+            f"min {stats['min_ms']:>10} ms  peak {stats['peak_kib']:>9} KiB  ({stats['loops']} loops)"
+        )
+
+    def check_baseline(self, path, results, threshold):
+        try:
+            with open(path) as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Cannot read baseline {path}: {e}")
+
+        regressions = []
+        for key, stats in results.items():
+            before = baseline.get(key)
+            if not before:
+                continue
+            # min is the least noisy estimate of the true cost
+            for metric in ('min_ms', 'peak_kib'):
+                if before[metric] and stats[metric] > before[metric] * (1 + threshold):
+                    change = (stats[metric] - before[metric]) / before[metric] * 100
+                    regressions.append(f"{key} {metric}: {before[metric]} -> {stats[metric]} (+{change:.0f}%)")
+
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+            raise CommandError(f"{len(regressions)} regression(s) over {threshold:.0%} vs {path}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions over {threshold:.0%} vs {path}"))
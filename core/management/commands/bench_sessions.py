@@ -0,0 +1,79 @@
+# core/management/commands/bench_sessions.py
+"""
+Compare logged-in page throughput across session engines.
+
+    python manage.py bench_sessions --requests 200
+
+Runs against a throwaway test database, so it is safe on a dev box.
+"""
+
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import (
+    benchmark_database, make_package, make_user, results_dir, summarize, write_results,
+)
+
+ENGINES = [
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'django.contrib.sessions.backends.cache',
+    'core.sessions',
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark logged-in page throughput for each session engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help="Requests per page per engine")
+        parser.add_argument('--engine', action='append', help="Only benchmark this engine (repeatable)")
+        parser.add_argument('--output', help="Write JSON results to this path")
+
+    def handle(self, *args, **options):
+        engines = options['engine'] or ENGINES
+        n = options['requests']
+        results = {}
+
+        with benchmark_database():
+            user = make_user()
+            package = make_package()
+            pages = {
+                'package_detail': reverse('package_detail', args=[package.id]),
+                'my_bookings': reverse('my_bookings'),
+                'profile': reverse('profile'),
+            }
+
+            for engine in engines:
+                caches['default'].clear()
+                with override_settings(SESSION_ENGINE=engine):
+                    client = Client()
+                    client.force_login(user)
+                    results[engine] = {}
+                    for name, url in pages.items():
+                        timings = []
+                        started = time.perf_counter()
+                        for _ in range(n):
+                            t0 = time.perf_counter()
+                            response = client.get(url)
+                            timings.append(time.perf_counter() - t0)
+                            if response.status_code != 200:
+                                self.stderr.write(f"{engine} {name}: HTTP {response.status_code}")
+                                break
+                        results[engine][name] = summarize(timings, time.perf_counter() - started)
+
+        for engine, pages_result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(engine))
+            for name, stats in pages_result.items():
+                self.stdout.write(
+                    f"  {name:<16} {stats.get('per_second', 0):>8} req/s  "
+                    f"p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms"
+                )
+
+        output = options['output'] or f"{results_dir()}/sessions-{int(time.time())}.json"
+        write_results(output, {'requests': n, 'results': results})
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
@@ -0,0 +1,133 @@
+# core/management/commands/check_query_counts.py
+"""
+N+1 query check for admin changelists and public pages.
+
+    python manage.py check_query_counts
+
+Every page is rendered twice on a throwaway test database: once with a small
+data set and again after more rows are added. A page passes when its query
+count does not grow with the number of rows. For pages that fail, each query
+that grew is printed with the code or template line that ran it. Exits
+non-zero on failure so it can gate CI. The test suite runs it too
+(core.tests.QueryCountTests), with --current-database since the test
+runner has already set up a database.
+"""
+
+from contextlib import nullcontext
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import NoReverseMatch, reverse
+
+from core.benchmark import (
+    benchmark_database, make_booking, make_package, make_package_booking, make_user,
+)
+from core.querycount import QueryRecorder, growth
+
+
+class Command(BaseCommand):
+    help = "Fail when admin changelists or public pages run more queries as rows grow"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--small', type=int, default=3, help="Rows per model in the first pass")
+        parser.add_argument('--large', type=int, default=15, help="Rows per model in the second pass")
+        parser.add_argument('--page', action='append', help="Only check pages whose name contains this")
+        parser.add_argument('--current-database', action='store_true',
+                            help="Use the database already connected (a test run's) instead of a throwaway one")
+
+    def handle(self, *args, **options):
+        with nullcontext() if options['current_database'] else benchmark_database():
+            self.staff = make_user(
+                email='staff@example.com', is_staff=True, is_superuser=True, phone='9000000000',
+            )
+            self.customer = make_user(email='customer0@example.com', phone='9800000000')
+            self.seeded = 0
+
+            self.seed(options['small'])
+            pages = self.pages(options['page'])
+            small = {name: self.record(client, url) for name, (client, url) in pages.items()}
+
+            self.seed(options['large'])
+            pages = self.pages(options['page'])
+            large = {name: self.record(client, url) for name, (client, url) in pages.items()}
+
+        failures = 0
+        for name in pages:
+            before, after = small.get(name), large.get(name)
+            if isinstance(before, str) or isinstance(after, str):
+                self.stdout.write(self.style.WARNING(f"SKIP {name}: {before if isinstance(before, str) else after}"))
+                continue
+            if after.count <= before.count:
+                self.stdout.write(self.style.SUCCESS(f"ok   {name}: {before.count} -> {after.count} queries"))
+                continue
+
+            failures += 1
+            self.stdout.write(self.style.ERROR(f"FAIL {name}: {before.count} -> {after.count} queries"))
+            for sql, was, now, call_site in growth(before, after):
+                self.stdout.write(f"  {was} -> {now} x {sql[:160]}")
+                self.stdout.write(self.style.NOTICE(''.join('    ' + line for line in call_site.splitlines(True))))
+
+        if failures:
+            raise CommandError(f"{failures} page(s) run more queries as rows grow")
+
+    def seed(self, rows):
+        """Add `rows` more users, packages, bookings and gallery items"""
+        from gallery.models import GalleryCategory, GalleryImage, GalleryVideo
+        from users.models import UserProfile
+
+        for _ in range(rows):
+            n = self.seeded
+            UserProfile.objects.create(user=make_user(email=f"seed{n}@example.com"), city="Ahmedabad")
+            package = make_package(name=f"Package {n}")
+            make_package_booking(package, index=n, customer_email=self.customer.email)
+            make_booking(index=n, email=self.customer.email)
+            category = GalleryCategory.objects.create(name=f"Category {n}")
+            GalleryImage.objects.create(title=f"Image {n}", image=f"gallery/{n}.jpg", category=category)
+            GalleryVideo.objects.create(title=f"Video {n}", youtube_url=f"https://youtu.be/{n}")
+            self.seeded += 1
+
+    def pages(self, only=None):
+        from packages.models import Package
+
+        staff = Client()
+        staff.force_login(self.staff)
+        customer = Client()
+        customer.force_login(self.customer)
+        anonymous = Client()
+
+        pages = {}
+        for model in admin.site._registry:
+            opts = model._meta
+            try:
+                url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            except NoReverseMatch:
+                continue
+            pages[f'admin {opts.app_label}.{opts.model_name}'] = (staff, url)
+
+        first_package = Package.objects.order_by('id').first()
+        pages.update({
+            'home': (anonymous, reverse('home')),
+            'package_list': (anonymous, reverse('package_list')),
+            'package_detail': (customer, reverse('package_detail', args=[first_package.id])),
+            'gallery': (anonymous, reverse('gallery')),
+            'gallery_images': (anonymous, reverse('gallery_images')),
+            'gallery_videos': (anonymous, reverse('gallery_videos')),
+            'my_bookings': (customer, reverse('my_bookings')),
+            'profile': (customer, reverse('profile')),
+            'admin_package_report': (staff, reverse('admin_package_report')),
+        })
+
+        if only:
+            pages = {name: page for name, page in pages.items() if any(o in name for o in only)}
+        return pages
+
+    def record(self, client, url):
+        try:
+            with QueryRecorder() as recorder:
+                response = client.get(url)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+        return recorder
@@ -0,0 +1,34 @@
+# core/management/commands/cleanup_sessions.py
+"""
+Delete expired sessions in batches.
+
+Run from cron, e.g. every hour:
+    python manage.py cleanup_sessions
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions from the configured session engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        store = engine.SessionStore
+
+        try:
+            deleted = store.clear_expired(batch_size=options['batch_size'])
+        except TypeError:
+            # Django's own engines don't take a batch size
+            deleted = store.clear_expired()
+
+        if deleted is None:
+            self.stdout.write(self.style.SUCCESS("Expired sessions cleared."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired session(s)."))
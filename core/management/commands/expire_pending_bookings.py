@@ -0,0 +1,42 @@
+# core/management/commands/expire_pending_bookings.py
+"""
+Cancel abandoned bookings that never got paid.
+
+Run from cron, e.g. every hour:
+    python manage.py expire_pending_bookings
+    python manage.py expire_pending_bookings --hours 24 --dry-run
+
+A booking still PENDING with no payment PENDING_BOOKING_TTL_HOURS after it
+was created is marked CANCELLED; archive_bookings later moves it out of
+the hot table with the other finished bookings.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bookings.models import Booking
+from packages.models import PackageBooking
+
+
+class Command(BaseCommand):
+    help = "Cancel PENDING unpaid bookings older than PENDING_BOOKING_TTL_HOURS"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.PENDING_BOOKING_TTL_HOURS)
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be expired")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+
+        for label, model in (('booking', Booking), ('package booking', PackageBooking)):
+            abandoned = model.objects.filter(status='PENDING', payment_status='PENDING', created_at__lt=cutoff)
+            if options['dry_run']:
+                self.stdout.write(f"{abandoned.count()} {label}(s) would be expired")
+                continue
+            expired = abandoned.update(status='CANCELLED', updated_at=timezone.now())
+            self.stdout.write(f"{expired} abandoned {label}(s) cancelled")
+
+        self.stdout.write(self.style.SUCCESS(f"Done (cutoff {cutoff:%Y-%m-%d %H:%M})"))
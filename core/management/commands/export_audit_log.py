@@ -0,0 +1,61 @@
+# core/management/commands/export_audit_log.py
+"""
+Export audit log entries (core.audit) as CSV, e.g. for a compliance request.
+
+    python manage.py export_audit_log --since 2026-01-01 --until 2026-04-01 -o q1_audit.csv
+    python manage.py export_audit_log --model bookings.booking --actor admin
+
+Rows are streamed oldest first, so large ranges don't have to fit in memory.
+"""
+
+import sys
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.audit import export_csv
+from core.models import AuditLog
+
+
+def _day(value, end=False):
+    day = parse_date(value or '')
+    if day is None:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+    return timezone.make_aware(datetime.combine(day, time.max if end else time.min))
+
+
+class Command(BaseCommand):
+    help = "Export audit log entries to CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="First day to include (YYYY-MM-DD)")
+        parser.add_argument('--until', help="Last day to include (YYYY-MM-DD)")
+        parser.add_argument('--model', help="app_label.model_name, e.g. bookings.booking")
+        parser.add_argument('--actor', help="Username of the staff member")
+        parser.add_argument('-o', '--output', help="CSV file to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        entries = AuditLog.objects.all()
+        if options['since']:
+            entries = entries.filter(created_at__gte=_day(options['since']))
+        if options['until']:
+            entries = entries.filter(created_at__lte=_day(options['until'], end=True))
+        if options['model']:
+            entries = entries.filter(model=options['model'].lower())
+        if options['actor']:
+            entries = entries.filter(actor_name=options['actor'])
+
+        out = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        try:
+            lines = -1  # header
+            for line in export_csv(entries):
+                out.write(line)
+                lines += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Exported {lines} entries to {options['output']}"))
@@ -0,0 +1,97 @@
+# core/management/commands/import_contact_files.py
+"""
+Import the old one-file-per-message contact form submissions
+(MEDIA_ROOT/contacts/contact_<timestamp>.txt) into the ContactMessage inbox.
+
+    python manage.py import_contact_files --dry-run
+    python manage.py import_contact_files --delete
+
+Files already imported (by file name) are skipped, so the command can be
+re-run safely. Imported messages keep the file's timestamp, get source
+'import' and status READ, and don't email staff again.
+"""
+
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ContactMessage
+
+FILENAME_TIMESTAMP = re.compile(r'contact_(\d+)')
+HEADER = re.compile(r'^(Name|Email|Phone):[ \t]?(.*)$')
+
+
+def parse_contact_file(text):
+    """{'name', 'email', 'phone', 'message'} from 'Name: ...\\nEmail: ...\\nPhone: ...\\n\\nMessage:\\n...'"""
+    fields = {'name': '', 'email': '', 'phone': ''}
+    head, _, message = text.partition('\nMessage:\n')
+    for line in head.splitlines():
+        match = HEADER.match(line.strip())
+        if match:
+            value = match.group(2).strip()
+            fields[match.group(1).lower()] = '' if value == 'None' else value
+    fields['message'] = message.strip() if message else head.strip()
+    return fields
+
+
+def file_timestamp(path):
+    match = FILENAME_TIMESTAMP.match(os.path.basename(path))
+    seconds = int(match.group(1)) if match else os.path.getmtime(path)
+    return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+
+
+class Command(BaseCommand):
+    help = "Import MEDIA_ROOT/contacts/*.txt contact messages into the admin inbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=os.path.join(settings.MEDIA_ROOT, 'contacts'),
+                            help="Directory holding the contact_*.txt files")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be imported")
+        parser.add_argument('--delete', action='store_true', help="Delete each file once it is imported")
+
+    def handle(self, *args, **options):
+        directory = options['path']
+        if not os.path.isdir(directory):
+            raise CommandError(f"{directory} is not a directory")
+
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.txt'))
+        done = set(
+            ContactMessage.objects.filter(imported_from__in=names).values_list('imported_from', flat=True)
+        )
+
+        rows = []
+        for name in names:
+            if name in done:
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, encoding='utf-8', errors='replace') as f:
+                    fields = parse_contact_file(f.read())
+            except OSError as e:
+                self.stderr.write(f"Skipping {name}: {e}")
+                continue
+            if not fields['message']:
+                self.stderr.write(f"Skipping {name}: no message")
+                continue
+            created_at = file_timestamp(path)
+            rows.append(ContactMessage(
+                name=fields['name'][:100] or 'Unknown', email=fields['email'][:254],
+                phone=fields['phone'][:20], message=fields['message'], source='import',
+                status='READ', imported_from=name, created_at=created_at, notified_at=created_at,
+            ))
+
+        if options['dry_run']:
+            self.stdout.write(f"Would import {len(rows)} of {len(names)} file(s) ({len(done)} already imported)")
+            return
+
+        ContactMessage.objects.bulk_create(rows, batch_size=500)
+        if options['delete']:
+            for name in done | {row.imported_from for row in rows}:
+                os.remove(os.path.join(directory, name))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(rows)} message(s), skipped {len(done)} already imported"
+        ))
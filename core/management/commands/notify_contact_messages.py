@@ -0,0 +1,50 @@
+# core/management/commands/notify_contact_messages.py
+"""
+Email staff about contact messages whose notification never went out:
+the mail server was down when the background job ran, or the process
+exited before its worker got to it.
+
+Run from cron, e.g. every 15 minutes:
+    python manage.py notify_contact_messages
+    python manage.py notify_contact_messages --dry-run
+
+Messages younger than --min-age minutes are left to their own job, and
+spam is skipped. Messages are sent one after another in this process, not
+on the task workers; the run stops at the first failure (the mail server
+is probably still down) and the next run picks up the rest.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.contact import notify_staff
+from core.models import ContactMessage
+
+
+class Command(BaseCommand):
+    help = "Retry staff emails for contact messages that were never notified"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=5, help="Skip messages younger than this (minutes)")
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be sent")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['min_age'])
+        pending = (
+            ContactMessage.objects.filter(notified_at__isnull=True, created_at__lt=cutoff)
+            .exclude(status='SPAM')
+            .order_by('created_at')
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{pending.count()} message(s) would be notified")
+            return
+
+        sent = 0
+        for message_id in pending.values_list('pk', flat=True):
+            if not notify_staff(message_id):
+                self.stderr.write(f"Could not notify message {message_id}; stopping, the next run retries")
+                break
+            sent += 1
+        self.stdout.write(self.style.SUCCESS(f"{sent} message(s) notified"))
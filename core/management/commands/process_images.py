@@ -0,0 +1,52 @@
+# core/management/commands/process_images.py
+"""
+Run the upload clean-up (core.images) over stored images that don't have
+a thumbnail yet: files uploaded before it existed, or whose job was lost
+when a process exited before its worker got to it.
+
+    python manage.py process_images --dry-run
+    python manage.py process_images
+
+Images run one after another in this process, not on the task workers.
+Safe to re-run: processed images are skipped.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.images import image_fields, image_models, process, thumbnail_name
+
+
+class Command(BaseCommand):
+    help = "Strip metadata, resize and make thumbnails for images that haven't been processed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be processed")
+
+    def handle(self, *args, **options):
+        processed = missing = failed = 0
+        for model in image_models():
+            for field in image_fields(model):
+                rows = (
+                    model._base_manager.exclude(**{f'{field.attname}__isnull': True})
+                    .exclude(**{field.attname: ''})
+                    .values_list('pk', field.attname)
+                )
+                for pk, name in rows.iterator():
+                    if field.storage.exists(thumbnail_name(name)):
+                        continue
+                    if not field.storage.exists(name):
+                        missing += 1
+                        continue
+                    if not options['dry_run']:
+                        try:
+                            process(model._meta.label, pk, field.attname, name)
+                        except Exception as e:
+                            failed += 1
+                            self.stderr.write(f"{model._meta.label} {pk} ({name}): {e}")
+                            continue
+                    processed += 1
+
+        verb = "would be processed" if options['dry_run'] else "processed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} image(s) {verb}, {missing} missing file(s), {failed} failed"
+        ))
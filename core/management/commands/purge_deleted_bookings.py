@@ -0,0 +1,55 @@
+# core/management/commands/purge_deleted_bookings.py
+"""
+Permanently delete bookings that have been in the trash (core.softdelete)
+for more than SOFT_DELETE_RETENTION_DAYS days.
+
+Run from cron, e.g. nightly:
+    python manage.py purge_deleted_bookings
+    python manage.py purge_deleted_bookings --days 7 --dry-run
+
+Rows are removed in batches, each recorded in the audit log.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from bookings.models import Booking
+from core import audit
+from packages.models import PackageBooking
+
+
+class Command(BaseCommand):
+    help = "Permanently delete bookings trashed more than SOFT_DELETE_RETENTION_DAYS ago"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SOFT_DELETE_RETENTION_DAYS,
+                            help="Purge bookings deleted more than this many days ago")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be purged")
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError("--days can't be negative")
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        for label, model in (('booking', Booking), ('package booking', PackageBooking)):
+            expired = model.trash.filter(deleted_at__lt=cutoff)
+            if options['dry_run']:
+                self.stdout.write(f"{expired.count()} {label}(s) would be purged")
+                continue
+
+            purged = 0
+            while True:
+                batch = list(expired.order_by('deleted_at').values_list('pk', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                rows = model.trash.filter(pk__in=batch)
+                with audit.track(rows, f'{model._meta.app_label}.purge_deleted_bookings', action='delete'):
+                    rows.hard_delete()
+                purged += len(batch)
+            self.stdout.write(f"{purged} {label}(s) purged")
+
+        self.stdout.write(self.style.SUCCESS(f"Done (cutoff {cutoff:%Y-%m-%d %H:%M})"))
@@ -0,0 +1,192 @@
+# core/management/commands/regenerate_invoices.py
+"""
+Regenerate invoice PDFs in bulk and archive them by month.
+
+    python manage.py regenerate_invoices --from 2025-01-01 --to 2025-12-31
+    python manage.py regenerate_invoices --kind package --status CONFIRMED --workers 4
+
+Bookings are read in the parent process and turned into invoice data
+dicts; rendering is spread over a process pool (one worker per core by
+default). Every invoice's content fingerprint is kept in
+MEDIA_ROOT/invoices/manifest.json, and invoices whose fingerprint and file
+are unchanged are skipped, so re-running after a price or company-detail
+change only redraws what actually differs. Afterwards every selected
+invoice is written to MEDIA_ROOT/invoices/archive/invoices-YYYY-MM.zip;
+entries already in a month's archive that this run didn't select (say, a
+--kind package or --status run) are kept.
+"""
+
+import json
+import os
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.invoices import fingerprint
+
+KINDS = ('booking', 'package')
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _render_chunk(kind, items):
+    """Runs in a worker process: render [(path, data)], return how many"""
+    from core.invoices import render_invoice
+
+    for path, data in items:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        render_invoice(kind, data, path)
+    return len(items)
+
+
+def _parse_date(value, option):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f"{option} must be YYYY-MM-DD, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = "Regenerate booking and package invoices in parallel and write monthly zip archives"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help="Created on or after (YYYY-MM-DD)")
+        parser.add_argument('--to', dest='date_to', help="Created on or before (YYYY-MM-DD)")
+        parser.add_argument('--status', action='append', help="Only bookings with this status (repeatable)")
+        parser.add_argument('--kind', choices=KINDS + ('all',), default='all')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Render processes (default: one per core)")
+        parser.add_argument('--chunk-size', type=int, default=200, help="Invoices per worker task")
+        parser.add_argument('--force', action='store_true', help="Ignore fingerprints and redraw everything")
+        parser.add_argument('--no-archive', action='store_true', help="Skip writing the monthly zip files")
+
+    def handle(self, *args, **options):
+        kinds = KINDS if options['kind'] == 'all' else (options['kind'],)
+        filters = {}
+        if options['date_from']:
+            filters['created_at__date__gte'] = _parse_date(options['date_from'], '--from')
+        if options['date_to']:
+            filters['created_at__date__lte'] = _parse_date(options['date_to'], '--to')
+        if options['status']:
+            filters['status__in'] = [status.upper() for status in options['status']]
+
+        invoice_root = os.path.join(settings.MEDIA_ROOT, 'invoices')
+        manifest_path = os.path.join(invoice_root, 'manifest.json')
+        manifest = self.load_manifest(manifest_path)
+
+        started = time.perf_counter()
+        todo = defaultdict(list)    # kind -> [(path, data)]
+        by_month = defaultdict(list)  # 'YYYY-MM' -> [(path, name in zip)]
+        selected = skipped = 0
+
+        for kind in kinds:
+            for key, path, month, data in self.invoices(kind, filters):
+                selected += 1
+                by_month[month].append((path, os.path.relpath(path, invoice_root)))
+                digest = fingerprint(kind, data)
+                if not options['force'] and manifest.get(key) == digest and os.path.exists(path):
+                    skipped += 1
+                    continue
+                manifest[key] = digest
+                todo[kind].append((path, data))
+
+        rendered = self.render(todo, options['workers'], options['chunk_size'])
+        self.save_manifest(manifest_path, manifest)
+        render_seconds = time.perf_counter() - started
+
+        archives = [] if options['no_archive'] else self.archive(invoice_root, by_month)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{selected} invoice(s) selected, {rendered} rendered, {skipped} unchanged "
+            f"in {elapsed:.1f}s ({rendered / render_seconds if render_seconds else 0:.0f} rendered/s, "
+            f"{options['workers']} worker(s))"
+        )
+        for path in archives:
+            self.stdout.write(f"  archive {path}")
+        self.stdout.write(self.style.SUCCESS("Done"))
+
+    def invoices(self, kind, filters):
+        """Yield (manifest key, pdf path, 'YYYY-MM', invoice data) for matching bookings"""
+        if kind == 'booking':
+            from bookings.models import Booking
+            from bookings.utils import booking_invoice_data as invoice_data, invoice_pdf_path as pdf_path
+            queryset = Booking.objects.filter(**filters)
+        else:
+            from packages.models import PackageBooking
+            from packages.utils import package_invoice_data as invoice_data, package_invoice_pdf_path as pdf_path
+            queryset = PackageBooking.objects.filter(**filters).select_related('package')
+
+        for booking in queryset.order_by('id').iterator(chunk_size=2000):
+            yield (
+                f"{kind}:{booking.id}",
+                pdf_path(booking.id),
+                booking.created_at.strftime('%Y-%m'),
+                invoice_data(booking),
+            )
+
+    def render(self, todo, workers, chunk_size):
+        tasks = [
+            (kind, items[i:i + chunk_size])
+            for kind, items in todo.items()
+            for i in range(0, len(items), chunk_size)
+        ]
+        if not tasks:
+            return 0
+        if workers <= 1:
+            return sum(_render_chunk(kind, chunk) for kind, chunk in tasks)
+
+        # Workers never query; don't let forked children share our DB sockets
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_chunk, kind, chunk) for kind, chunk in tasks]
+            return sum(future.result() for future in futures)
+
+    def archive(self, invoice_root, by_month):
+        archive_dir = os.path.join(invoice_root, 'archive')
+        os.makedirs(archive_dir, exist_ok=True)
+        written = []
+        for month, files in sorted(by_month.items()):
+            path = os.path.join(archive_dir, f"invoices-{month}.zip")
+            tmp_path = path + '.tmp'
+            names = {name for _, name in files}
+            # PDFs are already compressed; deflate mostly just costs CPU
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+                if os.path.exists(path):
+                    # Carry over the invoices a filtered run didn't select
+                    with zipfile.ZipFile(path) as previous:
+                        for info in previous.infolist():
+                            if info.filename not in names:
+                                archive.writestr(info, previous.read(info))
+                for pdf_path, name in files:
+                    if os.path.exists(pdf_path):
+                        archive.write(pdf_path, name)
+            os.replace(tmp_path, path)
+            written.append(path)
+        return written
+
+    def load_manifest(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            self.stderr.write(f"Ignoring unreadable manifest {path}; every invoice will be redrawn")
+            return {}
+
+    def save_manifest(self, path, manifest):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,52 @@
+# core/management/commands/simulate_replication.py
+"""
+Fake replication between two SQLite files, for trying the replica router locally.
+
+    DB_REPLICA_NAME=replica.sqlite3 python manage.py simulate_replication --lag 3
+
+Copies the primary database into the replica file every --lag seconds, so the
+replica is always up to that many seconds behind - like a lagging real replica.
+"""
+
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.routers import PRIMARY_ALIAS, REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database into the replica file on a fixed lag"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lag', type=float, default=2.0, help="Seconds between copies")
+        parser.add_argument('--once', action='store_true', help="Copy once and exit")
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.databases:
+            raise CommandError("No 'replica' database configured. Set DB_REPLICA_NAME.")
+
+        primary = connections.databases[PRIMARY_ALIAS]
+        replica = connections.databases[REPLICA_ALIAS]
+        if primary['ENGINE'] != 'django.db.backends.sqlite3' or replica['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("The replication simulator only works with SQLite.")
+
+        while True:
+            started = time.perf_counter()
+            self.copy(str(primary['NAME']), str(replica['NAME']))
+            self.stdout.write(f"Replica synced in {(time.perf_counter() - started) * 1000:.1f} ms")
+            if options['once']:
+                break
+            time.sleep(options['lag'])
+
+    def copy(self, source_path, target_path):
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            # The backup API gives a consistent snapshot even while the site writes
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
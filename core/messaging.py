@@ -0,0 +1,114 @@
+# core/messaging.py
+"""
+WhatsApp messages through Twilio.
+
+All sends go through the per-process client from core.providers, so
+consecutive messages reuse one keep-alive HTTPS connection instead of
+building a Client (and a TLS session) per message.
+
+    send_whatsapp(phone, body)                       # one message: SID or None
+    send_many([(phone, body), ...])                  # broadcast: [SID or None, ...]
+
+send_many runs the sends on an asyncio loop. The twilio client is
+synchronous, so each call runs in a worker thread. At most
+TWILIO_CONCURRENCY calls are in flight (asyncio.Semaphore), and calls
+start no faster than TWILIO_RATE_PER_SECOND, the account's message rate.
+A 429 from Twilio is retried with back off.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from twilio.base.exceptions import TwilioRestException
+
+from .providers import twilio_client
+
+MAX_RETRIES = 3
+
+
+def whatsapp_address(phone):
+    """Indian mobile number (10 digits, as stored) to a Twilio WhatsApp address"""
+    phone = str(phone).strip()
+    if phone.startswith('whatsapp:'):
+        return phone
+    if not phone.startswith('+'):
+        phone = f"+91{phone}"
+    return f"whatsapp:{phone}"
+
+
+def _create(phone, body):
+    message = twilio_client().messages.create(
+        from_=settings.TWILIO_WHATSAPP_NUMBER,
+        to=whatsapp_address(phone),
+        body=body,
+    )
+    return message.sid
+
+
+def send_whatsapp(phone, body, fail_silently=True):
+    """Send one message; returns the message SID, or None if Twilio refused it"""
+    try:
+        return _create(phone, body)
+    except Exception as e:
+        if not fail_silently:
+            raise
+        print(f"WhatsApp error ({phone}): {e}")
+        return None
+
+
+class _RateLimiter:
+    """Spaces call starts at least 1/rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _send_all(messages, concurrency, rate):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = _RateLimiter(rate)
+
+    async def send(phone, body):
+        async with semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                await limiter.wait()
+                try:
+                    return await loop.run_in_executor(executor, _create, phone, body)
+                except TwilioRestException as e:
+                    if e.status == 429 and attempt < MAX_RETRIES:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    print(f"WhatsApp error ({phone}): {e}")
+                    return None
+                except Exception as e:
+                    print(f"WhatsApp error ({phone}): {e}")
+                    return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(*(send(phone, body) for phone, body in messages))
+
+
+def send_many(messages, concurrency=None, rate=None):
+    """
+    Send [(phone, body), ...] concurrently. Returns the SIDs in the same
+    order, None for each message that failed. Call it from sync code
+    (views, admin actions, commands), not from inside an event loop.
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+    concurrency = concurrency or settings.TWILIO_CONCURRENCY
+    rate = settings.TWILIO_RATE_PER_SECOND if rate is None else rate
+    return asyncio.run(_send_all(messages, min(concurrency, len(messages)), rate))
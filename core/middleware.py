@@ -0,0 +1,35 @@
+# core/middleware.py
+from django.conf import settings
+
+from .routers import has_written, replica_configured, reset_pin
+
+PIN_COOKIE = 'pin_primary'
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin a request to the primary database when it (or a recent request from
+    the same browser) has written, so users always see their own changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or PIN_COOKIE in request.COOKIES
+        reset_pin(pinned)
+        try:
+            response = self.get_response(request)
+            if has_written():
+                response.set_cookie(
+                    PIN_COOKIE, '1',
+                    max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                    httponly=True,
+                    samesite='Lax',
+                )
+            return response
+        finally:
+            reset_pin(False)
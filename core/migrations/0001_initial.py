@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-19 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_id', models.CharField(max_length=100, unique=True)),
+                ('order_id', models.CharField(blank=True, max_length=100)),
+                ('kind', models.CharField(choices=[('booking', 'Booking'), ('package', 'Package Booking')], max_length=20)),
+                ('booking_id', models.BigIntegerField(null=True)),
+                ('outcome', models.CharField(blank=True, choices=[('CONFIRMED', 'Confirmed'), ('ALREADY_PAID', 'Already paid')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Payment Event',
+                'verbose_name_plural': 'Payment Events',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
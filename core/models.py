@@ -1,3 +1,128 @@
+# core/models.py
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class PaymentEvent(models.Model):
+    """
+    One row per Razorpay payment callback we acted on (core.payments).
+
+    payment_id is unique, so a retried or double-submitted callback for the
+    same payment can't confirm a booking or notify the customer twice; the
+    retry is answered from this row.
+    """
+    KIND_CHOICES = [
+        ('booking', 'Booking'),
+        ('package', 'Package Booking'),
+    ]
+    
+    OUTCOME_CHOICES = [
+        ('CONFIRMED', 'Confirmed'),
+        ('ALREADY_PAID', 'Already paid'),
+    ]
+    
+    payment_id = models.CharField(max_length=100, unique=True)
+    order_id = models.CharField(max_length=100, blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    booking_id = models.BigIntegerField(null=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.payment_id} -> {self.kind} {self.booking_id} ({self.outcome})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Payment Event'
+        verbose_name_plural = 'Payment Events'
+
+
+class ContactMessage(models.Model):
+    """A message from one of the contact forms (core.contact)"""
+    STATUS_CHOICES = [
+        ('NEW', 'New'),
+        ('READ', 'Read'),
+        ('REPLIED', 'Replied'),
+        ('SPAM', 'Spam'),
+    ]
+    
+    SOURCE_CHOICES = [
+        ('site', 'Contact page'),
+        ('booking', 'Booking contact page'),
+        ('import', 'Imported file'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    email = models.EmailField(blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    message = models.TextField()
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='site')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='NEW', db_index=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    # MEDIA_ROOT/contacts file name for imported messages, so re-running the import skips them
+    imported_from = models.CharField(max_length=255, blank=True, db_index=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} <{self.email or self.phone}> ({self.get_status_display()})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Contact Message'
+        verbose_name_plural = 'Contact Messages'
+        indexes = [
+            # Admin inbox: newest first within a status
+            models.Index(fields=['status', '-created_at'], name='contact_status_created_idx'),
+        ]
+
+
+class AuditLog(models.Model):
+    """
+    Append-only trail of admin changes (core.audit): who did what to which
+    row, with the row's values before and after. Never edited or deleted
+    from the admin.
+    """
+    ACTION_CHOICES = [
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    ]
+    
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='+', db_constraint=False,
+    )
+    # Kept as text so the trail survives the user being deleted
+    actor_name = models.CharField(max_length=150, blank=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # What was done, e.g. 'bookings.delete_selected_bookings' or 'users.make_inactive'
+    operation = models.CharField(max_length=100, blank=True)
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.CharField(max_length=64)
+    object_repr = models.CharField(max_length=200, blank=True)
+    before = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    after = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    path = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    def __str__(self):
+        return f"{self.actor_name or 'system'} {self.action} {self.model} {self.object_id}"
+    
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Audit log entries are append-only")
+        super().save(*args, **kwargs)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Audit Log Entry'
+        verbose_name_plural = 'Audit Log'
+        indexes = [
+            models.Index(fields=['actor', '-created_at'], name='audit_actor_created_idx'),
+            models.Index(fields=['model', '-created_at'], name='audit_model_created_idx'),
+            models.Index(fields=['model', 'object_id'], name='audit_object_idx'),
+        ]
@@ -0,0 +1,105 @@
+# core/notifications.py
+"""
+Registry of customer notification texts (WhatsApp, share link, email, SMS).
+
+Each app registers its templates at import (bookings/notifications.py,
+packages/notifications.py): plain text with {placeholders}, one per
+(name, channel, language). register() compiles each template once into a
+small Python function that joins the literal text and the snapshot values,
+so rendering costs no parsing, and checks every placeholder against the
+snapshot fields the app declares: a typo fails at startup, not at send time.
+
+Templates render from a snapshot: a flat dict of display-ready strings
+(dates and times already formatted, choice labels resolved) built once per
+booking from the instance or a .values() row. Sending every channel for a
+booking, or one channel to a whole package, builds the snapshot once and
+never touches a related object.
+
+    text = render('booking_confirmation', 'whatsapp', snapshot)
+    subject, body = render_email('booking_confirmation', snapshot, language='gu')
+
+A placeholder may name the text to print when the value is empty:
+{scheduled_date:Will be confirmed}. A missing language falls back to
+settings.NOTIFICATION_LANGUAGE, then English.
+"""
+
+from string import Formatter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+CHANNELS = ('whatsapp', 'share', 'email', 'sms')
+LANGUAGES = (('en', 'English'), ('gu', 'ગુજરાતી'))
+
+_registry = {}  # (name, channel, language) -> MessageTemplate
+
+
+def compile_text(text):
+    """
+    (render function, placeholder names) for a template text.
+
+    '{name}, {date:TBC}' compiles to
+    lambda s: ''.join((s['name'], ', ', (s['date'] or 'TBC')))
+    """
+    parts = []
+    fields = set()
+    for literal, field, fallback, conversion in Formatter().parse(text):
+        if literal:
+            parts.append(repr(literal))
+        if field is None:
+            continue
+        if not field.isidentifier() or conversion:
+            raise ImproperlyConfigured(f"Unsupported placeholder {{{field}}} in {text[:40]!r}...")
+        fields.add(field)
+        parts.append(f"(s[{field!r}] or {fallback!r})" if fallback else f"s[{field!r}]")
+    source = f"lambda s: ''.join(({', '.join(parts)},))" if parts else "lambda s: ''"
+    return eval(source, {}), fields
+
+
+class MessageTemplate:
+    __slots__ = ('name', 'channel', 'language', 'fields', 'render', '_subject')
+
+    def __init__(self, name, channel, language, body, subject=''):
+        self.name = name
+        self.channel = channel
+        self.language = language
+        self.render, body_fields = compile_text(body)
+        self._subject, subject_fields = compile_text(subject)
+        self.fields = body_fields | subject_fields
+
+    def render_email(self, snapshot):
+        return self._subject(snapshot), self.render(snapshot)
+
+
+def register(name, channel, body, language='en', subject='', fields=None):
+    """Compile and store a template; `fields` are the snapshot keys it may use"""
+    if channel not in CHANNELS:
+        raise ImproperlyConfigured(f"Unknown notification channel {channel!r}")
+    if channel == 'email' and not subject:
+        raise ImproperlyConfigured(f"Email template {name!r} ({language}) needs a subject")
+    template = MessageTemplate(name, channel, language, body, subject)
+    if fields is not None:
+        unknown = template.fields - set(fields)
+        if unknown:
+            raise ImproperlyConfigured(
+                f"Template {name}/{channel}/{language} uses unknown field(s): {', '.join(sorted(unknown))}"
+            )
+    _registry[name, channel, language] = template
+    return template
+
+
+def get_template(name, channel, language=None):
+    for code in (language, settings.NOTIFICATION_LANGUAGE, 'en'):
+        template = _registry.get((name, channel, code))
+        if template is not None:
+            return template
+    raise KeyError(f"No {channel} template registered for {name!r}")
+
+
+def render(name, channel, snapshot, language=None):
+    return get_template(name, channel, language).render(snapshot)
+
+
+def render_email(name, snapshot, language=None):
+    """(subject, body)"""
+    return get_template(name, 'email', language).render_email(snapshot)
@@ -0,0 +1,60 @@
+# core/payments.py
+"""
+Idempotent processing of Razorpay payment callbacks.
+
+Gateways retry, and customers double-click; every callback for a payment
+must end in the same place without confirming or notifying twice:
+
+    event, created = record_payment(
+        'package', Booking.objects.filter(razorpay_order_id=order_id),
+        payment_id, order_id, confirm=mark_paid, notify=send_messages,
+    )
+
+A callback we've already handled is answered from its PaymentEvent with a
+single indexed lookup. A new one claims its payment_id (unique), locks the
+booking row (select_for_update), applies `confirm` and schedules `notify`
+for after the commit, so a rolled back payment never sends a message and
+racing retries of one payment wait for the first and then reuse its event.
+"""
+
+from django.db import IntegrityError, router, transaction
+
+from .models import PaymentEvent
+
+
+def record_payment(kind, bookings, payment_id, order_id='', confirm=None, notify=None):
+    """
+    `bookings`: queryset matching the one booking being paid.
+    `confirm(booking)`: set the paid state; returns the update_fields to save.
+    `notify(booking)`: runs after commit, only the first time a booking is paid.
+
+    Returns (PaymentEvent, created). Raises bookings.model.DoesNotExist.
+    """
+    key = payment_id or f"{kind}:{order_id}"
+    existing = PaymentEvent.objects.filter(payment_id=key).first()
+    if existing:
+        return existing, False
+
+    using = router.db_for_write(bookings.model)
+    with transaction.atomic(using=using):
+        # Claim the payment id first: a concurrent retry blocks on the unique
+        # index (on SQLite, on the write lock) until we commit, then fails
+        try:
+            with transaction.atomic(using=using):
+                event = PaymentEvent.objects.using(using).create(payment_id=key, order_id=order_id or '', kind=kind)
+        except IntegrityError:
+            return PaymentEvent.objects.using(using).get(payment_id=key), False
+
+        booking = bookings.using(using).select_for_update().get()
+        already_paid = booking.payment_status != 'PENDING'
+        event.booking_id = booking.pk
+        event.outcome = 'ALREADY_PAID' if already_paid else 'CONFIRMED'
+        event.save(update_fields=['booking_id', 'outcome'])
+
+        if not already_paid:
+            if confirm:
+                booking.save(update_fields=confirm(booking))
+            if notify:
+                # robust: a failed message must not turn a paid booking into an error page
+                transaction.on_commit(lambda: notify(booking), using=using, robust=True)
+    return event, True
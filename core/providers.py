@@ -0,0 +1,42 @@
+# core/providers.py
+"""
+Clients for external providers (Razorpay, Twilio).
+
+Base URLs come from settings so the benchmarks can point the site at local
+fake servers (core.fakes) instead of the real APIs.
+
+The Twilio client is shared per process: its requests Session keeps
+connections to the API alive between messages (see core.messaging).
+"""
+
+import threading
+
+import razorpay
+from django.conf import settings
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+_twilio_clients = {}
+_twilio_lock = threading.Lock()
+
+
+def razorpay_client():
+    options = {}
+    base_url = getattr(settings, 'RAZORPAY_BASE_URL', '')
+    if base_url:
+        options['base_url'] = base_url
+    return razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET), **options)
+
+
+def twilio_client():
+    base_url = getattr(settings, 'TWILIO_API_BASE_URL', '')
+    key = (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, base_url)
+    with _twilio_lock:
+        client = _twilio_clients.get(key)
+        if client is None:
+            http_client = TwilioHttpClient(timeout=settings.TWILIO_TIMEOUT)
+            client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, http_client=http_client)
+            if base_url:
+                client.api.base_url = base_url
+            _twilio_clients[key] = client
+    return client
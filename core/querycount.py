@@ -0,0 +1,128 @@
+# core/querycount.py
+"""
+Query recording with call sites, for hunting N+1 queries.
+
+    with QueryRecorder() as recorder:
+        client.get(url)
+    recorder.count, recorder.repeated()
+
+Used by the check_query_counts command.
+"""
+
+import os
+import re
+import sys
+import traceback
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+# Literals vary per row; strip them so "same query, different id" groups together
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def normalize_sql(sql):
+    return _LITERALS.sub('?', sql)
+
+
+def _template_line(frame):
+    """'template name:line' when the frame is a template node being rendered"""
+    node = frame.f_locals.get('self')
+    token = getattr(node, 'token', None)
+    origin = getattr(node, 'origin', None)
+    if token is None or origin is None:
+        return None
+    return f'  Template "{origin.name}", line {token.lineno}: {token.contents[:60]}\n'
+
+
+# Our own plumbing that wraps every render/query; never the culprit
+_IGNORED_FILES = (
+    'manage.py',
+    os.path.join('core', 'querycount.py'),
+    os.path.join('core', 'instrumentation.py'),
+    os.path.join('core', 'middleware.py'),
+    os.path.join('core', 'routers.py'),
+)
+
+
+def _project_frames(limit=8):
+    """
+    Call sites from our own code and templates, innermost last.
+
+    Django and site-packages frames are skipped; template nodes are reported
+    by template file and line instead.
+    """
+    base = str(settings.BASE_DIR)
+    lines = []
+    frame = sys._getframe(2)
+    while frame is not None and len(lines) < limit:
+        filename = frame.f_code.co_filename
+        if frame.f_code.co_name == 'render_annotated':
+            template_line = _template_line(frame)
+            if template_line and template_line not in lines:
+                lines.append(template_line)
+        elif filename.startswith(base) and 'site-packages' not in filename \
+                and 'management' not in filename and not filename.endswith(_IGNORED_FILES):
+            lines.extend(traceback.format_list(traceback.extract_stack(frame, limit=1)))
+        frame = frame.f_back
+    return list(reversed(lines))
+
+
+class QueryRecorder:
+    """Record every query run on every connection while the block executes"""
+
+    def __init__(self, with_stacks=True):
+        self.with_stacks = with_stacks
+        self.queries = []
+        self._wrappers = []
+
+    def __enter__(self):
+        self._wrappers = [conn.execute_wrapper(self) for conn in connections.all()]
+        for wrapper in self._wrappers:
+            wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        for wrapper in reversed(self._wrappers):
+            wrapper.__exit__(*exc_info)
+        self._wrappers = []
+
+    def __call__(self, execute, sql, params, many, context):
+        stack = _project_frames() if self.with_stacks else []
+        self.queries.append((sql, stack))
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def grouped(self):
+        """{normalized sql: [stacks...]}"""
+        groups = defaultdict(list)
+        for sql, stack in self.queries:
+            groups[normalize_sql(sql)].append(stack)
+        return groups
+
+    def repeated(self, minimum=2):
+        """Queries that ran at least `minimum` times, most repeated first"""
+        groups = [(sql, stacks) for sql, stacks in self.grouped().items() if len(stacks) >= minimum]
+        return sorted(groups, key=lambda item: len(item[1]), reverse=True)
+
+
+def growth(small, large):
+    """
+    Compare two recordings of the same page at different data sizes.
+
+    Returns [(sql, small_count, large_count, call_site)] for every query that
+    ran more often with more rows.
+    """
+    small_groups = small.grouped()
+    offenders = []
+    for sql, stacks in large.grouped().items():
+        before = len(small_groups.get(sql, []))
+        if len(stacks) > before:
+            # The last run is a per-row one; the first may be an unrelated lookup of the same shape
+            call_site = ''.join(stacks[-1]) if stacks[-1] else '(inside Django or a third-party app)\n'
+            offenders.append((sql, before, len(stacks), call_site))
+    return sorted(offenders, key=lambda item: item[2] - item[1], reverse=True)
@@ -0,0 +1,71 @@
+# core/routers.py
+"""
+Primary/replica database routing.
+
+Writes always go to 'default'. Reads only go to the 'replica' alias inside
+views wrapped with @use_replica (reports, public listings), and never once the
+current request has written something - it is then pinned to the primary so it
+reads its own writes. ReplicaPinningMiddleware keeps that pin for a few seconds
+across requests (settings.REPLICA_PIN_SECONDS) to cover replication lag.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+
+# Login state must never be read from a lagging copy
+PRIMARY_ONLY_APPS = {'sessions', 'users', 'auth'}
+
+_replica_allowed = ContextVar('replica_allowed', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def has_written():
+    return _wrote.get()
+
+
+def reset_pin(pinned=False):
+    _pinned.set(pinned)
+    _wrote.set(False)
+
+
+def use_replica(view_func):
+    """Let a read-only view read from the replica"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = _replica_allowed.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _replica_allowed.reset(token)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replica_configured() or _pinned.get() or not _replica_allowed.get():
+            return PRIMARY_ALIAS
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return PRIMARY_ALIAS
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_ALIAS
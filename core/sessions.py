@@ -0,0 +1,80 @@
+# core/sessions.py
+"""
+Hybrid session engine: reads come from the cache, writes go through to the DB.
+
+Enable with SESSION_ENGINE = 'core.sessions' (the default in settings when
+CACHE_BACKEND is shared). The cache used is settings.SESSION_CACHE_ALIAS and
+must be seen by every worker (Redis, Memcached, file): with a per-process
+LocMem cache a logout or flush() on one worker leaves the session cached on
+the others, so settings falls back to plain DB sessions for locmem.
+"""
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils import timezone
+
+KEY_PREFIX = "core.sessions"
+
+# Marker cached for session keys that are not in the DB, so stale cookies
+# from anonymous visitors don't hit the sessions table on every request.
+MISSING = "__missing__"
+
+
+class SessionStore(CachedDBStore):
+    """Cached, write-through database sessions"""
+
+    cache_key_prefix = KEY_PREFIX
+
+    def load(self):
+        cache_key = self.cache_key
+        try:
+            data = self._cache.get(cache_key)
+        except Exception:
+            data = None
+
+        if data == MISSING:
+            self._session_key = None
+            return {}
+
+        if data is None:
+            s = self._get_session_from_db()
+            if s:
+                data = self.decode(s.session_data)
+                self._cache.set(
+                    cache_key, data, self.get_expiry_age(expiry=s.expire_date)
+                )
+            else:
+                self._cache.set(
+                    cache_key,
+                    MISSING,
+                    getattr(settings, 'SESSION_MISSING_CACHE_SECONDS', 60),
+                )
+                data = {}
+        return data
+
+    def exists(self, session_key):
+        if not session_key:
+            return False
+        cached = self._cache.get(self.cache_key_prefix + session_key)
+        if cached == MISSING:
+            return False
+        if cached is not None:
+            return True
+        return super(CachedDBStore, self).exists(session_key)
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000):
+        """Delete expired sessions in small batches so SQLite isn't locked for long"""
+        model = cls.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            model.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+        return deleted
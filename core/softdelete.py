@@ -0,0 +1,112 @@
+# core/softdelete.py
+"""
+Soft delete for bookings: delete() moves rows to the trash by setting
+deleted_at instead of removing them, so an admin mistake can be undone.
+
+    Booking.objects          live rows only (the default manager: admin, views, jobs)
+    Booking.trash            deleted rows (the admin trash view, purge_deleted_bookings)
+    Booking.all_objects      both (invoice numbering, payment callbacks)
+
+    Booking.objects.filter(...).delete()    # to the trash; returns (count, {label: count})
+    Booking.trash.filter(...).restore()
+    Booking.trash.filter(...).hard_delete() # gone for good
+
+Moving rows in or out of the trash is a queryset.update(), so no model
+signals fire; `trash_changed` is sent instead (analytics.rollups listens
+to keep revenue totals right).
+
+Models pair this with partial indexes (condition deleted_at IS NULL), so
+live-row queries use indexes that never contain trashed rows.
+Reverse managers (package.bookings, user.booking_set) are built on the
+default manager, so they hide trashed rows too; a ForeignKey access
+(booking.package) and core.archive use the plain base manager and see
+every row.
+"""
+
+from django.db import models
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Sent after delete()/restore() with sender=model, pks=[moved rows], deleted=True/False
+trash_changed = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def _stamp(self, deleted_at):
+        values = {'deleted_at': deleted_at}
+        if any(field.name == 'updated_at' for field in self.model._meta.concrete_fields):
+            # So incremental exports (analytics.exports) pick up the change
+            values['updated_at'] = timezone.now()
+        return values
+
+    def _move(self, deleted_at):
+        """Stamp deleted_at on the rows not already there and send trash_changed"""
+        rows = self.filter(deleted_at__isnull=deleted_at is not None)
+        pks = list(rows.values_list('pk', flat=True))
+        if not pks:
+            return 0
+        count = (
+            self.model._base_manager.using(self.db)
+            .filter(pk__in=pks, deleted_at__isnull=deleted_at is not None)
+            .update(**self._stamp(deleted_at))
+        )
+        trash_changed.send(sender=self.model, pks=pks, deleted=deleted_at is not None)
+        return count
+
+    def delete(self):
+        """Move live rows to the trash"""
+        count = self._move(timezone.now())
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+    def restore(self):
+        """Bring trashed rows back; returns how many"""
+        return self._move(None)
+
+    restore.alters_data = True
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class TrashManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=False)
+
+
+class SoftDeleteModel(models.Model):
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = SoftDeleteManager()
+    trash = TrashManager()
+    all_objects = models.Manager.from_queryset(SoftDeleteQuerySet)()
+
+    def delete(self, using=None, keep_parents=False):
+        """Move this row to the trash"""
+        count, _ = type(self).all_objects.using(using or self._state.db).filter(pk=self.pk).delete()
+        self.deleted_at = self.deleted_at or timezone.now()
+        return count, {self._meta.label: count}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
+    def restore(self):
+        type(self).all_objects.using(self._state.db).filter(pk=self.pk).restore()
+        self.deleted_at = None
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    class Meta:
+        abstract = True
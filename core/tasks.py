@@ -0,0 +1,76 @@
+# core/tasks.py
+"""
+In-process background jobs for work that shouldn't hold up a request,
+like notifying every customer of a package.
+
+    enqueue(send_schedule_update, package.pk, schedule)
+
+Jobs run in submission order on TASK_WORKERS daemon threads started on
+first use; each job gets fresh database connections and closes them when
+it's done. A job that raises is printed and dropped.
+
+Jobs live in memory: one that hasn't run when the process exits is lost,
+so only queue best-effort work that is safe to run again (notifications,
+cache warming), never payments, and leave a trace a cron sweep can pick
+up (notify_contact_messages, send_schedule_updates). With TASKS_EAGER=True jobs run inline,
+which is what tests and one-off scripts want.
+"""
+
+import queue
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import connections
+
+_queue = queue.Queue()
+_workers = []
+_lock = threading.Lock()
+
+
+def _name(func):
+    return f"{func.__module__}.{getattr(func, '__qualname__', func)}"
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        print(f"Task error ({_name(func)}):")
+        traceback.print_exc()
+
+
+def _work():
+    while True:
+        func, args, kwargs = _queue.get()
+        try:
+            _run(func, args, kwargs)
+        finally:
+            connections.close_all()
+            _queue.task_done()
+
+
+def _start_workers():
+    with _lock:
+        while len(_workers) < settings.TASK_WORKERS:
+            worker = threading.Thread(target=_work, name=f"pathan-task-{len(_workers)}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def enqueue(func, *args, **kwargs):
+    """Run func(*args, **kwargs) on a background worker"""
+    if settings.TASKS_EAGER:
+        _run(func, args, kwargs)
+        return
+    _start_workers()
+    _queue.put((func, args, kwargs))
+
+
+def pending():
+    return _queue.unfinished_tasks
+
+
+def drain():
+    """Block until every queued job has finished (management commands, tests)"""
+    _queue.join()
@@ -0,0 +1,12 @@
+# core/templatetags/images.py
+from django import template
+
+from core.images import thumbnail_url
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail(file):
+    """{{ package.cover_image|thumbnail }}: the small derivative, or the original until it's made"""
+    return thumbnail_url(file)
@@ -1,3 +1,279 @@
-from django.test import TestCase
+# core/tests.py
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import ExifTags, Image
+
+from bookings.models import Booking
+from core import audit, images
+from core.benchmark import make_booking, make_package, make_user
+from core.contact import submit
+from core.http import conditional
+from core.models import AuditLog, ContactMessage
+from packages.models import Package
+
+
+class QueryCountTests(TestCase):
+    """No N+1 queries on admin changelists and public pages (manage.py check_query_counts)"""
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        out = StringIO()
+        try:
+            call_command('check_query_counts', current_database=True, stdout=out)
+        except CommandError as e:
+            self.fail(f"{e}\n{out.getvalue()}")
+
+    def test_public_page_budgets(self):
+        for n in range(5):
+            make_package(name=f"Package {n}")
+        # package_list/gallery: the ETag version query (core.http) + the page's own
+        for name, budget in (('home', 0), ('package_list', 3), ('gallery', 3)):
+            with self.subTest(page=name), self.assertNumQueries(budget):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_revalidation_budget(self):
+        make_package()
+        etag = self.client.get(reverse('package_list'))['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('package_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(SHARED_CACHE=False, CONTACT_THROTTLE_COUNT=2)
+class ContactThrottleTests(TestCase):
+    """core.contact without a shared cache: the limit comes from the stored messages"""
+
+    def submit(self, email, ip):
+        request = RequestFactory().post('/contact/', {'name': 'A', 'email': email, 'message': 'Hi'}, REMOTE_ADDR=ip)
+        with self.captureOnCommitCallbacks():
+            return submit(request)
+
+    def test_limit_per_ip_and_email(self):
+        self.assertIsNone(self.submit('a@example.com', '10.0.0.1')[1])
+        self.assertIsNone(self.submit('a@example.com', '10.0.0.1')[1])
+        self.assertIsNotNone(self.submit('b@example.com', '10.0.0.1')[1])
+        self.assertIsNotNone(self.submit('A@Example.com', '10.0.0.2')[1])
+        self.assertIsNone(self.submit('c@example.com', '10.0.0.3')[1])
+        self.assertEqual(ContactMessage.objects.count(), 3)
+
+
+class NotifyContactMessagesTests(TestCase):
+    """manage.py notify_contact_messages retries staff emails that never went out"""
+
+    def setUp(self):
+        old = timezone.now() - timedelta(hours=1)
+        self.unsent = ContactMessage.objects.create(name='A', email='a@example.com', message='Hi', created_at=old)
+        ContactMessage.objects.create(name='B', message='Spam', status='SPAM', created_at=old)
+        ContactMessage.objects.create(name='C', message='Just now')
+
+    def run_command(self, sent):
+        with mock.patch('core.contact.send_email', return_value=sent) as send_email:
+            call_command('notify_contact_messages', stdout=StringIO(), stderr=StringIO())
+        return send_email.call_count
+
+    def test_failed_send_is_retried_on_the_next_run(self):
+        self.assertEqual(self.run_command(sent=False), 1)
+        self.unsent.refresh_from_db()
+        self.assertIsNone(self.unsent.notified_at)
+
+        self.assertEqual(self.run_command(sent=True), 1)
+        self.unsent.refresh_from_db()
+        self.assertIsNotNone(self.unsent.notified_at)
+        self.assertEqual(self.run_command(sent=True), 0)
+
+
+@override_settings(HTTP_CACHE_MAX_AGE=60, HTTP_CACHE_SHARED_MAX_AGE=300)
+class ConditionalGetTests(TestCase):
+    """core.http.conditional: ETags, 304s and Cache-Control on public pages"""
+
+    def setUp(self):
+        self.package = make_package()
+        self.url = reverse('package_list')
+
+    def test_matching_if_none_match_gets_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_anonymous_response_is_public(self):
+        response = self.client.get(self.url)
+        cache_control = {part.strip() for part in response['Cache-Control'].split(',')}
+        self.assertEqual(cache_control, {'public', 'max-age=60', 's-maxage=300'})
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_logged_in_response_is_private(self):
+        self.client.force_login(make_user())
+        response = self.client.get(self.url)
+        cache_control = {part.strip() for part in response['Cache-Control'].split(',')}
+        self.assertEqual(cache_control, {'private', 'no-cache'})
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_etag_changes_when_package_changes(self):
+        etag = self.client.get(self.url)['ETag']
+        Package.objects.filter(pk=self.package.pk).update(updated_at=self.package.updated_at + timedelta(seconds=1))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_response_with_flash_messages_is_not_cached(self):
+        @conditional(lambda request: 1)
+        def view(request):
+            return HttpResponse('ok')
+
+        def request(**extra):
+            request = RequestFactory().get('/', **extra)
+            request.user = AnonymousUser()
+            request._messages = CookieStorage(request)
+            return request
+
+        etag = view(request())['ETag']
+        flashed = request(HTTP_IF_NONE_MATCH=etag)
+        messages.success(flashed, 'Saved')
+        response = view(flashed)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Cache-Control'))
+
+
+@override_settings(TASKS_EAGER=True)
+class AuditTests(TestCase):
+    """core.audit.track records admin bulk changes; AuditMiddleware writes a request's entries at once"""
+
+    def setUp(self):
+        self.pending = make_booking(0)
+        self.confirmed = make_booking(1, status='CONFIRMED')
+
+    def test_update_records_only_changed_columns(self):
+        queryset = Booking.objects.filter(pk__in=[self.pending.pk, self.confirmed.pk])
+        with audit.track(queryset, 'test.confirm', fields=('status', 'name')):
+            queryset.update(status='CONFIRMED')
+
+        entry = AuditLog.objects.get()
+        self.assertEqual((entry.action, entry.operation, entry.object_id), ('update', 'test.confirm', str(self.pending.pk)))
+        self.assertEqual(entry.before, {'status': 'PENDING'})
+        self.assertEqual(entry.after, {'status': 'CONFIRMED'})
+
+    def test_delete_records_before_snapshot(self):
+        message = ContactMessage.objects.create(name='A', email='a@example.com', message='Hi')
+        queryset = ContactMessage.objects.filter(pk=message.pk)
+        with audit.track(queryset, 'test.delete', action='delete'):
+            queryset.delete()
+
+        entry = AuditLog.objects.get()
+        self.assertEqual(entry.action, 'delete')
+        self.assertIsNone(entry.after)
+        self.assertEqual(entry.before['name'], 'A')
+        self.assertEqual(entry.before['message'], 'Hi')
+
+    def test_nothing_recorded_when_block_raises(self):
+        queryset = Booking.objects.filter(pk=self.pending.pk)
+        with self.assertRaises(RuntimeError):
+            with audit.track(queryset, 'test.fail', fields=('status',)):
+                queryset.update(status='CANCELLED')
+                raise RuntimeError
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_request_writes_one_bulk_create_with_actor(self):
+        admin_user = make_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(admin_user)
+        extra = make_booking(2)
+        url = reverse('admin:bookings_booking_changelist')
+        with mock.patch.object(AuditLog.objects, 'bulk_create', wraps=AuditLog.objects.bulk_create) as bulk_create:
+            response = self.client.post(url, {
+                'action': 'mark_as_confirmed', '_selected_action': [self.pending.pk, extra.pk],
+            }, REMOTE_ADDR='10.1.2.3')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(bulk_create.call_count, 1)
+
+        entries = AuditLog.objects.all()
+        self.assertEqual(len(entries), 2)
+        for entry in entries:
+            self.assertEqual(entry.actor, admin_user)
+            self.assertEqual(entry.actor_name, admin_user.get_username())
+            self.assertEqual(entry.ip_address, '10.1.2.3')
+            self.assertEqual(entry.path, url)
+
+
+def _photo(width=300, height=200):
+    """JPEG stored sideways (EXIF orientation 6) with camera and GPS tags; left half blue, right half red"""
+    image = Image.new('RGB', (width, height), (255, 0, 0))
+    image.paste((0, 0, 255), (0, 0, width // 2, height))
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    exif[ExifTags.Base.Make] = 'Phone'
+    gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+    gps[ExifTags.GPS.GPSLatitudeRef] = 'N'
+    gps[ExifTags.GPS.GPSLatitude] = (23.0, 1.0, 2.0)
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(TASKS_EAGER=True, IMAGE_MAX_DIMENSION=150, IMAGE_THUMBNAIL_SIZE=60)
+class ImageProcessingTests(TestCase):
+    """core.images: uploads are cleaned up in place once the save commits"""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_root = override_settings(MEDIA_ROOT=media)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return make_package(cover_image=_photo())
+
+    def open(self, name):
+        with Package._meta.get_field('cover_image').storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+        return image
+
+    def test_upload_is_cleaned_in_place(self):
+        package = self.upload()
+        name = package.cover_image.name
+        package.refresh_from_db()
+        self.assertEqual(package.cover_image.name, name)
+        self.assertTrue(images.is_processed(package.cover_image))
+
+        image = self.open(name)
+        exif = image.getexif()
+        self.assertNotIn(ExifTags.Base.Orientation, exif)
+        self.assertNotIn(ExifTags.Base.Make, exif)
+        self.assertFalse(exif.get_ifd(ExifTags.IFD.GPSInfo))
+        # Turned upright: 300x200 sideways is 200x300, capped at 150 on the long side
+        self.assertEqual(image.size, (100, 150))
+        # The blue left half is now the top half
+        red, green, blue = image.getpixel((50, 10))
+        self.assertGreater(blue, red)
+
+        thumb = self.open(images.thumbnail_name(name))
+        self.assertEqual(max(thumb.size), 60)
+
+    def test_superseded_upload_is_left_alone(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            package = make_package(cover_image=_photo())
+        old_name = package.cover_image.name
+        Package.objects.filter(pk=package.pk).update(cover_image='packages/newer.jpg')
+
+        images.process('packages.Package', package.pk, 'cover_image', old_name)
+
+        package.refresh_from_db()
+        self.assertEqual(package.cover_image.name, 'packages/newer.jpg')
+        self.assertFalse(package.cover_image.storage.exists(images.thumbnail_name(old_name)))
+        # Untouched: still the sideways original
+        self.assertEqual(self.open(old_name).size, (300, 200))
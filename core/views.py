@@ -1,8 +1,12 @@
 # core/views.py
 from django.shortcuts import render, redirect
-from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib import messages
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.utils.crypto import constant_time_compare
+
+from . import instrumentation
+from .contact import submit as submit_contact
 
 def home(request):
     """Home page view"""
@@ -11,34 +15,47 @@ def home(request):
 def contact(request):
     """Contact page view"""
     if request.method == 'POST':
-        name = request.POST.get('name')
-        email = request.POST.get('email')
-        phone = request.POST.get('phone', '')
-        message = request.POST.get('message')
-        
-        # Send email to admin
-        subject = f'New Contact Message from {name}'
-        body = f"""
-        Name: {name}
-        Email: {email}
-        Phone: {phone}
-        Message: {message}
-        """
-        
-        try:
-            send_mail(
-                subject,
-                body,
-                settings.EMAIL_HOST_USER,
-                [settings.CONTACT_EMAIL],
-                fail_silently=False,
-            )
+        # Stored in the admin inbox; staff are emailed in the background (core.contact)
+        message, error = submit_contact(request, source='site')
+        if message:
             messages.success(request, 'Thank you for contacting us! We will get back to you soon.')
-            return redirect('contact')
-        except Exception as e:
-            messages.error(request, f'Failed to send message. Error: {str(e)}')
-            return redirect('contact')
+        else:
+            messages.error(request, error)
+        return redirect('contact')
     
     return render(request, 'core/contact.html')
 
-# Note: 'contact_view' નામ નથી, 'contact' છે
\ No newline at end of file
+# Note: 'contact_view' નામ નથી, 'contact' છે
+
+
+# ============ PERFORMANCE METRICS ============
+def _can_see_metrics(request):
+    """Staff users, or a scraper sending settings.PERF_METRICS_TOKEN as a bearer token"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'PERF_METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    return bool(token) and constant_time_compare(header, f"Bearer {token}")
+
+
+def perf_recent(request):
+    """Recent requests from the instrumentation ring buffer (JSON)"""
+    if not _can_see_metrics(request):
+        return HttpResponseForbidden("Staff only")
+
+    requests_data = instrumentation.snapshot()
+    view = request.GET.get('view')
+    if view:
+        requests_data = [r for r in requests_data if r['view'] == view]
+    min_queries = request.GET.get('min_queries')
+    if min_queries and min_queries.isdigit():
+        requests_data = [r for r in requests_data if r['sql_queries'] >= int(min_queries)]
+
+    return JsonResponse({'count': len(requests_data), 'requests': requests_data})
+
+
+def perf_metrics(request):
+    """Prometheus text exposition of per-view and per-provider totals"""
+    if not _can_see_metrics(request):
+        return HttpResponseForbidden("Staff only")
+    return HttpResponse(instrumentation.prometheus_text(), content_type='text/plain; version=0.0.4')
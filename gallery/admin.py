@@ -3,7 +3,8 @@ from django.contrib import admin
 # Register your models here.
 # gallery/admin.py
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db.models import Count
+from core import images
 from .models import GalleryCategory, GalleryImage, GalleryVideo
 
 @admin.register(GalleryCategory)
@@ -12,9 +13,13 @@ class GalleryCategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active',)
     search_fields = ('name', 'description')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(image_total=Count('images'))
+    
     def image_count(self, obj):
-        return obj.images.count()
+        return obj.image_total
     image_count.short_description = 'Images'
+    image_count.admin_order_field = 'image_total'
 
 
 @admin.register(GalleryImage)
@@ -23,18 +28,19 @@ class GalleryImageAdmin(admin.ModelAdmin):
     list_filter = ('image_type', 'is_active', 'category')
     search_fields = ('title', 'description')
     list_editable = ('is_active',)
+    list_select_related = ('category',)
     
     def thumbnail(self, obj):
-        if obj.image:
-            return format_html(
-                f'<img src="{obj.image.url}" style="width: 60px; height: 40px; object-fit: cover;" />'
-            )
-        return "-"
+        return images.preview(obj.image)
     thumbnail.short_description = 'Image'
 
 
 @admin.register(GalleryVideo)
 class GalleryVideoAdmin(admin.ModelAdmin):
-    list_display = ('title', 'youtube_url', 'is_active', 'created_at')
+    list_display = ('thumbnail_preview', 'title', 'youtube_url', 'is_active', 'created_at')
     list_filter = ('is_active',)
-    search_fields = ('title', 'description')
\ No newline at end of file
+    search_fields = ('title', 'description')
+    
+    def thumbnail_preview(self, obj):
+        return images.preview(obj.thumbnail)
+    thumbnail_preview.short_description = 'Thumbnail'
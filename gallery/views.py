@@ -18,8 +18,19 @@ def gallery(request):
 
 # gallery/views.py
 from django.shortcuts import render
+from django.db.models import Count, Max
+from core.http import conditional
+from core.routers import use_replica
 from .models import GalleryImage, GalleryVideo, GalleryCategory
 
+def _version(*models):
+    """Max(updated_at) and row count per model: moves on any add, edit or delete"""
+    def version(request):
+        return [model.objects.aggregate(Max('updated_at'), Count('id')) for model in models]
+    return version
+
+@use_replica
+@conditional(_version(GalleryImage, GalleryVideo, GalleryCategory))
 def gallery_view(request):
     images = GalleryImage.objects.filter(is_active=True).order_by('-created_at')[:12]
     videos = GalleryVideo.objects.filter(is_active=True).order_by('-created_at')[:6]
@@ -32,6 +43,8 @@ def gallery_view(request):
     }
     return render(request, 'gallery/gallery.html', context)
 
+@use_replica
+@conditional(_version(GalleryImage, GalleryCategory))
 def images_view(request):
     category_id = request.GET.get('category', None)
     
@@ -52,6 +65,8 @@ def images_view(request):
     }
     return render(request, 'gallery/images.html', context)
 
+@use_replica
+@conditional(_version(GalleryVideo))
 def videos_view(request):
     videos = GalleryVideo.objects.filter(is_active=True).order_by('-created_at')
     return render(request, 'gallery/videos.html', {'videos': videos})
\ No newline at end of file
@@ -1,12 +1,21 @@
 # packages/admin.py - COMPLETE FIXED VERSION
 
 from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.utils import timezone
 from django.utils.html import format_html
 from django.contrib import messages
 from django.urls import reverse
-from .models import Package, PackageBooking
-from datetime import datetime, date
+from django.core.management import call_command
+from core import audit, images
+from core.admin import TrashAdmin
+from core.notifications import render
+from core.tasks import enqueue
+from .models import ArchivedPackageBooking, DeletedPackageBooking, Package, PackageBooking, PricingRule
+from .notifications import SNAPSHOT_VALUES, snapshot
+from .utils import send_schedule_update
 import urllib.parse
 
 
@@ -20,7 +29,7 @@ class PackageAdminForm(forms.ModelForm):
         scheduled_date = self.cleaned_data.get('scheduled_date')
         if scheduled_date:
             # Check if date is not in the past
-            if scheduled_date < date.today():
+            if scheduled_date < timezone.localdate():
                 raise forms.ValidationError("Travel date cannot be in the past!")
         return scheduled_date
     
@@ -66,23 +75,25 @@ def delete_package_bookings(modeladmin, request, queryset):
     if count > 5:
         messages.warning(
             request, 
-            f"You are about to delete {count} package bookings. This action cannot be undone!"
+            f"Deleting {count} package bookings. They can be restored from Deleted Package Bookings (Trash)."
         )
     
-    deleted_count, _ = queryset.delete()
+    with audit.track(queryset, 'packages.delete_package_bookings', action='delete'):
+        deleted_count, _ = queryset.delete()
     messages.success(
         request, 
-        f"Successfully deleted {deleted_count} package booking(s)."
+        f"Moved {deleted_count} package booking(s) to the trash."
     )
 
 
 @admin.action(description="❌ Cancel selected package bookings")
 def cancel_package_bookings(modeladmin, request, queryset):
     """Cancel multiple package bookings"""
-    for booking in queryset:
-        booking.status = 'CANCELLED'
-        booking.payment_status = 'PENDING'
-        booking.save()
+    with audit.track(queryset, 'packages.cancel_package_bookings', fields=('status', 'payment_status')):
+        for booking in queryset:
+            booking.status = 'CANCELLED'
+            booking.payment_status = 'PENDING'
+            booking.save()
     
     count = queryset.count()
     messages.success(
@@ -91,58 +102,39 @@ def cancel_package_bookings(modeladmin, request, queryset):
     )
 
 
-# packages/admin.py - FIX THE send_package_whatsapp FUNCTION
-
-@admin.action(description="📱 Send WhatsApp for packages")
-# packages/admin.py - UPDATE THE send_package_whatsapp FUNCTION
-
 @admin.action(description="📱 Send WhatsApp for packages")
 def send_package_whatsapp(modeladmin, request, queryset):
     """Send WhatsApp message for package bookings"""
     
-    for booking in queryset:
-        package = booking.package
-        
-        # Use scheduled_date and scheduled_time
-        scheduled_date = booking.scheduled_date if booking.scheduled_date else "Will be confirmed"
-        
-        # Format time if exists
-        if booking.scheduled_time:
-            scheduled_time = booking.scheduled_time.strftime('%I:%M %p')
-        else:
-            scheduled_time = "Will be confirmed"
-        
-        msg = f"""Hello {booking.customer_name} 👋
-
-✨ **Package Booking Confirmed!** ✨
-
-📦 Package: {package.name}
-📋 Booking ID: {booking.invoice_no}
-📍 Route: {package.pickup_location} → {package.drop_location}
-📏 Distance: {package.distance_km} KM
-⏳ Duration: {package.duration_days} Day(s)
-🚗 Vehicle: {package.get_vehicle_type_display()}
-👥 Passengers: {booking.passengers_count}
-🗓 **Scheduled Date:** {scheduled_date}
-⏰ **Scheduled Time:** {scheduled_time}
-
-💰 Total Fare: ₹{booking.total_amount}
-💵 Advance Paid: ₹{booking.advance_paid}
-💳 Remaining: ₹{booking.remaining_amount}
-
-Thank you for choosing Pathan Travels! 🚗"""
-        
-        whatsapp_url = f"https://wa.me/91{booking.customer_phone}?text={urllib.parse.quote(msg)}"
+    # values() snapshots: one query, no package lookup per booking
+    for row in queryset.values(*SNAPSHOT_VALUES):
+        data = snapshot(row)
+        msg = render('package_confirmation', 'whatsapp', data)
+        whatsapp_url = f"https://wa.me/91{data['phone']}?text={urllib.parse.quote(msg)}"
         
         messages.info(
             request, 
             format_html(
-                f'WhatsApp for {booking.customer_name}: '
-                f'<a href="{whatsapp_url}" target="_blank" style="color: #25D366; font-weight: bold;">Click here</a>'
+                'WhatsApp for {}: '
+                '<a href="{}" target="_blank" style="color: #25D366; font-weight: bold;">Click here</a>',
+                data['name'], whatsapp_url,
             )
         )
 
 
+@admin.action(description="📢 Send schedule to booked customers")
+def broadcast_package_schedule(modeladmin, request, queryset):
+    """WhatsApp + email every open booking of the selected packages its current schedule, on the task workers"""
+    package_ids = list(queryset.values_list('pk', flat=True))
+    for package_id in package_ids:
+        enqueue(send_schedule_update, package_id)
+    messages.success(
+        request,
+        f"Schedule update queued for {len(package_ids)} package(s); "
+        f"failed sends are reported in the server log.",
+    )
+
+
 # ============ PACKAGE ADMIN ============
 @admin.register(Package)
 class PackageAdmin(admin.ModelAdmin):
@@ -169,6 +161,7 @@ class PackageAdmin(admin.ModelAdmin):
         'vehicle_type', 
         'is_active', 
         'is_festival_rate', 
+        'schedule_update_pending',
         'scheduled_date',
         'created_at',
     )
@@ -183,9 +176,16 @@ class PackageAdmin(admin.ModelAdmin):
     )
     
     list_per_page = 20
+    actions = [broadcast_package_schedule]
+    
+    def get_queryset(self, request):
+        # booking_count feeds package_actions_column without a query per row
+        return super().get_queryset(request).annotate(
+            booking_count=Count('bookings', filter=Q(bookings__deleted_at__isnull=True)),
+        )
     
     def get_readonly_fields(self, request, obj=None):
-        readonly = ['created_at', 'updated_at', 'package_delete_button', 'final_price_display',]
+        readonly = ['created_at', 'updated_at', 'package_delete_button', 'final_price_display', 'cover_image_preview']
         if obj:  # Editing an existing object
             return readonly + ['final_price_display']
         return readonly  # Creating a new object
@@ -206,10 +206,11 @@ class PackageAdmin(admin.ModelAdmin):
         }),
         ('Pricing', {
             'fields': ('base_price', 'advance_amount', 'is_festival_rate', 'final_price_display'),
-            'description': 'Base price will increase by 15% during festival rates'
+            'description': 'Final price = base price x the Pricing Calendar rules for the scheduled date '
+                           '(x the festival surcharge when "festival rate" is ticked)'
         }),
         ('Images', {
-            'fields': ('cover_image',),
+            'fields': ('cover_image', 'cover_image_preview'),
             'classes': ('collapse',)
         }),
         ('Inclusions & Exclusions', {
@@ -259,10 +260,18 @@ class PackageAdmin(admin.ModelAdmin):
         )
         
         # Image field help text
-        form.base_fields['cover_image'].help_text = "Recommended size: 800x400px"
+        form.base_fields['cover_image'].help_text = (
+            "Recommended size: 800x400px. Large photos are resized and cleaned up in the background."
+        )
         
         return form
     
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Package.save queued the notifications; just say so
+        if change and settings.PACKAGE_SCHEDULE_NOTIFY and set(Package.SCHEDULE_FIELDS) & set(form.changed_data):
+            messages.info(request, "Schedule changed: booked customers are being notified on WhatsApp and email.")
+    
     def route_display(self, obj):
         return f"{obj.pickup_location} → {obj.drop_location}"
     route_display.short_description = 'Route'
@@ -276,9 +285,14 @@ class PackageAdmin(admin.ModelAdmin):
     
     def final_price_display(self, obj):
         if obj.is_festival_rate:
-            return f"₹{int(obj.base_price * 1.15)} (Festival)"
-        return f"₹{obj.base_price}"
+            return f"₹{obj.final_price} (Festival)"
+        return f"₹{obj.final_price}"
     final_price_display.short_description = 'Final Price'
+    final_price_display.admin_order_field = 'final_price'
+    
+    def cover_image_preview(self, obj):
+        return images.preview(obj.cover_image, width=160, height=80)
+    cover_image_preview.short_description = 'Preview'
     
     def package_actions_column(self, obj):
         """Actions column in package list"""
@@ -286,7 +300,7 @@ class PackageAdmin(admin.ModelAdmin):
         delete_url = reverse('admin:packages_package_delete', args=[obj.id])
         
         # Check if package has any bookings
-        has_bookings = obj.bookings.exists()
+        has_bookings = obj.booking_count > 0
         
         if has_bookings:
             delete_button = format_html(
@@ -447,6 +461,14 @@ class PackageBookingAdmin(admin.ModelAdmin):
         send_package_whatsapp,
     ]
     
+    def delete_model(self, request, obj):
+        with audit.track(PackageBooking.objects.filter(pk=obj.pk), 'packages.admin_delete', action='delete'):
+            super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        with audit.track(queryset, 'packages.admin_delete_selected', action='delete'):
+            super().delete_queryset(request, queryset)
+    
     def get_scheduled_date(self, obj):
         if obj.package and obj.package.scheduled_date:
             return obj.package.scheduled_date
@@ -582,4 +604,90 @@ class PackageBookingAdmin(admin.ModelAdmin):
         extra_context['pending_bookings'] = PackageBooking.objects.filter(status='PENDING').count()
         return super().changelist_view(request, extra_context=extra_context)
     
-    change_list_template = "admin/packages/packagebooking/change_list.html"
\ No newline at end of file
+    change_list_template = "admin/packages/packagebooking/change_list.html"
+
+
+# ============ TRASH (soft-deleted, see core.softdelete) ============
+@admin.register(DeletedPackageBooking)
+class DeletedPackageBookingAdmin(TrashAdmin):
+    list_display = ('invoice_no', 'customer_name', 'customer_phone', 'package', 'total_amount', 'status', 'deleted_at')
+    list_filter = ('status', 'payment_status', 'deleted_at')
+    search_fields = ('invoice_no', 'customer_name', 'customer_phone', 'customer_email')
+    list_select_related = ('package',)
+
+
+# ============ ARCHIVED PACKAGE BOOKINGS (read-only, see archive_bookings) ============
+@admin.register(ArchivedPackageBooking)
+class ArchivedPackageBookingAdmin(admin.ModelAdmin):
+    list_display = (
+        'invoice_no',
+        'customer_name',
+        'customer_phone',
+        'package_name',
+        'total_amount',
+        'status',
+        'created_at',
+        'archived_at',
+    )
+    list_filter = ('status', 'payment_status', 'created_at')
+    search_fields = ('invoice_no', 'customer_name', 'customer_phone', 'customer_email', 'package_name')
+    date_hierarchy = 'created_at'
+    list_per_page = 50
+    # COUNT(*) over years of history is the slowest part of the page
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# ============ PRICING CALENDAR ADMIN ============
+@admin.register(PricingRule)
+class PricingRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'kind',
+        'start_date',
+        'end_date',
+        'multiplier',
+        'vehicle_type_display',
+        'weekdays_display',
+        'priority',
+        'is_active',
+    )
+    list_filter = ('kind', 'vehicle_type', 'is_active', 'start_date')
+    search_fields = ('name',)
+    list_editable = ('is_active',)
+    date_hierarchy = 'start_date'
+    actions = ['reprice_packages']
+    
+    def vehicle_type_display(self, obj):
+        return obj.get_vehicle_type_display() or 'All vehicles'
+    vehicle_type_display.short_description = 'Vehicle'
+    vehicle_type_display.admin_order_field = 'vehicle_type'
+    
+    def weekdays_display(self, obj):
+        days = sorted(obj.weekday_set)
+        return ', '.join(PricingRule.WEEKDAY_NAMES[day] for day in days if day < 7) or 'Every day'
+    weekdays_display.short_description = 'Days'
+    
+    def reprice_packages(self, request, queryset):
+        # The nightly job does the same; this applies rule edits soon, on a task worker
+        vehicle_types = set(queryset.values_list('vehicle_type', flat=True))
+        if {None, ''} & vehicle_types:
+            # A rule for all vehicles touches every package
+            enqueue(call_command, 'precompute_prices')
+            count = "all"
+        else:
+            package_ids = list(
+                Package.objects.filter(is_active=True, vehicle_type__in=vehicle_types).values_list('pk', flat=True)
+            )
+            if package_ids:
+                enqueue(call_command, 'precompute_prices', package=package_ids)
+            count = len(package_ids)
+        self.message_user(
+            request, f"Repricing queued for {count} package(s) affected by the selected rules.", messages.SUCCESS,
+        )
+    reprice_packages.short_description = "Recompute prices of the packages these rules affect"
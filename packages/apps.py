@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class PackagesConfig(AppConfig):
     name = 'packages'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .models import PricingRule
+        from .pricing import invalidate
+
+        post_save.connect(invalidate, sender=PricingRule, dispatch_uid='packages.pricing_saved')
+        post_delete.connect(invalidate, sender=PricingRule, dispatch_uid='packages.pricing_deleted')
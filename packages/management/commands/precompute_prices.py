@@ -0,0 +1,74 @@
+# packages/management/commands/precompute_prices.py
+"""
+Precompute package prices from the pricing calendar.
+
+    python manage.py precompute_prices               # next PRICE_PRECOMPUTE_DAYS days
+    python manage.py precompute_prices --days 90 --package 12
+
+Meant to run nightly (cron) and after editing pricing rules. For every
+active package it upserts one PackageDailyPrice row per day, drops rows
+for past dates, and refreshes Package.final_price (the price on the
+package's scheduled date, or today for unscheduled packages) so the
+catalog sorts and filters on current prices.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from packages.models import Package, PackageDailyPrice
+from packages.pricing import calendar, daily_prices
+
+
+class Command(BaseCommand):
+    help = "Precompute daily package prices from the pricing calendar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.PRICE_PRECOMPUTE_DAYS,
+                            help="Days ahead to price, starting today")
+        parser.add_argument('--package', type=int, action='append', help="Only this package id (repeatable)")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        today = timezone.localdate()
+        compiled = calendar()
+
+        packages = Package.objects.filter(is_active=True)
+        if options['package']:
+            packages = packages.filter(id__in=options['package'])
+
+        rows = changed = 0
+        for package in packages.iterator(chunk_size=500):
+            prices = [
+                PackageDailyPrice(package=package, date=day, price=price, multiplier=multiplier)
+                for day, price, multiplier in daily_prices(package, today, options['days'], compiled)
+            ]
+            old_price = package.final_price
+            package.refresh_computed_fields(compiled)
+            with transaction.atomic():
+                PackageDailyPrice.objects.filter(package=package, date__lt=today).delete()
+                PackageDailyPrice.objects.bulk_create(
+                    prices,
+                    batch_size=options['batch_size'],
+                    update_conflicts=True,
+                    unique_fields=['package', 'date'],
+                    update_fields=['price', 'multiplier'],
+                )
+                if package.final_price != old_price:
+                    # update(), not save(): just the price columns; updated_at moves
+                    # too, so page ETags (core.http) and exports see the new price
+                    Package.objects.filter(pk=package.pk).update(
+                        final_price=package.final_price, price_per_km=package.price_per_km,
+                        updated_at=timezone.now(),
+                    )
+                    changed += 1
+            rows += len(prices)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{rows} daily price(s) written, {changed} package price(s) changed "
+            f"({len(compiled.rules)} active rule(s), {time.perf_counter() - started:.1f}s)"
+        ))
@@ -0,0 +1,48 @@
+# packages/management/commands/send_schedule_updates.py
+"""
+Re-send schedule updates whose job was lost.
+
+A reschedule sets Package.schedule_update_pending and queues
+send_schedule_update on the in-memory task workers; the job clears the
+flag when done. A restart or deploy before the job ran leaves the flag set,
+and customers were never told. Run from cron, e.g. every 15 minutes:
+
+    python manage.py send_schedule_updates
+    python manage.py send_schedule_updates --dry-run
+
+Packages saved less than --min-age minutes ago are left to their own job.
+Updates are sent one package after another in this process, not on the
+task workers. A job lost half way through is sent again in full, so
+some customers may get the message twice.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from packages.models import Package
+from packages.utils import send_schedule_update
+
+
+class Command(BaseCommand):
+    help = "Send schedule updates still pending after their job should have run"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=10, help="Skip packages saved more recently (minutes)")
+        parser.add_argument('--dry-run', action='store_true', help="Only list what would be sent")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['min_age'])
+        pending = Package.objects.filter(schedule_update_pending=True, updated_at__lt=cutoff).order_by('pk')
+
+        for package_id, name in pending.values_list('pk', 'name'):
+            if options['dry_run']:
+                self.stdout.write(f"Would send: {name} (#{package_id})")
+                continue
+            bookings, whatsapp, emails = send_schedule_update(package_id)
+            self.stdout.write(
+                f"{name} (#{package_id}): {bookings} booking(s), {whatsapp} WhatsApp, {emails} email(s)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Done"))
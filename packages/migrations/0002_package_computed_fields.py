@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+def _split(text):
+    return [item.strip() for item in (text or '').split(',') if item.strip()]
+
+
+def backfill_computed_fields(apps, schema_editor):
+    """Same rules as Package.refresh_computed_fields (historical models have no methods)"""
+    Package = apps.get_model('packages', 'Package')
+    batch = []
+    for package in Package.objects.all().iterator(chunk_size=500):
+        package.final_price = int(package.base_price * 1.15) if package.is_festival_rate else package.base_price
+        package.price_per_km = round(package.final_price / package.distance_km, 2) if package.distance_km else 0
+        package.inclusion_list = _split(package.inclusions)
+        package.exclusion_list = _split(package.exclusions)
+        batch.append(package)
+        if len(batch) >= 500:
+            Package.objects.bulk_update(batch, ['final_price', 'price_per_km', 'inclusion_list', 'exclusion_list'])
+            batch = []
+    if batch:
+        Package.objects.bulk_update(batch, ['final_price', 'price_per_km', 'inclusion_list', 'exclusion_list'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='exclusion_list',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='final_price',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='inclusion_list',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='price_per_km',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_computed_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['is_active', 'final_price'], name='package_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['is_active', 'price_per_km'], name='package_active_per_km_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-19 18:25
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0002_package_computed_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('SEASON', 'Season'), ('FESTIVAL', 'Festival'), ('SURGE', 'Surge')], default='SEASON', max_length=20)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(help_text='Inclusive')),
+                ('multiplier', models.DecimalField(decimal_places=3, help_text='1.150 = 15% more, 0.900 = 10% off', max_digits=5, validators=[django.core.validators.MinValueValidator(0)])),
+                ('vehicle_type', models.CharField(blank=True, choices=[('SEDAN', 'Sedan (4-Seater)'), ('ERTIGA', 'ERTIGA (6-7 Seater)'), ('TEMPO', 'Tempo Traveler (12 Seater)'), ('BUS', 'Mini Bus (20-25 Seater)')], help_text='Blank applies to every vehicle', max_length=20)),
+                ('weekdays', models.CharField(blank=True, help_text='Only on these days, e.g. 5,6 for Sat/Sun (0 = Monday). Blank = every day', max_length=20)),
+                ('priority', models.IntegerField(default=0, help_text='Highest priority wins among overlapping rules of one kind')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pricing Rule',
+                'verbose_name_plural': 'Pricing Calendar',
+                'ordering': ['start_date', '-priority'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='package',
+            name='is_festival_rate',
+            field=models.BooleanField(default=False, help_text='Flat festival surcharge on every date (PACKAGE_FESTIVAL_MULTIPLIER). Prefer a dated Festival pricing rule.'),
+        ),
+        migrations.CreateModel(
+            name='PackageDailyPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('price', models.IntegerField()),
+                ('multiplier', models.FloatField(default=1)),
+                ('package', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_prices', to='packages.package')),
+            ],
+            options={
+                'ordering': ['package', 'date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='packagedailyprice',
+            index=models.Index(fields=['date', 'price'], name='package_daily_date_price_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='packagedailyprice',
+            constraint=models.UniqueConstraint(fields=('package', 'date'), name='package_daily_price_unique'),
+        ),
+    ]
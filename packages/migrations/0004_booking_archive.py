@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-19 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0003_pricing_calendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPackageBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('package_name', models.CharField(blank=True, max_length=200)),
+                ('customer_name', models.CharField(max_length=100)),
+                ('customer_phone', models.CharField(max_length=10)),
+                ('customer_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('passengers_count', models.IntegerField()),
+                ('special_requirements', models.TextField(blank=True)),
+                ('total_amount', models.IntegerField()),
+                ('advance_paid', models.IntegerField()),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=200, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('CONFIRMED', 'Confirmed'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('payment_status', models.CharField(choices=[('PENDING', 'Pending'), ('ADVANCE_PAID', 'Advance Paid'), ('FULLY_PAID', 'Fully Paid')], max_length=20)),
+                ('invoice_no', models.CharField(blank=True, db_index=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Archived Package Booking',
+                'verbose_name_plural': 'Archived Package Bookings',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='packagebooking',
+            index=models.Index(fields=['status', 'created_at'], name='pkg_booking_status_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedpackagebooking',
+            name='package',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_bookings', to='packages.package'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedpackagebooking',
+            index=models.Index(fields=['created_at'], name='archived_pkg_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedpackagebooking',
+            index=models.Index(fields=['customer_phone'], name='archived_pkg_phone_idx'),
+        ),
+    ]
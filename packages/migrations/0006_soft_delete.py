@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0005_alter_packagebooking_razorpay_order_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedPackageBooking',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Deleted Package Booking',
+                'verbose_name_plural': 'Deleted Package Bookings (Trash)',
+                'ordering': ['-deleted_at'],
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('packages.packagebooking',),
+        ),
+        migrations.RemoveIndex(
+            model_name='packagebooking',
+            name='pkg_booking_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='packagebooking',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='packagebooking',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', 'created_at'], name='pkg_booking_live_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='packagebooking',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='pkg_booking_trash_idx'),
+        ),
+    ]
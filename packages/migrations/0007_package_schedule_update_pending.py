@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0006_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='schedule_update_pending',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -1,10 +1,12 @@
 # packages/models.py - COMPLETE FIXED VERSION
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
-from datetime import date
+
+from core.softdelete import SoftDeleteModel, TrashManager
 
 
 class TravelPackage(models.Model):
@@ -64,7 +66,11 @@ class Package(models.Model):
     # Pricing
     base_price = models.IntegerField()
     advance_amount = models.IntegerField(default=1000)
-    is_festival_rate = models.BooleanField(default=False)
+    is_festival_rate = models.BooleanField(
+        default=False,
+        help_text="Flat festival surcharge on every date (PACKAGE_FESTIVAL_MULTIPLIER). "
+                  "Prefer a dated Festival pricing rule.",
+    )
     
     # Images
     cover_image = models.ImageField(upload_to='packages/', blank=True, null=True)
@@ -76,19 +82,83 @@ class Package(models.Model):
     # Important Notes
     important_notes = models.TextField(blank=True)
     
+    # ✅ COMPUTED ON SAVE (see refresh_computed_fields) - lets the catalog sort/filter in SQL
+    final_price = models.IntegerField(default=0, editable=False)
+    price_per_km = models.FloatField(default=0, editable=False)
+    inclusion_list = models.JSONField(default=list, blank=True, editable=False)
+    exclusion_list = models.JSONField(default=list, blank=True, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Set when the schedule changes, cleared once send_schedule_update has told the customers;
+    # still set long after means the job was lost (manage.py send_schedule_updates re-runs it)
+    schedule_update_pending = models.BooleanField(default=False, editable=False)
+    
+    COMPUTED_FIELDS = ('final_price', 'price_per_km', 'inclusion_list', 'exclusion_list')
+    SCHEDULE_FIELDS = ('scheduled_date', 'scheduled_time')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The schedule as loaded, so save() can tell customers when it changes
+        instance._loaded_schedule = instance._schedule_values()
+        return instance
+    
+    def _schedule_values(self):
+        """(scheduled_date, scheduled_time), or None if either field was deferred"""
+        if any(name not in self.__dict__ for name in self.SCHEDULE_FIELDS):
+            return None
+        return (self.scheduled_date, self.scheduled_time)
     
     def __str__(self):
         return f"{self.name} ({self.pickup_location} to {self.drop_location})"
     
+    @staticmethod
+    def split_list(text):
+        """'Fuel, Toll,  Driver' -> ['Fuel', 'Toll', 'Driver']"""
+        return [item.strip() for item in (text or '').split(',') if item.strip()]
+    
     @property
-    def final_price(self):
-        if self.is_festival_rate:
-            return int(self.base_price * 1.15)
-        return self.base_price
+    def price_date(self):
+        """The date final_price is quoted for"""
+        return self.scheduled_date or timezone.localdate()
+    
+    def refresh_computed_fields(self, calendar=None):
+        """calendar: a compiled packages.pricing.PricingCalendar (default: the live rules)"""
+        from .pricing import calendar as live_calendar
+        
+        self.final_price, _ = (calendar or live_calendar()).package_price(self, self.price_date)
+        self.price_per_km = round(self.final_price / self.distance_km, 2) if self.distance_km else 0
+        self.inclusion_list = self.split_list(self.inclusions)
+        self.exclusion_list = self.split_list(self.exclusions)
+    
+    def save(self, *args, **kwargs):
+        self.refresh_computed_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.COMPUTED_FIELDS)
+        
+        loaded = getattr(self, '_loaded_schedule', None)
+        schedule = self._schedule_values()
+        saves_schedule = update_fields is None or not set(self.SCHEDULE_FIELDS).isdisjoint(update_fields)
+        schedule_changed = saves_schedule and loaded is not None and schedule != loaded
+        notify = schedule_changed and settings.PACKAGE_SCHEDULE_NOTIFY
+        if notify:
+            self.schedule_update_pending = True
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'schedule_update_pending'}
+        super().save(*args, **kwargs)
+        if saves_schedule:
+            self._loaded_schedule = schedule
+        
+        if notify:
+            from core.tasks import enqueue
+            from .utils import send_schedule_update
+            
+            # After commit, on a worker: hundreds of messages must not hold up the admin save
+            transaction.on_commit(lambda: enqueue(send_schedule_update, self.pk, schedule))
     
     @property
     def remaining_amount(self):
@@ -104,16 +174,94 @@ class Package(models.Model):
     # ✅ ADD CUSTOM VALIDATION METHOD
     def clean(self):
         super().clean()
-        if self.scheduled_date and self.scheduled_date < date.today():
+        if self.scheduled_date and self.scheduled_date < timezone.localdate():
             raise ValidationError({'scheduled_date': 'Date must be today or in the future.'})
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Package'
         verbose_name_plural = 'Packages'
+        indexes = [
+            # Catalog: active packages filtered/sorted by price
+            models.Index(fields=['is_active', 'final_price'], name='package_active_price_idx'),
+            models.Index(fields=['is_active', 'price_per_km'], name='package_active_per_km_idx'),
+        ]
+
+
+class PricingRule(models.Model):
+    """A price multiplier for a date range, compiled by packages.pricing"""
+    KIND_CHOICES = [
+        ('SEASON', 'Season'),
+        ('FESTIVAL', 'Festival'),
+        ('SURGE', 'Surge'),
+    ]
+    
+    WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='SEASON')
+    start_date = models.DateField()
+    end_date = models.DateField(help_text="Inclusive")
+    multiplier = models.DecimalField(
+        max_digits=5, decimal_places=3, validators=[MinValueValidator(0)],
+        help_text="1.150 = 15% more, 0.900 = 10% off",
+    )
+    vehicle_type = models.CharField(
+        max_length=20, choices=Package.VEHICLE_TYPES, blank=True,
+        help_text="Blank applies to every vehicle",
+    )
+    weekdays = models.CharField(
+        max_length=20, blank=True,
+        help_text="Only on these days, e.g. 5,6 for Sat/Sun (0 = Monday). Blank = every day",
+    )
+    priority = models.IntegerField(default=0, help_text="Highest priority wins among overlapping rules of one kind")
+    is_active = models.BooleanField(default=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.start_date} - {self.end_date}, x{self.multiplier})"
+    
+    @property
+    def weekday_set(self):
+        return {int(day) for day in self.weekdays.split(',') if day.strip().isdigit()}
+    
+    def clean(self):
+        super().clean()
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValidationError({'end_date': 'End date must be on or after the start date.'})
+        if any(day > 6 for day in self.weekday_set) or (self.weekdays and not self.weekday_set):
+            raise ValidationError({'weekdays': 'Use comma separated numbers 0-6 (0 = Monday).'})
+    
+    class Meta:
+        ordering = ['start_date', '-priority']
+        verbose_name = 'Pricing Rule'
+        verbose_name_plural = 'Pricing Calendar'
+
+
+class PackageDailyPrice(models.Model):
+    """Precomputed price of a package per travel date (manage.py precompute_prices)"""
+    package = models.ForeignKey(Package, on_delete=models.CASCADE, related_name='daily_prices')
+    date = models.DateField()
+    price = models.IntegerField()
+    multiplier = models.FloatField(default=1)
+    
+    def __str__(self):
+        return f"{self.package_id} {self.date}: {self.price}"
+    
+    class Meta:
+        ordering = ['package', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['package', 'date'], name='package_daily_price_unique'),
+        ]
+        indexes = [
+            # Catalog quoted for a travel date: filter/sort by that day's price
+            models.Index(fields=['date', 'price'], name='package_daily_date_price_idx'),
+        ]
 
 
-class PackageBooking(models.Model):
+class PackageBooking(SoftDeleteModel):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('CONFIRMED', 'Confirmed'),
@@ -142,7 +290,7 @@ class PackageBooking(models.Model):
     # Payment Details
     total_amount = models.IntegerField()
     advance_paid = models.IntegerField(default=1000)
-    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
     razorpay_signature = models.CharField(max_length=200, blank=True, null=True)
     
@@ -160,7 +308,8 @@ class PackageBooking(models.Model):
     def save(self, *args, **kwargs):
         if not self.invoice_no:
             date_str = timezone.now().strftime("%Y%m%d")
-            last_booking = PackageBooking.objects.filter(
+            # Trashed bookings keep their numbers (invoice_no is unique)
+            last_booking = PackageBooking.all_objects.filter(
                 invoice_no__contains=f"PTP-{date_str}"
             ).order_by('-id').first()
             
@@ -224,4 +373,72 @@ class PackageBooking(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Package Booking'
-        verbose_name_plural = 'Package Bookings'
\ No newline at end of file
+        verbose_name_plural = 'Package Bookings'
+        indexes = [
+            # Admin lists and the archive/expiry jobs: status + age, live rows only
+            models.Index(
+                fields=['status', 'created_at'], name='pkg_booking_live_status_idx',
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Trash view and purge_deleted_bookings
+            models.Index(
+                fields=['deleted_at'], name='pkg_booking_trash_idx',
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
+
+
+class DeletedPackageBooking(PackageBooking):
+    """Package bookings in the trash (soft-deleted), for the admin trash view"""
+    objects = TrashManager()
+    
+    class Meta:
+        proxy = True
+        ordering = ['-deleted_at']
+        verbose_name = 'Deleted Package Booking'
+        verbose_name_plural = 'Deleted Package Bookings (Trash)'
+
+
+class ArchivedPackageBooking(models.Model):
+    """
+    Completed/cancelled package bookings moved out of PackageBooking by
+    archive_bookings. Same columns and id as the original row, plus the
+    package name at archive time in case the package is deleted later.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    package = models.ForeignKey(
+        Package, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_bookings',
+    )
+    package_name = models.CharField(max_length=200, blank=True)
+    customer_name = models.CharField(max_length=100)
+    customer_phone = models.CharField(max_length=10)
+    customer_email = models.EmailField(blank=True, null=True)
+    passengers_count = models.IntegerField()
+    special_requirements = models.TextField(blank=True)
+    total_amount = models.IntegerField()
+    advance_paid = models.IntegerField()
+    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
+    razorpay_signature = models.CharField(max_length=200, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=PackageBooking.STATUS_CHOICES)
+    payment_status = models.CharField(max_length=20, choices=PackageBooking.PAYMENT_STATUS_CHOICES)
+    invoice_no = models.CharField(max_length=20, blank=True, null=True, db_index=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    
+    @property
+    def remaining_amount(self):
+        return self.total_amount - self.advance_paid
+    
+    def __str__(self):
+        return f"{self.invoice_no} - {self.customer_name} - {self.package_name} (archived)"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Package Booking'
+        verbose_name_plural = 'Archived Package Bookings'
+        indexes = [
+            models.Index(fields=['created_at'], name='archived_pkg_created_idx'),
+            models.Index(fields=['customer_phone'], name='archived_pkg_phone_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,317 @@
+# packages/notifications.py
+"""Notification templates and snapshots for package bookings (see core.notifications)"""
+
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+
+from core.notifications import register
+
+from .models import Package
+
+# Columns a snapshot needs, package included: PackageBooking.objects.values(*SNAPSHOT_VALUES)
+SNAPSHOT_VALUES = (
+    'id', 'customer_name', 'customer_phone', 'customer_email', 'invoice_no', 'passengers_count',
+    'total_amount', 'advance_paid', 'special_requirements',
+    'package__name', 'package__pickup_location', 'package__drop_location', 'package__distance_km',
+    'package__duration_days', 'package__vehicle_type', 'package__scheduled_date',
+    'package__scheduled_time', 'package__inclusions', 'package__important_notes',
+)
+
+FIELDS = (
+    'id', 'name', 'phone', 'email', 'invoice_no', 'package', 'pickup', 'drop', 'distance_km',
+    'duration_days', 'vehicle', 'passengers', 'scheduled_date', 'scheduled_time', 'total', 'advance',
+    'remaining', 'inclusions', 'important_notes', 'special_requirements', 'invoice_url',
+)
+
+VEHICLE_NAMES = dict(Package.VEHICLE_TYPES)
+
+
+_from_instance = attrgetter(*(name.replace('__', '.') for name in SNAPSHOT_VALUES))
+_from_row = itemgetter(*SNAPSHOT_VALUES)
+
+
+def snapshot(booking):
+    """Display strings of a PackageBooking (with its package) or a .values(*SNAPSHOT_VALUES) row"""
+    (pk, name, phone, email, invoice_no, passengers, total, advance, special_requirements,
+     package, pickup, drop, distance_km, duration_days, vehicle_type, scheduled_date,
+     scheduled_time, inclusions, important_notes) = (
+        _from_row(booking) if isinstance(booking, dict) else _from_instance(booking)
+    )
+    return {
+        'id': str(pk),
+        'name': name,
+        'phone': phone,
+        'email': email or '',
+        'invoice_no': invoice_no or 'N/A',
+        'package': package,
+        'pickup': pickup,
+        'drop': drop,
+        'distance_km': str(distance_km),
+        'duration_days': str(duration_days),
+        'vehicle': VEHICLE_NAMES.get(vehicle_type, vehicle_type),
+        'passengers': str(passengers),
+        'scheduled_date': str(scheduled_date) if scheduled_date else '',
+        'scheduled_time': scheduled_time.strftime('%I:%M %p') if scheduled_time else '',
+        'total': str(total),
+        'advance': str(advance),
+        'remaining': str(total - advance),
+        'inclusions': inclusions,
+        'important_notes': important_notes,
+        'special_requirements': special_requirements,
+        'invoice_url': f"{settings.SITE_URL}/packages/invoice/{pk}/",
+    }
+
+
+# ============ ENGLISH ============
+register('package_confirmation', 'whatsapp', fields=FIELDS, body="""\
+Hello {name} 👋
+
+✨ **Package Booking Confirmed!** ✨
+
+📦 Package: {package}
+📋 Booking ID: {invoice_no}
+📍 Route: {pickup} → {drop}
+📏 Distance: {distance_km} KM
+⏳ Duration: {duration_days} Day(s)
+🚗 Vehicle: {vehicle}
+👥 Passengers: {passengers}
+🗓 Scheduled Date: {scheduled_date:Will be confirmed}
+⏰ Scheduled Time: {scheduled_time:Will be confirmed}
+
+💰 Total Fare: ₹{total}
+💵 Advance Paid: ₹{advance}
+💳 Remaining: ₹{remaining}
+
+📄 Invoice Download: {invoice_url}
+
+✅ **Package Inclusions:**
+{inclusions}
+
+📝 **Important Notes:**
+{important_notes}
+
+Thank you for choosing Pathan Travels! 🚗
+Need help? Call: 9879230065""")
+
+register('package_confirmation', 'share', fields=FIELDS, body="""\
+Hello {name} 👋
+
+Package Booking Confirmed! ✅
+
+📦 Package: {package}
+📋 Booking ID: {invoice_no}
+📍 Route: {pickup} → {drop}
+📏 Distance: {distance_km} KM
+⏳ Duration: {duration_days} Day(s)
+🚗 Vehicle: {vehicle}
+👥 Passengers: {passengers}
+🗓 Scheduled Date: {scheduled_date:Will be confirmed}
+⏰ Scheduled Time: {scheduled_time:Will be confirmed}
+
+💰 Total Fare: ₹{total}
+💵 Advance Paid: ₹{advance}
+💳 Remaining: ₹{remaining}
+
+📄 Invoice: {invoice_url}""")
+
+register('package_confirmation', 'email', fields=FIELDS, subject="Package Booking Confirmed - {invoice_no}", body="""\
+Dear {name},
+
+Your package tour has been confirmed successfully!
+
+**Booking Details:**
+Booking ID: {invoice_no}
+Package: {package}
+Route: {pickup} to {drop}
+Distance: {distance_km} KM
+Duration: {duration_days} Day(s)
+Vehicle: {vehicle}
+Passengers: {passengers}
+Scheduled Date: {scheduled_date:Will be confirmed by admin}
+Scheduled Time: {scheduled_time:Will be confirmed by admin}
+
+**Payment Summary:**
+Total Fare: ₹{total}
+Advance Paid: ₹{advance}
+Remaining Amount: ₹{remaining}
+
+**Package Inclusions:**
+{inclusions}
+
+**Important Notes:**
+{important_notes}
+
+**Special Requirements:**
+{special_requirements:None}
+
+For any queries, please contact us at 9879230065.
+
+Thank you for choosing Pathan Tours & Travels!
+
+Best regards,
+Pathan Tours Team
+""")
+
+register('package_confirmation', 'sms', fields=FIELDS, body=(
+    "Pathan Travels: package booking {invoice_no} ({package}) confirmed for "
+    "{scheduled_date:date TBC}. Paid Rs.{advance}, balance Rs.{remaining}. "
+    "Invoice: {invoice_url}"
+))
+
+register('package_schedule', 'whatsapp', fields=FIELDS, body="""\
+Hello {name} 👋
+
+Schedule update for your package 🗓
+
+📦 Package: {package}
+📋 Booking ID: {invoice_no}
+📍 Route: {pickup} → {drop}
+🗓 Scheduled Date: {scheduled_date:Will be confirmed}
+⏰ Scheduled Time: {scheduled_time:Will be confirmed}
+
+Need help? Call: 9879230065""")
+
+register('package_schedule', 'email', fields=FIELDS, subject="Schedule Update - {package} ({invoice_no})", body="""\
+Dear {name},
+
+The schedule of your package tour has been updated.
+
+Booking ID: {invoice_no}
+Package: {package}
+Route: {pickup} to {drop}
+Scheduled Date: {scheduled_date:Will be confirmed by admin}
+Scheduled Time: {scheduled_time:Will be confirmed by admin}
+
+For any queries, please contact us at 9879230065.
+
+Best regards,
+Pathan Tours Team
+""")
+
+register('package_schedule', 'sms', fields=FIELDS, body=(
+    "Pathan Travels: {package} ({invoice_no}) is now scheduled for "
+    "{scheduled_date:date TBC}. Call 9879230065 for help."
+))
+
+
+# ============ ગુજરાતી ============
+register('package_confirmation', 'whatsapp', language='gu', fields=FIELDS, body="""\
+નમસ્તે {name} 👋
+
+✨ **પેકેજ બુકિંગ કન્ફર્મ!** ✨
+
+📦 પેકેજ: {package}
+📋 બુકિંગ ID: {invoice_no}
+📍 રૂટ: {pickup} → {drop}
+📏 અંતર: {distance_km} KM
+⏳ સમયગાળો: {duration_days} દિવસ
+🚗 વાહન: {vehicle}
+👥 મુસાફરો: {passengers}
+🗓 તારીખ: {scheduled_date:ટૂંક સમયમાં જણાવીશું}
+⏰ સમય: {scheduled_time:ટૂંક સમયમાં જણાવીશું}
+
+💰 કુલ ભાડું: ₹{total}
+💵 ચૂકવેલ એડવાન્સ: ₹{advance}
+💳 બાકી રકમ: ₹{remaining}
+
+📄 ઇન્વૉઇસ ડાઉનલોડ: {invoice_url}
+
+✅ **પેકેજમાં સામેલ:**
+{inclusions}
+
+📝 **મહત્વની સૂચનાઓ:**
+{important_notes}
+
+પઠાણ ટ્રાવેલ્સ પસંદ કરવા બદલ આભાર! 🚗
+મદદ માટે કૉલ કરો: 9879230065""")
+
+register('package_confirmation', 'share', language='gu', fields=FIELDS, body="""\
+નમસ્તે {name} 👋
+
+પેકેજ બુકિંગ કન્ફર્મ! ✅
+
+📦 પેકેજ: {package}
+📋 બુકિંગ ID: {invoice_no}
+📍 રૂટ: {pickup} → {drop}
+🗓 તારીખ: {scheduled_date:ટૂંક સમયમાં જણાવીશું}
+⏰ સમય: {scheduled_time:ટૂંક સમયમાં જણાવીશું}
+
+💰 કુલ ભાડું: ₹{total}
+💳 બાકી રકમ: ₹{remaining}
+
+📄 ઇન્વૉઇસ: {invoice_url}""")
+
+register('package_confirmation', 'email', language='gu', fields=FIELDS,
+         subject="પેકેજ બુકિંગ કન્ફર્મ - {invoice_no}", body="""\
+પ્રિય {name},
+
+તમારી પેકેજ ટૂર સફળતાપૂર્વક કન્ફર્મ થઈ ગઈ છે!
+
+બુકિંગ ID: {invoice_no}
+પેકેજ: {package}
+રૂટ: {pickup} થી {drop}
+અંતર: {distance_km} KM
+સમયગાળો: {duration_days} દિવસ
+વાહન: {vehicle}
+મુસાફરો: {passengers}
+તારીખ: {scheduled_date:એડમિન દ્વારા જણાવવામાં આવશે}
+સમય: {scheduled_time:એડમિન દ્વારા જણાવવામાં આવશે}
+
+કુલ ભાડું: ₹{total}
+ચૂકવેલ એડવાન્સ: ₹{advance}
+બાકી રકમ: ₹{remaining}
+
+પેકેજમાં સામેલ:
+{inclusions}
+
+મહત્વની સૂચનાઓ:
+{important_notes}
+
+ખાસ જરૂરિયાતો:
+{special_requirements:કોઈ નહીં}
+
+કોઈપણ પ્રશ્ન માટે 9879230065 પર સંપર્ક કરો.
+
+પઠાણ ટુર્સ એન્ડ ટ્રાવેલ્સ
+""")
+
+register('package_confirmation', 'sms', language='gu', fields=FIELDS, body=(
+    "પઠાણ ટ્રાવેલ્સ: પેકેજ બુકિંગ {invoice_no} ({package}) કન્ફર્મ, "
+    "{scheduled_date:તારીખ બાકી}. બાકી ₹{remaining}. ઇન્વૉઇસ: {invoice_url}"
+))
+
+register('package_schedule', 'whatsapp', language='gu', fields=FIELDS, body="""\
+નમસ્તે {name} 👋
+
+તમારા પેકેજના સમયપત્રકમાં ફેરફાર 🗓
+
+📦 પેકેજ: {package}
+📋 બુકિંગ ID: {invoice_no}
+📍 રૂટ: {pickup} → {drop}
+🗓 તારીખ: {scheduled_date:ટૂંક સમયમાં જણાવીશું}
+⏰ સમય: {scheduled_time:ટૂંક સમયમાં જણાવીશું}
+
+મદદ માટે કૉલ કરો: 9879230065""")
+
+register('package_schedule', 'email', language='gu', fields=FIELDS,
+         subject="સમયપત્રકમાં ફેરફાર - {package} ({invoice_no})", body="""\
+પ્રિય {name},
+
+તમારી પેકેજ ટૂરના સમયપત્રકમાં ફેરફાર થયો છે.
+
+બુકિંગ ID: {invoice_no}
+પેકેજ: {package}
+રૂટ: {pickup} થી {drop}
+તારીખ: {scheduled_date:એડમિન દ્વારા જણાવવામાં આવશે}
+સમય: {scheduled_time:એડમિન દ્વારા જણાવવામાં આવશે}
+
+કોઈપણ પ્રશ્ન માટે 9879230065 પર સંપર્ક કરો.
+
+પઠાણ ટુર્સ એન્ડ ટ્રાવેલ્સ
+""")
+
+register('package_schedule', 'sms', language='gu', fields=FIELDS, body=(
+    "પઠાણ ટ્રાવેલ્સ: {package} ({invoice_no}) હવે {scheduled_date:તારીખ બાકી} ના રોજ છે. "
+    "મદદ: 9879230065"
+))
@@ -0,0 +1,174 @@
+# packages/pricing.py
+"""
+Pricing calendar: seasonal, festival and surge rules for package prices.
+
+Active PricingRule rows are compiled once per process into a centred
+interval tree over their date ranges, so finding the rules that cover a
+date is O(log n + matches) however many rules there are. The compiled
+calendar is rebuilt when a rule is saved or deleted: with a shared cache
+(settings.SHARED_CACHE) a version number there is bumped and every process
+picks it up; with the per-process locmem cache the version is read from
+the rules table itself (latest updated_at and row count, one small query),
+so no worker keeps pricing with stale rules.
+
+Within one kind (season, festival, surge) the highest priority rule wins,
+vehicle specific rules before "all vehicles" on a tie; the winners of the
+different kinds are multiplied together:
+
+    price = base_price x season x festival x surge [x legacy festival flag]
+
+Package prices for the next year are precomputed nightly
+(manage.py precompute_prices) into PackageDailyPrice, and Package.final_price
+holds the price on the package's scheduled date, so listing and booking
+pages read stored prices instead of evaluating rules per request.
+"""
+
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+VERSION_KEY = 'pricing:calendar-version'
+
+
+# ============ INTERVAL TREE ============
+class IntervalTree:
+    """
+    Static centred interval tree over closed integer intervals.
+
+    Each node keeps the intervals that contain its centre point twice,
+    sorted by start and by end, so a point query only walks one path from
+    the root and stops scanning a node's list at the first miss.
+    """
+
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, intervals):
+        """intervals: [(start, end, value)] with start <= end"""
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        self.center = points[len(points) // 2] if points else 0
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda i: i[0])
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def query(self, point):
+        """Values of every interval containing `point`"""
+        found = []
+        node = self
+        while node is not None:
+            if point < node.center:
+                for start, _, value in node.by_start:
+                    if start > point:
+                        break
+                    found.append(value)
+                node = node.left
+            elif point > node.center:
+                for _, end, value in node.by_end:
+                    if end < point:
+                        break
+                    found.append(value)
+                node = node.right
+            else:
+                found.extend(value for _, _, value in node.by_start)
+                break
+        return found
+
+
+# ============ CALENDAR ============
+class PricingCalendar:
+    """Compiled, read-only view of the pricing rules"""
+
+    def __init__(self, rules):
+        """rules: PricingRule instances (or anything with the same attributes)"""
+        self.rules = list(rules)
+        self.tree = IntervalTree([
+            (rule.start_date.toordinal(), rule.end_date.toordinal(), rule)
+            for rule in self.rules
+            if rule.start_date <= rule.end_date
+        ])
+
+    def matching_rules(self, day, vehicle_type=None):
+        """Rules that apply on `day`: one per kind, best first"""
+        weekday = day.weekday()
+        best = {}
+        for rule in self.tree.query(day.toordinal()):
+            if rule.vehicle_type and rule.vehicle_type != vehicle_type:
+                continue
+            if rule.weekdays and weekday not in rule.weekday_set:
+                continue
+            rank = (rule.priority, bool(rule.vehicle_type), rule.start_date, rule.pk or 0)
+            current = best.get(rule.kind)
+            if current is None or rank > current[0]:
+                best[rule.kind] = (rank, rule)
+        return [rule for _, rule in sorted(best.values(), key=lambda item: item[0], reverse=True)]
+
+    def multiplier(self, day, vehicle_type=None):
+        result = 1.0
+        for rule in self.matching_rules(day, vehicle_type):
+            result *= float(rule.multiplier)
+        return result
+
+    def package_price(self, package, day):
+        """(price, multiplier) for a package travelling on `day`"""
+        multiplier = self.multiplier(day, package.vehicle_type)
+        if package.is_festival_rate:
+            multiplier *= settings.PACKAGE_FESTIVAL_MULTIPLIER
+        return int(package.base_price * multiplier), round(multiplier, 4)
+
+
+_lock = threading.Lock()
+_compiled = {'version': None, 'calendar': None}
+
+
+def invalidate(**kwargs):
+    """Signal receiver: a rule changed, every process rebuilds on next use"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def _version():
+    if settings.SHARED_CACHE:
+        return cache.get(VERSION_KEY, 0)
+    from .models import PricingRule
+
+    # Another worker's invalidate() only reached its own cache; ask the table
+    return tuple(PricingRule.objects.aggregate(Max('updated_at'), Count('id')).values())
+
+
+def calendar():
+    """The compiled calendar for the current rule set"""
+    from .models import PricingRule
+
+    version = _version()
+    if _compiled['calendar'] is None or _compiled['version'] != version:
+        with _lock:
+            if _compiled['calendar'] is None or _compiled['version'] != version:
+                _compiled['calendar'] = PricingCalendar(PricingRule.objects.filter(is_active=True))
+                _compiled['version'] = version
+    return _compiled['calendar']
+
+
+def multiplier_for(day, vehicle_type=None):
+    return calendar().multiplier(day, vehicle_type)
+
+
+def daily_prices(package, start, days, calendar_=None):
+    """[(date, price, multiplier)] for `days` days from `start`"""
+    calendar_ = calendar_ or calendar()
+    return [
+        (day, *calendar_.package_price(package, day))
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    ]
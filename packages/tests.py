@@ -1,3 +1,157 @@
-from django.test import TestCase
+# packages/tests.py
+import random
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.benchmark import make_package, make_package_booking
+
+from .models import Package, PricingRule
+from .pricing import IntervalTree, PricingCalendar
+from .utils import send_schedule_update
+
+
+@override_settings(TASKS_EAGER=True, PACKAGE_SCHEDULE_NOTIFY=True)
+class ScheduleUpdateTests(TestCase):
+    """Package.save queues send_schedule_update when the schedule moves; the pending flag tracks it"""
+
+    def setUp(self):
+        self.package = make_package()
+        make_package_booking(self.package, 0)
+        make_package_booking(self.package, 1, status='CANCELLED')
+        self.package = Package.objects.get(pk=self.package.pk)
+        patcher = mock.patch('packages.utils.send_many', side_effect=lambda messages: ['sid'] * len(messages))
+        self.send_many = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('packages.utils.send_bulk', side_effect=len)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pending(self):
+        return Package.objects.filter(pk=self.package.pk).values_list('schedule_update_pending', flat=True).get()
+
+    def test_other_changes_send_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.package.name = "Renamed"
+            self.package.save()
+            self.package.save(update_fields=['name'])
+        self.assertEqual(callbacks, [])
+        self.assertFalse(self.pending())
+
+    def test_reschedule_notifies_open_bookings(self):
+        self.package.scheduled_date += timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.package.save(update_fields=['scheduled_date'])
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(self.pending())
+
+        callbacks[0]()
+        self.assertEqual(self.send_many.call_count, 1)
+        self.assertEqual(len(self.send_many.call_args.args[0]), 1)
+        self.assertFalse(self.pending())
+
+    def test_job_for_an_older_schedule_sends_nothing(self):
+        old_schedule = (self.package.scheduled_date, self.package.scheduled_time)
+        self.package.scheduled_date += timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=False):
+            self.package.save()
+
+        self.assertEqual(send_schedule_update(self.package.pk, old_schedule), (0, 0, 0))
+        self.send_many.assert_not_called()
+        # Still pending: the newer save's job (or the sweep) sends the current schedule
+        self.assertTrue(self.pending())
+
+    def test_sweep_sends_lost_updates(self):
+        self.package.scheduled_date += timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=False):
+            self.package.save()
+        # The job never ran (process restarted)
+        call_command('send_schedule_updates', min_age=0, stdout=StringIO())
+
+        self.assertEqual(self.send_many.call_count, 1)
+        self.assertFalse(self.pending())
+
+
+class IntervalTreeTests(SimpleTestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for n in range(200):
+            start = rng.randint(0, 1000)
+            intervals.append((start, start + rng.randint(0, 60), n))
+        tree = IntervalTree(intervals)
+        for point in range(-5, 1070):
+            expected = sorted(value for start, end, value in intervals if start <= point <= end)
+            self.assertEqual(sorted(tree.query(point)), expected, point)
+
+    def test_endpoints_are_inclusive(self):
+        tree = IntervalTree([(10, 20, 'a'), (20, 30, 'b'), (5, 5, 'c')])
+        self.assertEqual(sorted(tree.query(20)), ['a', 'b'])
+        self.assertEqual(tree.query(5), ['c'])
+        self.assertEqual(tree.query(4), [])
+        self.assertEqual(IntervalTree([]).query(1), [])
+
+
+class PricingCalendarTests(SimpleTestCase):
+    # 2026-03-02 is a Monday
+    MONDAY = date(2026, 3, 2)
+
+    def rule(self, pk, kind, start, end, multiplier, priority=0, vehicle_type='', weekdays=''):
+        return PricingRule(
+            pk=pk, name=f"Rule {pk}", kind=kind, start_date=start, end_date=end,
+            multiplier=Decimal(multiplier), priority=priority, vehicle_type=vehicle_type, weekdays=weekdays,
+        )
+
+    def test_overlapping_rules_of_one_kind_highest_priority_wins(self):
+        calendar = PricingCalendar([
+            self.rule(1, 'SEASON', self.MONDAY, self.MONDAY + timedelta(days=30), '1.2'),
+            self.rule(2, 'SEASON', self.MONDAY + timedelta(days=5), self.MONDAY + timedelta(days=10), '1.5', priority=5),
+        ])
+        self.assertEqual(calendar.multiplier(self.MONDAY), 1.2)
+        self.assertEqual(calendar.multiplier(self.MONDAY + timedelta(days=7)), 1.5)
+        self.assertEqual(calendar.multiplier(self.MONDAY + timedelta(days=31)), 1.0)
+
+    def test_different_kinds_multiply(self):
+        calendar = PricingCalendar([
+            self.rule(1, 'SEASON', self.MONDAY, self.MONDAY, '1.5'),
+            self.rule(2, 'SURGE', self.MONDAY, self.MONDAY, '1.2'),
+        ])
+        self.assertAlmostEqual(calendar.multiplier(self.MONDAY), 1.8)
+
+    def test_weekday_rules(self):
+        calendar = PricingCalendar([
+            self.rule(1, 'SURGE', self.MONDAY, self.MONDAY + timedelta(days=13), '1.1', weekdays='5,6'),
+        ])
+        saturday = self.MONDAY + timedelta(days=5)
+        self.assertEqual(calendar.multiplier(self.MONDAY), 1.0)
+        self.assertEqual(calendar.multiplier(saturday), 1.1)
+        self.assertEqual(calendar.multiplier(saturday + timedelta(days=1)), 1.1)
+        self.assertEqual(calendar.multiplier(saturday + timedelta(days=2)), 1.0)
+
+    def test_vehicle_specific_rules(self):
+        calendar = PricingCalendar([
+            self.rule(1, 'SEASON', self.MONDAY, self.MONDAY, '1.2'),
+            self.rule(2, 'SEASON', self.MONDAY, self.MONDAY, '1.4', vehicle_type='BUS'),
+        ])
+        # Same priority: the vehicle specific rule wins for that vehicle only
+        self.assertEqual(calendar.multiplier(self.MONDAY, 'BUS'), 1.4)
+        self.assertEqual(calendar.multiplier(self.MONDAY, 'SEDAN'), 1.2)
+        self.assertEqual(calendar.multiplier(self.MONDAY), 1.2)
+
+    @override_settings(PACKAGE_FESTIVAL_MULTIPLIER=1.1)
+    def test_package_price(self):
+        calendar = PricingCalendar([self.rule(1, 'FESTIVAL', self.MONDAY, self.MONDAY, '1.5', vehicle_type='SEDAN')])
+        package = Package(base_price=10000, vehicle_type='SEDAN', is_festival_rate=True)
+        self.assertEqual(calendar.package_price(package, self.MONDAY), (16500, 1.65))
+
+
+class PriceDateTests(SimpleTestCase):
+    def test_unscheduled_package_is_priced_for_the_local_today(self):
+        # 20:00 UTC is already the next day in Asia/Kolkata
+        now = datetime(2026, 3, 2, 20, 0, tzinfo=dt_timezone.utc)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            self.assertEqual(Package(scheduled_date=None).price_date, date(2026, 3, 3))
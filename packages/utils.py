@@ -1,6 +1,7 @@
 # packages/utils.py - COMPLETE FIXED VERSION
 
 import os
+from itertools import islice
 from django.conf import settings
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, landscape
@@ -8,100 +9,95 @@ from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
 from reportlab.lib.units import inch
 from django.utils import timezone
-from twilio.rest import Client
+from core.invoices import render_invoice
+from core.mail import build_email, send_bulk
+from core.messaging import send_many, send_whatsapp
+from core.notifications import render, render_email
+from .models import Package, PackageBooking
+from .notifications import SNAPSHOT_VALUES, snapshot
+
+
+# ============ MESSAGE BUILDERS ============
+# Pure functions (no I/O) so they can be benchmarked and reused by every sender.
+# The texts live in packages/notifications.py, in English and Gujarati.
+
+def package_whatsapp_message(booking, language=None):
+    """WhatsApp confirmation body sent through Twilio"""
+    return render('package_confirmation', 'whatsapp', snapshot(booking), language)
+
+
+def package_share_message(booking, language=None):
+    """Text for the api.whatsapp.com share link fallback"""
+    return render('package_confirmation', 'share', snapshot(booking), language)
+
+
+def package_schedule_message(booking, language=None):
+    """WhatsApp broadcast telling a customer the package's current schedule"""
+    return render('package_schedule', 'whatsapp', snapshot(booking), language)
+
+
+def package_confirmation_email(booking, language=None):
+    """(subject, body) of the confirmation email"""
+    return render_email('package_confirmation', snapshot(booking), language)
 
 
 def send_package_whatsapp_message(booking):
     """Send WhatsApp message for package booking confirmation"""
-    try:
-        client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
-        )
-        
-        package = booking.package
-        site_url = settings.SITE_URL
-        pdf_download_url = f"{site_url}/packages/invoice/{booking.id}/"
-        
-        # ✅ FIXED: Use properties that exist in PackageBooking model
-        scheduled_date = booking.scheduled_date if booking.scheduled_date else "Will be confirmed"
-        
-        if booking.scheduled_time:
-            scheduled_time = booking.scheduled_time.strftime('%I:%M %p')
-        else:
-            scheduled_time = "Will be confirmed"
-        
-        msg = (
-            f"Hello {booking.customer_name} 👋\n\n"
-            f"✨ **Package Booking Confirmed!** ✨\n\n"
-            f"📦 Package: {package.name}\n"
-            f"📋 Booking ID: {booking.invoice_no}\n"
-            f"📍 Route: {package.pickup_location} → {package.drop_location}\n"
-            f"📏 Distance: {package.distance_km} KM\n"
-            f"⏳ Duration: {package.duration_days} Day(s)\n"
-            f"🚗 Vehicle: {package.get_vehicle_type_display()}\n"
-            f"👥 Passengers: {booking.passengers_count}\n"
-            f"🗓 Scheduled Date: {scheduled_date}\n"
-            f"⏰ Scheduled Time: {scheduled_time}\n\n"
-            f"💰 Total Fare: ₹{booking.total_amount}\n"
-            f"💵 Advance Paid: ₹{booking.advance_paid}\n"
-            f"💳 Remaining: ₹{booking.remaining_amount}\n\n"
-            f"📄 Invoice Download: {pdf_download_url}\n\n"
-            f"✅ **Package Inclusions:**\n"
-            f"{package.inclusions}\n\n"
-            f"📝 **Important Notes:**\n"
-            f"{package.important_notes}\n\n"
-            f"Thank you for choosing Pathan Travels! 🚗\n"
-            f"Need help? Call: 9879230065"
-        )
-        
-        client.messages.create(
-            from_=settings.TWILIO_WHATSAPP_NUMBER,
-            to=f"whatsapp:+91{booking.customer_phone}",
-            body=msg
-        )
+    if send_whatsapp(booking.customer_phone, package_whatsapp_message(booking)):
         return True
-    except Exception as e:
-        print(f"WhatsApp error: {e}")
-        
-        # Alternative method
-        send_package_whatsapp_via_url(booking)
-        return False
+    
+    # Alternative method
+    send_package_whatsapp_via_url(booking)
+    return False
+
+
+def send_schedule_update(package_id, schedule=None):
+    """
+    WhatsApp and email every open booking of a package its current schedule.
+    
+    Bookings (with the package columns) come from one streamed values()
+    query and go out PACKAGE_SCHEDULE_NOTIFY_CHUNK at a time through the
+    rate limited send_many and the pooled send_bulk. `schedule` is the
+    (date, time) saved when the job was queued: if the package has been
+    rescheduled again since, that newer save queues its own job and this
+    one sends nothing. Once sent, the package's schedule_update_pending
+    flag is cleared (if the schedule is still the one sent).
+    Returns (bookings, WhatsApp sent, emails sent).
+    """
+    current = Package.objects.filter(pk=package_id).values_list('scheduled_date', 'scheduled_time').first()
+    if current is None or (schedule is not None and tuple(schedule) != current):
+        return 0, 0, 0
+    rows = (
+        PackageBooking.objects
+        .filter(package_id=package_id, status__in=['PENDING', 'CONFIRMED'])
+        .order_by('pk')
+        .values(*SNAPSHOT_VALUES)
+        .iterator(chunk_size=settings.PACKAGE_SCHEDULE_NOTIFY_CHUNK)
+    )
+    total = whatsapp = emails = 0
+    while True:
+        chunk = list(islice(rows, settings.PACKAGE_SCHEDULE_NOTIFY_CHUNK))
+        if not chunk:
+            break
+        snapshots = [snapshot(row) for row in chunk]
+        sids = send_many([(data['phone'], render('package_schedule', 'whatsapp', data)) for data in snapshots])
+        whatsapp += sum(1 for sid in sids if sid)
+        emails += send_bulk([
+            build_email(*render_email('package_schedule', data), [data['email']])
+            for data in snapshots if data['email']
+        ])
+        total += len(chunk)
+    Package.objects.filter(
+        pk=package_id, scheduled_date=current[0], scheduled_time=current[1], schedule_update_pending=True,
+    ).update(schedule_update_pending=False)
+    return total, whatsapp, emails
 
 
 def send_package_whatsapp_via_url(booking):
     """Generate WhatsApp URL for package booking"""
     try:
         phone = booking.customer_phone
-        package = booking.package
-        site_url = settings.SITE_URL
-        pdf_download_url = f"{site_url}/packages/invoice/{booking.id}/"
-        
-        # ✅ FIXED: Use properties that exist
-        scheduled_date = booking.scheduled_date if booking.scheduled_date else "Will be confirmed"
-        
-        if booking.scheduled_time:
-            scheduled_time = booking.scheduled_time.strftime('%I:%M %p')
-        else:
-            scheduled_time = "Will be confirmed"
-        
-        message = (
-            f"Hello {booking.customer_name} 👋\n\n"
-            f"Package Booking Confirmed! ✅\n\n"
-            f"📦 Package: {package.name}\n"
-            f"📋 Booking ID: {booking.invoice_no}\n"
-            f"📍 Route: {package.pickup_location} → {package.drop_location}\n"
-            f"📏 Distance: {package.distance_km} KM\n"
-            f"⏳ Duration: {package.duration_days} Day(s)\n"
-            f"🚗 Vehicle: {package.get_vehicle_type_display()}\n"
-            f"👥 Passengers: {booking.passengers_count}\n"
-            f"🗓 Scheduled Date: {scheduled_date}\n"
-            f"⏰ Scheduled Time: {scheduled_time}\n\n"
-            f"💰 Total Fare: ₹{booking.total_amount}\n"
-            f"💵 Advance Paid: ₹{booking.advance_paid}\n"
-            f"💳 Remaining: ₹{booking.remaining_amount}\n\n"
-            f"📄 Invoice: {pdf_download_url}"
-        )
+        message = package_share_message(booking)
         
         whatsapp_url = f"https://api.whatsapp.com/send?phone=91{phone}&text={message}"
         print(f"Package WhatsApp Link: {whatsapp_url}")
@@ -256,81 +252,42 @@ def generate_package_bookings_pdf(bookings, title="Package Bookings Report"):
 
 
 # Additional utility functions
+def _schedule(booking, pending="Will be confirmed"):
+    scheduled_date = booking.scheduled_date if booking.scheduled_date else pending
+    scheduled_time = booking.scheduled_time.strftime('%I:%M %p') if booking.scheduled_time else pending
+    return scheduled_date, scheduled_time
+
+
+def package_invoice_data(booking):
+    """Values stamped on the package invoice (see core.invoices.LAYOUTS)"""
+    package = booking.package
+    scheduled_date, scheduled_time = _schedule(booking, pending="Will be confirmed by admin")
+    return {
+        'invoice_no': booking.invoice_no,
+        'date': booking.created_at.strftime('%d-%m-%Y %I:%M %p'),
+        'customer': booking.customer_name,
+        'phone': booking.customer_phone,
+        'email': booking.customer_email,
+        'package': package.name,
+        'route': f"{package.pickup_location} → {package.drop_location}",
+        'distance': f"{package.distance_km} KM",
+        'duration': f"{package.duration_days} Day(s)",
+        'vehicle': package.get_vehicle_type_display(),
+        'passengers': booking.passengers_count,
+        'scheduled_date': scheduled_date,
+        'scheduled_time': scheduled_time,
+        'total': booking.total_amount,
+        'advance': booking.advance_paid,
+        'remaining': booking.remaining_amount,
+    }
+
+
+def package_invoice_pdf_path(booking_id):
+    return os.path.join(settings.MEDIA_ROOT, "invoices", "packages", f"package_invoice_{booking_id}.pdf")
+
+
 def create_package_invoice_pdf(booking):
     """Create PDF invoice for package booking"""
-    invoice_dir = os.path.join(settings.MEDIA_ROOT, "invoices/packages")
-    os.makedirs(invoice_dir, exist_ok=True)
-    
-    file_path = os.path.join(invoice_dir, f"package_invoice_{booking.id}.pdf")
-    
-    p = canvas.Canvas(file_path, pagesize=A4)
-    width, height = A4
-    y = height - 50
-    
-    # Header
-    p.setFont("Helvetica-Bold", 18)
-    p.drawCentredString(width/2, y, "PATHAN TOURS - PACKAGE INVOICE")
-    y -= 40
-    
-    # Invoice Details
-    p.setFont("Helvetica", 11)
-    p.drawString(50, y, f"Invoice No: {booking.invoice_no}")
-    p.drawString(350, y, f"Date: {booking.created_at.strftime('%d-%m-%Y %I:%M %p')}")
-    y -= 25
-    
-    # Customer Details
-    p.drawString(50, y, f"Customer: {booking.customer_name}")
-    y -= 20
-    p.drawString(50, y, f"Phone: {booking.customer_phone}")
-    if booking.customer_email:
-        y -= 20
-        p.drawString(50, y, f"Email: {booking.customer_email}")
-    y -= 20
-    
-    # Package Details
-    package = booking.package
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(50, y, "Package Details")
-    y -= 25
-    
-    p.setFont("Helvetica", 11)
-    p.drawString(50, y, f"Package: {package.name}")
-    y -= 20
-    p.drawString(50, y, f"Route: {package.pickup_location} → {package.drop_location}")
-    y -= 20
-    p.drawString(50, y, f"Distance: {package.distance_km} KM")
-    y -= 20
-    p.drawString(50, y, f"Duration: {package.duration_days} Day(s)")
-    y -= 20
-    p.drawString(50, y, f"Vehicle: {package.get_vehicle_type_display()}")
-    y -= 20
-    p.drawString(50, y, f"Passengers: {booking.passengers_count}")
-    
-    # ✅ FIXED: Use scheduled_date instead of travel_date
-    y -= 20
-    if booking.scheduled_date:
-        p.drawString(50, y, f"Scheduled Date: {booking.scheduled_date}")
-        y -= 20
-        if booking.scheduled_time:
-            p.drawString(50, y, f"Scheduled Time: {booking.scheduled_time.strftime('%I:%M %p')}")
-            y -= 20
-    else:
-        p.drawString(50, y, f"Schedule: Will be confirmed by admin")
-        y -= 20
-    
-    # Payment Details
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(50, y, "Payment Summary")
-    y -= 25
-    
-    p.setFont("Helvetica", 11)
-    p.drawString(50, y, f"Total Package Fare: ₹{booking.total_amount}")
-    y -= 20
-    p.drawString(50, y, f"Advance Paid: ₹{booking.advance_paid}")
-    y -= 20
-    p.drawString(50, y, f"Remaining Amount: ₹{booking.remaining_amount}")
-    
-    p.showPage()
-    p.save()
-    
-    return file_path
\ No newline at end of file
+    file_path = package_invoice_pdf_path(booking.id)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return render_invoice('package', package_invoice_data(booking), file_path)
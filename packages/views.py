@@ -5,11 +5,21 @@ from django.http import HttpResponse
 from django.contrib import messages
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
-from django.core.mail import send_mail
 from django.utils import timezone
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
 from django.contrib.auth.decorators import login_required, user_passes_test
-from .models import Package, PackageBooking
-from .utils import generate_package_bookings_pdf, send_package_whatsapp_message
+from core.http import conditional
+from core.mail import send_email
+from core.payments import record_payment
+from core.providers import razorpay_client
+from core.routers import use_replica
+from .models import Package, PackageBooking, PackageDailyPrice
+from .utils import (
+    generate_package_bookings_pdf, package_confirmation_email, send_package_whatsapp_message,
+)
 import razorpay
 import os
 from reportlab.pdfgen import canvas
@@ -17,16 +27,87 @@ from reportlab.lib.pagesizes import A4
 from django.contrib.auth.decorators import login_required
 
 # Initialize Razorpay client
-client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+client = razorpay_client()
 
 
 # ============ PUBLIC VIEWS ============
+PACKAGES_PER_PAGE = 12
+
+# ?sort= values -> ORDER BY; ties broken by id so pages are stable
+PACKAGE_SORTS = {
+    'newest': ('-created_at', '-id'),
+    'price': ('quoted_price', 'id'),
+    '-price': ('-quoted_price', '-id'),
+    'price_per_km': ('price_per_km', 'id'),
+}
+
+
+def _travel_date(request):
+    try:
+        return parse_date(request.GET.get('date', ''))
+    except ValueError:
+        return None
+
+
+def package_list_version(request):
+    """Changes whenever a listed package, or its ?date= price, does"""
+    version = Package.objects.aggregate(Max('updated_at'), active=Count('id', filter=Q(is_active=True)))
+    travel_date = _travel_date(request)
+    if travel_date:
+        version.update(PackageDailyPrice.objects.filter(date=travel_date).aggregate(Count('id'), Sum('price')))
+    return sorted(version.items())
+
+
+def package_version(request, package_id):
+    return Package.objects.filter(id=package_id, is_active=True).values_list('updated_at', flat=True).first()
+
+
+@use_replica
+@conditional(package_list_version)
 def package_list(request):
-    """Display all active packages"""
+    """Display active packages - filtered, sorted and paginated in SQL"""
     packages = Package.objects.filter(is_active=True)
-    return render(request, 'packages/package_list.html', {'packages': packages})
+    
+    # ?date= quotes every package for that travel date from the precomputed
+    # calendar (precompute_prices); otherwise the scheduled-date price
+    travel_date = _travel_date(request)
+    if travel_date:
+        day_price = PackageDailyPrice.objects.filter(package=OuterRef('pk'), date=travel_date).values('price')
+        packages = packages.annotate(quoted_price=Coalesce(Subquery(day_price), 'final_price'))
+    else:
+        packages = packages.alias(quoted_price=F('final_price'))
+    
+    package_type = request.GET.get('type', '').upper()
+    if package_type in dict(Package.PACKAGE_TYPES):
+        packages = packages.filter(package_type=package_type)
+    
+    min_price = request.GET.get('min_price', '')
+    if min_price.isdigit():
+        packages = packages.filter(quoted_price__gte=int(min_price))
+    max_price = request.GET.get('max_price', '')
+    if max_price.isdigit():
+        packages = packages.filter(quoted_price__lte=int(max_price))
+    
+    sort = request.GET.get('sort', 'newest')
+    packages = packages.order_by(*PACKAGE_SORTS.get(sort, PACKAGE_SORTS['newest']))
+    
+    page = Paginator(packages, PACKAGES_PER_PAGE).get_page(request.GET.get('page'))
+    
+    # Filters to carry over into the pagination links
+    query = request.GET.copy()
+    query.pop('page', None)
+    
+    return render(request, 'packages/package_list.html', {
+        'packages': page,
+        'package_types': Package.PACKAGE_TYPES,
+        'current_type': package_type,
+        'current_sort': sort,
+        'travel_date': travel_date,
+        'querystring': query.urlencode(),
+    })
 
 @login_required
+@conditional(package_version, shared=False)
 def package_detail(request, package_id):
     """Display package details and booking form"""
     package = get_object_or_404(Package, id=package_id, is_active=True)
@@ -112,21 +193,18 @@ def package_payment_success(request):
             
             client.utility.verify_payment_signature(params_dict)
             
-            booking = PackageBooking.objects.get(razorpay_order_id=razorpay_order_id)
-            booking.razorpay_payment_id = razorpay_payment_id
-            booking.razorpay_signature = razorpay_signature
-            booking.status = 'CONFIRMED'
-            booking.payment_status = 'ADVANCE_PAID'
-            booking.save()
-            
-            # Send WhatsApp message (using utils function)
-            send_package_whatsapp_message(booking)
-            
-            # Send email confirmation
-            send_package_confirmation_email(booking)
+            # Retries/double-submits are answered from the stored PaymentEvent
+            event, created = record_payment(
+                'package',
+                PackageBooking.all_objects.filter(razorpay_order_id=razorpay_order_id),
+                razorpay_payment_id,
+                razorpay_order_id,
+                confirm=lambda booking: confirm_package_payment(booking, razorpay_payment_id, razorpay_signature),
+                notify=notify_package_booking,
+            )
             
             messages.success(request, "Payment successful! Package booking confirmed.")
-            return redirect('package_booking_confirmation', booking_id=booking.id)
+            return redirect('package_booking_confirmation', booking_id=event.booking_id)
             
         except Exception as e:
             messages.error(request, f"Payment failed: {str(e)}")
@@ -141,6 +219,11 @@ def package_booking_confirmation(request, booking_id):
     return render(request, 'packages/confirmation.html', {'booking': booking})
 
 
+def package_invoice_version(request, booking_id):
+    return PackageBooking.objects.filter(id=booking_id).values_list('updated_at', 'package__updated_at').first()
+
+
+@conditional(package_invoice_version, last_modified_func=max, shared=False)
 def package_invoice(request, booking_id):
     """Download package booking invoice"""
     booking = get_object_or_404(PackageBooking, id=booking_id)
@@ -153,73 +236,29 @@ def package_invoice(request, booking_id):
 
 
 # ============ UTILITY FUNCTIONS ============
-def send_package_confirmation_email(booking):
-    """Send email confirmation for package booking"""
-    try:
-        if not booking.customer_email:
-            return False
-            
-        package = booking.package
-        
-        subject = f"Package Booking Confirmed - {booking.invoice_no}"
-        
-        # ✅ FIXED: Use scheduled_date and scheduled_time
-        scheduled_date = booking.scheduled_date if booking.scheduled_date else "Will be confirmed by admin"
-        
-        if booking.scheduled_time:
-            scheduled_time = booking.scheduled_time.strftime('%I:%M %p')
-        else:
-            scheduled_time = "Will be confirmed by admin"
-        
-        message = f"""
-Dear {booking.customer_name},
+def confirm_package_payment(booking, payment_id, signature):
+    """Mark a package booking paid; returns the fields to save"""
+    booking.razorpay_payment_id = payment_id
+    booking.razorpay_signature = signature
+    booking.status = 'CONFIRMED'
+    booking.payment_status = 'ADVANCE_PAID'
+    # A paid booking never stays in the trash
+    booking.deleted_at = None
+    return ['razorpay_payment_id', 'razorpay_signature', 'status', 'payment_status', 'deleted_at', 'updated_at']
 
-Your package tour has been confirmed successfully!
 
-**Booking Details:**
-Booking ID: {booking.invoice_no}
-Package: {package.name}
-Route: {package.pickup_location} to {package.drop_location}
-Distance: {package.distance_km} KM
-Duration: {package.duration_days} Day(s)
-Vehicle: {package.get_vehicle_type_display()}
-Passengers: {booking.passengers_count}
-Scheduled Date: {scheduled_date}
-Scheduled Time: {scheduled_time}
+def notify_package_booking(booking):
+    """WhatsApp + email once a package booking is paid (runs after commit)"""
+    send_package_whatsapp_message(booking)
+    send_package_confirmation_email(booking)
 
-**Payment Summary:**
-Total Fare: ₹{booking.total_amount}
-Advance Paid: ₹{booking.advance_paid}
-Remaining Amount: ₹{booking.remaining_amount}
 
-**Package Inclusions:**
-{package.inclusions}
-
-**Important Notes:**
-{package.important_notes}
-
-**Special Requirements:**
-{booking.special_requirements if booking.special_requirements else 'None'}
-
-For any queries, please contact us at 9879230065.
-
-Thank you for choosing Pathan Tours & Travels!
-
-Best regards,
-Pathan Tours Team
-"""
-        
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.EMAIL_HOST_USER,
-            recipient_list=[booking.customer_email],
-            fail_silently=True,
-        )
-        return True
-    except Exception as e:
-        print(f"Email error: {e}")
+def send_package_confirmation_email(booking):
+    """Send email confirmation for package booking"""
+    if not booking.customer_email:
         return False
+    subject, message = package_confirmation_email(booking)
+    return send_email(subject, message, [booking.customer_email])
 
 
 def create_package_invoice_pdf(booking):
@@ -236,6 +275,7 @@ def is_admin_user(user):
 
 @login_required
 @user_passes_test(is_admin_user)
+@use_replica
 def admin_package_bookings_pdf(request):
     """Generate PDF report for package bookings (Admin only)"""
     # Get filter parameters
@@ -283,6 +323,7 @@ def admin_package_bookings_pdf(request):
 
 @login_required
 @user_passes_test(is_admin_user)
+@use_replica
 def admin_package_bookings_report(request):
     """Admin report page for package bookings"""
     # Get all packages for filter
@@ -314,17 +355,24 @@ def admin_package_bookings_report(request):
     bookings = bookings.order_by('-created_at')
     
     # Calculate totals
-    total_bookings = bookings.count()
-    total_amount = sum(b.total_amount for b in bookings) if bookings else 0
-    total_advance = sum(b.advance_paid for b in bookings) if bookings else 0
-    total_remaining = sum(b.remaining_amount for b in bookings) if bookings else 0
+    # Totals and status counts in SQL, not by looping over every booking
+    totals = bookings.aggregate(
+        total_bookings=Count('id'),
+        total_amount=Coalesce(Sum('total_amount'), 0),
+        total_advance=Coalesce(Sum('advance_paid'), 0),
+    )
+    total_bookings = totals['total_bookings']
+    total_amount = totals['total_amount']
+    total_advance = totals['total_advance']
+    total_remaining = total_amount - total_advance
     
     # Status counts
-    status_counts = {}
-    for status_code, status_name in PackageBooking.STATUS_CHOICES:
-        count = bookings.filter(status=status_code).count()
-        if count > 0:
-            status_counts[status_name] = count
+    counts = dict(bookings.order_by().values_list('status').annotate(n=Count('id')))
+    status_counts = {
+        status_name: counts[status_code]
+        for status_code, status_name in PackageBooking.STATUS_CHOICES
+        if counts.get(status_code)
+    }
     
     context = {
         'bookings': bookings,
@@ -31,6 +31,8 @@ INSTALLED_APPS = [
     'bookings',
     'gallery',
     'users',
+    'analytics',
+    'api',
 ]
 AUTH_USER_MODEL = 'users.User'
 
@@ -39,10 +41,13 @@ LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.instrumentation.PerformanceMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.audit.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -66,13 +71,108 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'pathan_travels.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database Configuration
+# DB_ENGINE: sqlite (default) or postgres
+# DB_POOL=pgbouncer when connecting through a PgBouncer transaction pool
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+DB_POOL = os.getenv('DB_POOL', '')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'pathan_travels'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', '127.0.0.1'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Keep connections open between requests instead of reconnecting every time
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            # Server-side cursors don't survive transaction pooling
+            'DISABLE_SERVER_SIDE_CURSORS': DB_POOL == 'pgbouncer',
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds the driver waits for a lock before "database is locked"
+                'timeout': 20,
+            },
+        }
+    }
+
+# Read replica: DB_REPLICA_NAME (second SQLite file) or DB_REPLICA_HOST (PostgreSQL)
+# Only views wrapped with core.routers.use_replica read from it.
+if DB_ENGINE == 'postgres' and os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif DB_ENGINE != 'postgres' and os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME'),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# Seconds a browser keeps reading from the primary after it wrote something
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+# Applied to every new SQLite connection by core.db.apply_sqlite_pragmas
+# (the lock wait is OPTIONS['timeout'] above; a busy_timeout here would override it)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',     # readers no longer block the writer
+    'synchronous': 'NORMAL',   # safe with WAL, far fewer fsyncs
+}
+
+# Cache Configuration
+# CACHE_BACKEND: locmem (default, per process), redis, memcached or file
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', '')
+# Seen by every worker process? (locmem is private to each one)
+SHARED_CACHE = CACHE_BACKEND != 'locmem'
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        'LOCATION': CACHE_LOCATION or 'pathan-default',
+    },
+    'sessions': {
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        'LOCATION': CACHE_LOCATION or 'pathan-sessions',
+        'KEY_PREFIX': 'sess',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 20000} if CACHE_BACKEND in ('locmem', 'file') else {},
+    },
 }
 
+# Session Configuration
+# core.sessions reads from the 'sessions' cache and writes through to the DB. It needs
+# a shared cache: with per-process locmem a logout on one worker would leave the
+# session cached (logged in) on the others, so plain DB sessions are the default then.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE', 'core.sessions' if SHARED_CACHE else 'django.contrib.sessions.backends.db'
+)
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_MISSING_CACHE_SECONDS = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -93,28 +193,114 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# EMAIL_BACKEND: pooled (default, core.mail), smtp, console, file (EMAIL_FILE_PATH) or locmem
+EMAIL_BACKENDS = {
+    'pooled': 'core.mail.PooledEmailBackend',
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',
+    'console': 'django.core.mail.backends.console.EmailBackend',
+    'file': 'django.core.mail.backends.filebased.EmailBackend',
+    'locmem': 'django.core.mail.backends.locmem.EmailBackend',
+}
+EMAIL_BACKEND = EMAIL_BACKENDS.get(os.getenv('EMAIL_BACKEND', 'pooled'), os.getenv('EMAIL_BACKEND'))
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', os.path.join(BASE_DIR, 'sent_emails'))
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', 'kanzariyapratik124@gmail.com')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
+# Warm SMTP connections kept per process, and how long one may sit unused
+EMAIL_POOL_SIZE = int(os.getenv('EMAIL_POOL_SIZE', '4'))
+EMAIL_POOL_IDLE_SECONDS = int(os.getenv('EMAIL_POOL_IDLE_SECONDS', '60'))
+# Messages sent over one connection by core.mail.send_bulk
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', '50'))
 
 # Razorpay Configuration
 RAZORPAY_KEY_ID = os.getenv('RAZORPAY_KEY_ID', 'rzp_test_e664V0FP0zQy7N')
 RAZORPAY_KEY_SECRET = os.getenv('RAZORPAY_KEY_SECRET', 'QdnuRxUHrPGeiJc9lDTXYPO7')
+# Empty means the real API; benchmarks point this at core.fakes
+RAZORPAY_BASE_URL = os.getenv('RAZORPAY_BASE_URL', '')
 
 # Twilio Configuration
 TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID', 'AC820e3c0f356f546f11410d7e04297390')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN', 'c26066605db3ecbf0fde51b0a6d07cd7')
 TWILIO_WHATSAPP_NUMBER = "whatsapp:+14155238886"
+TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL', '')
+TWILIO_TIMEOUT = int(os.getenv('TWILIO_TIMEOUT', '10'))
+# Broadcasts (core.messaging.send_many): requests in flight, and the account's messages/second
+TWILIO_CONCURRENCY = int(os.getenv('TWILIO_CONCURRENCY', '8'))
+TWILIO_RATE_PER_SECOND = float(os.getenv('TWILIO_RATE_PER_SECOND', '10'))
+
+# Language of customer WhatsApp/email/SMS texts (core.notifications): en or gu
+NOTIFICATION_LANGUAGE = os.getenv('NOTIFICATION_LANGUAGE', 'en')
 
 # Contact Information
 CONTACT_EMAIL = 'kanzariyapratik124@gmail.com'
 CONTACT_PHONES = ['9879230065', '9925993770']
 SITE_URL = 'http://127.0.0.1:8000'
 
+# Invoices (core.invoices): a TTF with the rupee sign; empty tries DejaVu Sans
+INVOICE_FONT_PATH = os.getenv('INVOICE_FONT_PATH', '')
+
+# Pricing calendar (packages.pricing)
+PACKAGE_FESTIVAL_MULTIPLIER = float(os.getenv('PACKAGE_FESTIVAL_MULTIPLIER', '1.15'))
+PRICE_PRECOMPUTE_DAYS = int(os.getenv('PRICE_PRECOMPUTE_DAYS', '365'))
+
+# Booking retention (archive_bookings / expire_pending_bookings, run daily)
+BOOKING_ARCHIVE_AFTER_DAYS = int(os.getenv('BOOKING_ARCHIVE_AFTER_DAYS', '365'))
+PENDING_BOOKING_TTL_HOURS = int(os.getenv('PENDING_BOOKING_TTL_HOURS', '48'))
+
+# History export (analytics.exports, manage.py export_history); keep it outside MEDIA_ROOT
+HISTORY_EXPORT_ROOT = os.getenv('HISTORY_EXPORT_ROOT', str(BASE_DIR / 'exports'))
+
+# Background jobs (core.tasks): worker threads per process; eager runs jobs inline
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', '2'))
+TASKS_EAGER = os.getenv('TASKS_EAGER', 'False') == 'True'
+
+# Tell booked customers when an admin changes a package's date/time (packages.utils.send_schedule_update)
+PACKAGE_SCHEDULE_NOTIFY = os.getenv('PACKAGE_SCHEDULE_NOTIFY', 'True') == 'True'
+PACKAGE_SCHEDULE_NOTIFY_CHUNK = int(os.getenv('PACKAGE_SCHEDULE_NOTIFY_CHUNK', '200'))
+
+# Contact inbox (core.contact): at most CONTACT_THROTTLE_COUNT messages per IP / email per window
+# (counted in the cache when SHARED_CACHE, else from the stored messages)
+CONTACT_THROTTLE_COUNT = int(os.getenv('CONTACT_THROTTLE_COUNT', '3'))
+CONTACT_THROTTLE_SECONDS = int(os.getenv('CONTACT_THROTTLE_SECONDS', '600'))
+# Count X-Forwarded-For's first address as the client IP (only behind a trusted proxy)
+USE_X_FORWARDED_FOR = os.getenv('USE_X_FORWARDED_FOR', 'False') == 'True'
+
+# Soft-deleted bookings stay in the admin trash this long before purge_deleted_bookings removes them
+SOFT_DELETE_RETENTION_DAYS = int(os.getenv('SOFT_DELETE_RETENTION_DAYS', '30'))
+
+# JSON API (api/): X-Api-Key values as 'partner:key,partner:key'; empty disables the API
+API_KEYS = os.getenv('API_KEYS', '')
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '20'))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '100'))
+API_CACHE_SECONDS = int(os.getenv('API_CACHE_SECONDS', '60'))
+
+# Audit log (core.audit): entries buffered per request, flushed early past this many
+AUDIT_BUFFER_SIZE = int(os.getenv('AUDIT_BUFFER_SIZE', '1000'))
+
+# HTTP caching of public pages (core.http): browser / CDN lifetimes for anonymous
+# visitors; RELEASE (e.g. the deployed commit) salts ETags, else the newest template's mtime
+HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', '60'))
+HTTP_CACHE_SHARED_MAX_AGE = int(os.getenv('HTTP_CACHE_SHARED_MAX_AGE', '300'))
+RELEASE = os.getenv('RELEASE', '')
+
+# Image uploads (core.images): uploads over FILE_UPLOAD_MAX_MEMORY_SIZE bytes stream to a
+# temp file in chunks; a worker then strips metadata and caps/derives the stored image
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', str(256 * 1024)))
+FILE_UPLOAD_TEMP_DIR = os.getenv('FILE_UPLOAD_TEMP_DIR') or None
+IMAGE_MAX_DIMENSION = int(os.getenv('IMAGE_MAX_DIMENSION', '2000'))
+IMAGE_THUMBNAIL_SIZE = int(os.getenv('IMAGE_THUMBNAIL_SIZE', '640'))
+IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', '85'))
+
+# Performance Instrumentation (core.instrumentation)
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'True') == 'True'
+PERF_BUFFER_SIZE = int(os.getenv('PERF_BUFFER_SIZE', '500'))
+# Bearer token for Prometheus scraping /perf/metrics/ without a staff login
+PERF_METRICS_TOKEN = os.getenv('PERF_METRICS_TOKEN', '')
+
 # Security
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -155,8 +341,12 @@ JAZZMIN_SETTINGS = {
         "users.User": "fas fa-user",
         "users.UserProfile": "fas fa-id-card",
         "bookings.Booking": "fas fa-ticket-alt",
+        "bookings.ArchivedBooking": "fas fa-archive",
         "packages.Package": "fas fa-box",
         "packages.PackageBooking": "fas fa-shopping-cart",
+        "packages.PricingRule": "fas fa-calendar-alt",
+        "packages.ArchivedPackageBooking": "fas fa-archive",
+        "analytics.RevenueRollup": "fas fa-chart-line",
         "gallery.GalleryImage": "fas fa-image",
         "gallery.GalleryVideo": "fas fa-video",
         "auth.Group": "fas fa-users-cog",
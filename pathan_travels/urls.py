@@ -4,7 +4,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
-from core.views import home, contact  # 'contact_view' નહીં, 'contact'
+from core.views import home, contact, perf_recent, perf_metrics  # 'contact_view' નહીં, 'contact'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,6 +15,12 @@ urlpatterns = [
     path('book/', include('bookings.urls')),
     path('packages/', include('packages.urls')),
     path('gallery/', include('gallery.urls')),
+    path('analytics/', include('analytics.urls')),  # staff revenue dashboard
+    path('api/v1/', include('api.urls')),  # JSON API for partners and the mobile app
+
+    # Performance metrics (staff only)
+    path('perf/', perf_recent, name='perf_recent'),
+    path('perf/metrics/', perf_metrics, name='perf_metrics'),
 ]
 
 if settings.DEBUG:
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
 from django.utils.html import format_html
+from core import audit, images
 from .models import User, UserProfile
 
 class CustomUserAdmin(UserAdmin):
@@ -86,23 +88,28 @@ class CustomUserAdmin(UserAdmin):
     
     actions = ['verify_emails', 'unverify_emails', 'make_active', 'make_inactive', 'export_users']
     
+    # update() skips auto_now: set updated_at so incremental exports (analytics.exports) see the change
     def verify_emails(self, request, queryset):
-        updated = queryset.update(is_email_verified=True)
+        with audit.track(queryset, 'users.verify_emails', fields=('is_email_verified',)):
+            updated = queryset.update(is_email_verified=True, updated_at=timezone.now())
         self.message_user(request, f'{updated} users email verified successfully.')
     verify_emails.short_description = "✅ Verify selected users email"
     
     def unverify_emails(self, request, queryset):
-        updated = queryset.update(is_email_verified=False)
+        with audit.track(queryset, 'users.unverify_emails', fields=('is_email_verified',)):
+            updated = queryset.update(is_email_verified=False, updated_at=timezone.now())
         self.message_user(request, f'{updated} users email unverified.')
     unverify_emails.short_description = "❌ Unverify selected users email"
     
     def make_active(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        with audit.track(queryset, 'users.make_active', fields=('is_active',)):
+            updated = queryset.update(is_active=True, updated_at=timezone.now())
         self.message_user(request, f'{updated} users activated.')
     make_active.short_description = "▶️ Make selected users active"
     
     def make_inactive(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        with audit.track(queryset, 'users.make_inactive', fields=('is_active',)):
+            updated = queryset.update(is_active=False, updated_at=timezone.now())
         self.message_user(request, f'{updated} users deactivated.')
     make_inactive.short_description = "⏸️ Make selected users inactive"
     
@@ -150,6 +157,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     
     list_filter = ('city', 'state')
     search_fields = ('user__email', 'user__username', 'phone', 'city', 'state')
+    list_select_related = ('user',)
     readonly_fields = ()
     
     fieldsets = (
@@ -184,7 +192,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     
     def has_profile_pic(self, obj):
         if obj.profile_picture:
-            return format_html('✅ Yes')
+            return images.preview(obj.profile_picture, width=40, height=40)
         return "❌ No"
     has_profile_pic.short_description = 'Profile Pic'
 
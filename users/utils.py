@@ -1,10 +1,9 @@
-from django.core.mail import send_mail
-from django.conf import settings
+from core.mail import send_email
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
 def send_otp_email(user, otp):
-    """Send OTP via email"""
+    """Send OTP via email; returns False if it couldn't be sent"""
     subject = 'Pathan Travels - Email Verification OTP'
     try:
         html_message = render_to_string('users/email/otp_email.html', {
@@ -12,17 +11,9 @@ def send_otp_email(user, otp):
             'otp': otp,
         })
         plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject,
-            plain_message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
     except Exception as e:
         # Fallback to plain text
+        html_message = None
         plain_message = f"""
 Hello {user.username},
 
@@ -33,13 +24,7 @@ This code is valid for 10 minutes.
 Regards,
 Pathan Travels
 """
-        send_mail(
-            subject,
-            plain_message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
-        )
+    return send_email(subject, plain_message, [user.email], html_message=html_message)
 
 def send_welcome_email(user):
     """Send welcome email after verification"""
@@ -49,16 +34,8 @@ def send_welcome_email(user):
             'user': user,
         })
         plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject,
-            plain_message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
     except Exception as e:
+        html_message = None
         plain_message = f"""
 Hello {user.username},
 
@@ -69,10 +46,4 @@ You can now book trips and view your bookings.
 Regards,
 Pathan Travels Team
 """
-        send_mail(
-            subject,
-            plain_message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
-        )
\ No newline at end of file
+    return send_email(subject, plain_message, [user.email], html_message=html_message)
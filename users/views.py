@@ -4,6 +4,7 @@ from django.shortcuts import render
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib import messages
+from django import forms
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_protect
 from django.utils import timezone
@@ -15,6 +16,8 @@ from .utils import send_otp_email, send_welcome_email
 from packages.models import PackageBooking
 from bookings.models import Booking
 
+OTP_SEND_FAILED = 'Could not send the OTP email right now. Please use "Resend OTP" in a minute.'
+
 def register_view(request):
     """User Registration - Step 1: Email & Password"""
     if request.user.is_authenticated:
@@ -29,12 +32,15 @@ def register_view(request):
             
             # Generate and send OTP
             otp = user.generate_otp()
-            send_otp_email(user, otp)
+            sent = send_otp_email(user, otp)
             
             # Store user ID in session for OTP verification
             request.session['pending_user_id'] = user.id
             
-            messages.success(request, 'Registration successful! Please verify your email with the OTP sent.')
+            if sent:
+                messages.success(request, 'Registration successful! Please verify your email with the OTP sent.')
+            else:
+                messages.error(request, f'Registration successful, but: {OTP_SEND_FAILED}')
             return redirect('verify_otp')
     else:
         form = UserRegistrationForm()
@@ -104,8 +110,10 @@ def resend_otp_view(request):
     try:
         user = User.objects.get(id=user_id)
         otp = user.generate_otp()
-        send_otp_email(user, otp)
-        messages.success(request, 'New OTP has been sent to your email.')
+        if send_otp_email(user, otp):
+            messages.success(request, 'New OTP has been sent to your email.')
+        else:
+            messages.error(request, OTP_SEND_FAILED)
     except User.DoesNotExist:
         messages.error(request, 'User not found.')
     
@@ -136,11 +144,12 @@ def login_view(request):
                         return redirect(next_page)
                     return redirect('home')
                 else:
-                    messages.warning(request, 'Please verify your email first. Check your inbox for OTP.')
-                    
                     # Regenerate OTP and send
                     otp = user.generate_otp()
-                    send_otp_email(user, otp)
+                    if send_otp_email(user, otp):
+                        messages.warning(request, 'Please verify your email first. Check your inbox for OTP.')
+                    else:
+                        messages.error(request, f'Please verify your email first. {OTP_SEND_FAILED}')
                     
                     request.session['pending_user_id'] = user.id
                     return redirect('verify_otp')
@@ -195,6 +204,14 @@ def edit_profile_view(request):
         profile = UserProfile.objects.create(user=user)
     
     if request.method == 'POST':
+        if 'profile_picture' in request.FILES:
+            # Only checked and stored here; core.images resizes it in the background
+            try:
+                profile.profile_picture = forms.ImageField().clean(request.FILES['profile_picture'])
+            except forms.ValidationError:
+                messages.error(request, 'Profile picture must be an image (JPG, PNG or WEBP).')
+                return redirect('edit_profile')
+        
         # Update user info
         user.first_name = request.POST.get('first_name', '')
         user.last_name = request.POST.get('last_name', '')
@@ -265,7 +282,7 @@ def my_bookings_view(request):
     
     # Order by latest
     one_way_bookings = one_way_bookings.order_by('-created_at')
-    package_bookings = package_bookings.order_by('-created_at')
+    package_bookings = package_bookings.select_related('package').order_by('-created_at')
     
     context = {
         'one_way_bookings': one_way_bookings,